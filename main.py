@@ -1,16 +1,31 @@
+# Imported first, to start the startup clock before the application modules load
+import src.config.bootstrap  # noqa: F401
+import asyncio
 import os
-from typing import Annotated
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncIterator, Optional
+from fastapi import FastAPI, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
 from src.middlewares.authentication_middleware import verify_auth_token
-from src.config.database.db_connection import get_db
-from src.routes import user_route, project_route
+from src.middlewares.metrics_middleware import METRICS_ENABLED, MetricsMiddleware
+from src.config.database.db_connection import dispose_database, get_db, init_database
+from src.config.database.query_stats import QueryStatsMiddleware
+from src.routes import internal_route, user_route, project_route
+from src.services.identifier_filter_service import maintain_identifier_filter
 from src.utils.constants import API_ENDPOINTS, UPLOADS_FOLDER_PATH
+from src.utils.file_response import UploadsStaticFiles, document_file_response
+from src.utils.password_hasher import password_hasher
+from src.utils.request_profiler import (
+    PROFILER_ENABLED,
+    ProfilerMiddleware,
+    request_profiler,
+)
+from src.utils.startup_profiler import FirstRequestMiddleware, startup_profiler
 
 # Load environment variables from the specified file
 load_dotenv(dotenv_path="src/config/env-files/.env.local")
@@ -33,8 +48,28 @@ def get_db_session() -> Session:
 if not os.path.exists(UPLOADS_FOLDER_PATH):
     os.makedirs(UPLOADS_FOLDER_PATH)
 
-# Create a FastAPI instance
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Connect to the database and start background workers, then release them
+    on shutdown.
+    """
+    await init_database()
+
+    # Build the username/email filter in the background and keep it in sync
+    identifier_filter_task = asyncio.create_task(maintain_identifier_filter())
+
+    startup_profiler.mark_ready()
+    yield
+
+    identifier_filter_task.cancel()
+    password_hasher.shutdown()
+    await dispose_database()
+
+
+# Create a FastAPI instance, encoding JSON responses with orjson
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 AuthMiddleWare = Annotated[str, Depends(verify_auth_token)]
 
 # Include user routes with a specified prefix and tags
@@ -46,6 +81,11 @@ app.include_router(
     prefix=API_ENDPOINTS["PROJECTS"]["BASE_URL"],
     tags=["Projects"],
 )
+app.include_router(
+    internal_route.router,
+    prefix=API_ENDPOINTS["INTERNAL"]["BASE_URL"],
+    tags=["Internal"],
+)
 
 # Additional FastAPI configurations
 app.add_middleware(
@@ -55,10 +95,18 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(FirstRequestMiddleware, profiler=startup_profiler)
+app.add_middleware(QueryStatsMiddleware)
+# Only installed when enabled, so requests pay nothing otherwise
+if PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware, profiler=request_profiler)
+# Outermost, so the recorded latency includes every other middleware
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.mount(
     "/" + UPLOADS_FOLDER_PATH,
-    StaticFiles(directory=UPLOADS_FOLDER_PATH),
+    UploadsStaticFiles(directory=UPLOADS_FOLDER_PATH),
     name=UPLOADS_FOLDER_PATH,
 )
 
@@ -78,9 +126,22 @@ def read_root(db: Session = Depends(get_db_session)) -> dict:
     return {"health": True}
 
 
-@app.get(API_ENDPOINTS["FILES"])
-async def retrive_file_by_file_path(file_path: str):
-    file_name = file_path.split("/")[1].split("_")[1]
-    return FileResponse(
-        file_path, media_type="application/octet-stream", filename=file_name
+@app.api_route(API_ENDPOINTS["FILES"], methods=["GET", "HEAD"])
+async def retrive_file_by_file_path(
+    request: Request, file_path: str, file_name: Optional[str] = None
+) -> Response:
+    """
+    Endpoint for downloading an uploaded file, in whole or in byte ranges.
+
+    Parameters:
+    - request (Request): The incoming request, for its conditional and Range headers.
+    - file_path (str): Path of the file inside the uploads folder.
+    - file_name (Optional[str]): Name to download the file as, e.g. the
+      document's entry in documents_name of the project listings.
+
+    Returns:
+    Response: The file (200), the requested ranges (206), or 304/416.
+    """
+    return await run_in_threadpool(
+        document_file_response, request.headers, file_path, file_name
     )
@@ -0,0 +1,155 @@
+"""
+Compare the bytes served for document downloads by repeat clients before and
+after the download endpoint supported validators and Range requests.
+
+Usage:
+    python -m src.benchmarks.file_download_benchmark [--size-mb 8]
+        [--clients 20] [--views 5] [--resume-at 0.6]
+
+Stores a document of --size-mb in the content-addressed store, then, for each
+of --clients clients viewing it --views times and one interrupted download
+resumed at --resume-at of the file, counts the response bytes and times the
+requests against:
+- previous: a bare FileResponse, as the endpoint returned before, so every
+  view and every resume downloads the whole file,
+- current: the /files endpoint of the application, with clients revalidating
+  their cached copy with If-None-Match and resuming with Range and If-Range.
+The bytes every client ends up with must equal the document; the script
+exits with status 1 if they differ.
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import FileResponse
+
+from main import app
+from src.utils.constants import API_ENDPOINTS
+from src.utils.uploads import remove_files, store_by_content
+
+
+def previous_app() -> FastAPI:
+    previous = FastAPI()
+
+    @previous.get(API_ENDPOINTS["FILES"])
+    async def retrive_file_by_file_path(file_path: str) -> FileResponse:
+        file_name = os.path.basename(file_path).split("_", 1)[-1]
+        return FileResponse(
+            file_path, media_type="application/octet-stream", filename=file_name
+        )
+
+    return previous
+
+
+async def run_clients(
+    client: httpx.AsyncClient, file_path: str, clients: int, views: int, resume_at: int
+) -> Tuple[int, int, bool]:
+    """
+    Return the response bytes, the requests sent and whether every client
+    ended up with the whole document.
+    """
+    served, requests, intact = 0, 0, True
+    expected: Optional[bytes] = None
+    for _ in range(clients):
+        cached: Optional[bytes] = None
+        etag: Optional[str] = None
+        for _ in range(views):
+            headers = {"If-None-Match": etag} if etag else {}
+            response = await client.get(
+                API_ENDPOINTS["FILES"], params={"file_path": file_path}, headers=headers
+            )
+            served += len(response.content)
+            requests += 1
+            if response.status_code == 200:
+                cached, etag = response.content, response.headers.get("etag")
+            expected = expected or cached
+            intact &= cached == expected
+
+    # A download interrupted after resume_at bytes, then resumed
+    response = await client.get(API_ENDPOINTS["FILES"], params={"file_path": file_path})
+    partial, etag = response.content[:resume_at], response.headers.get("etag")
+    served += resume_at
+    headers = {"Range": f"bytes={resume_at}-"}
+    if etag:
+        headers["If-Range"] = etag
+    response = await client.get(
+        API_ENDPOINTS["FILES"], params={"file_path": file_path}, headers=headers
+    )
+    served += len(response.content)
+    requests += 2
+    resumed = response.content
+    if response.status_code == 206:
+        resumed = partial + resumed
+    intact &= resumed == expected
+    return served, requests, intact
+
+
+async def measure(
+    application: FastAPI, file_path: str, clients: int, views: int, resume_at: int
+) -> Tuple[int, int, float, bool]:
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started_at = time.perf_counter()
+        served, requests, intact = await run_clients(
+            client, file_path, clients, views, resume_at
+        )
+        elapsed = time.perf_counter() - started_at
+    return served, requests, elapsed, intact
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--size-mb", type=float, default=8, help="Document size in MB (default: 8)"
+    )
+    parser.add_argument(
+        "--clients", type=int, default=20, help="Repeat clients (default: 20)"
+    )
+    parser.add_argument(
+        "--views", type=int, default=5, help="Views per client (default: 5)"
+    )
+    parser.add_argument(
+        "--resume-at",
+        type=float,
+        default=0.6,
+        help="Fraction downloaded before the interruption (default: 0.6)",
+    )
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 * 1024)
+    stored = store_by_content(io.BytesIO(os.urandom(size)))
+    resume_at = int(size * args.resume_at)
+    results: Dict[str, Tuple[int, int, float, bool]] = {}
+    try:
+        for name, application in (("previous", previous_app()), ("current", app)):
+            results[name] = asyncio.run(
+                measure(application, stored.path, args.clients, args.views, resume_at)
+            )
+    finally:
+        if stored.created:
+            remove_files([stored.path])
+
+    print(
+        f"{args.clients} clients x {args.views} views of {args.size_mb:g} MB, "
+        f"plus one download resumed at {args.resume_at:.0%}"
+    )
+    print(f"{'endpoint':<10} {'requests':>9} {'MB served':>10} {'seconds':>8}")
+    for name, (served, requests, elapsed, _) in results.items():
+        print(f"{name:<10} {requests:>9} {served / 1024 / 1024:>10.1f} {elapsed:>8.2f}")
+    previous_bytes, current_bytes = results["previous"][0], results["current"][0]
+    print(f"bytes served: {(current_bytes - previous_bytes) / previous_bytes:+.1%}")
+
+    if not all(intact for *_, intact in results.values()):
+        print("A client ended up with different bytes than the document")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""
+Load-test every API route over HTTP and save the results as JSON.
+
+Usage:
+    python -m src.benchmarks.http_load_benchmark [--concurrency 10]
+        [--requests 200] [--warmup 10] [--routes login,whoami]
+        [--base-url http://localhost:8000] [--output results.json]
+        [--compare previous.json]
+
+Without --base-url the application from main.py is driven in-process through
+httpx's ASGI transport, including its startup and shutdown. With --base-url
+the requests go over real HTTP to a running server, e.g. uvicorn with the
+production worker count. Either way the database from the usual environment
+is used; seed it first with src.config.database.seeders.seed so list
+endpoints see realistic volumes.
+
+Each route gets its own phase: --warmup unrecorded requests, then --requests
+requests issued by --concurrency concurrent clients. The report has the
+p50/p95/p99 latency, throughput and error count of every route, and is
+written to --output (default: benchmark-results/http_load_<commit>.json).
+--compare prints the change against an earlier result file.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from src.utils.constants import API_ENDPOINTS
+
+USERS = API_ENDPOINTS["USERS"]
+PROJECTS = API_ENDPOINTS["PROJECTS"]
+RESULTS_FOLDER = "benchmark-results"
+PROJECT_PAYLOAD = {
+    "name": "Benchmark",
+    "description": "HTTP load benchmark",
+    "city": "London",
+    "country": "United Kingdom",
+    "start_date": "2024-01-01T00:00:00Z",
+    "end_date": "2024-06-01T00:00:00Z",
+}
+# A minimal valid PDF, uploaded by the document upload route
+DOCUMENT_BYTES = b"%PDF-1.4\n1 0 obj<<>>endobj\ntrailer<<>>\n%%EOF\n"
+
+
+class Account:
+    """
+    A registered benchmark user with a token and a project of its own.
+    """
+
+    def __init__(self, username: str, password: str):
+        self.username = username
+        self.email = f"{username}@example.com"
+        self.password = password
+        self.id: Optional[str] = None
+        self.token: Optional[str] = None
+        self.project_id: Optional[str] = None
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        return {"Cookie": f"token={self.token}"}
+
+
+class BenchmarkContext:
+    """
+    State shared by the route scenarios: the client, accounts and a run id
+    that keeps generated usernames unique across runs.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, accounts: List[Account]):
+        self.client = client
+        self.accounts = accounts
+        self.run_id = uuid.uuid4().hex[:8]
+
+    def account(self, n: int) -> Account:
+        return self.accounts[n % len(self.accounts)]
+
+
+Scenario = Callable[[BenchmarkContext, int], Awaitable[httpx.Response]]
+
+
+def _registration(username: str, password: str) -> dict:
+    return {
+        "firstName": "Load",
+        "lastName": "Test",
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": password,
+    }
+
+
+async def register(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    username = f"bench_{ctx.run_id}_{n}_{uuid.uuid4().hex[:6]}"
+    return await ctx.client.post(
+        USERS["BASE_URL"] + USERS["REGISTER"], json=_registration(username, "password")
+    )
+
+
+async def login(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    account = ctx.account(n)
+    return await ctx.client.post(
+        USERS["BASE_URL"] + USERS["LOGIN"],
+        json={"identifier": account.username, "password": account.password},
+    )
+
+
+async def whoami(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    return await ctx.client.get(
+        USERS["BASE_URL"] + USERS["WHO_AM_I"], headers=ctx.account(n).cookies
+    )
+
+
+async def get_user_by_id(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    account, other = ctx.account(n), ctx.account(n + 1)
+    return await ctx.client.get(
+        USERS["BASE_URL"] + USERS["USER_BY_ID"].format(user_id=other.id),
+        headers=account.cookies,
+    )
+
+
+async def list_users(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    return await ctx.client.get(
+        USERS["BASE_URL"] + USERS["GET_ALL_USERS"],
+        params={"page": n % 5 + 1, "page_size": 20},
+        headers=ctx.account(n).cookies,
+    )
+
+
+async def create_project(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    return await ctx.client.post(
+        PROJECTS["BASE_URL"] + PROJECTS["DETAILS"],
+        json=PROJECT_PAYLOAD,
+        headers=ctx.account(n).cookies,
+    )
+
+
+async def add_members(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    account = ctx.account(n)
+    return await ctx.client.post(
+        PROJECTS["BASE_URL"]
+        + PROJECTS["MEMBERS"].format(project_id=account.project_id),
+        json={
+            "email_ids": [f"member_{ctx.run_id}_{n}_{k}@example.com" for k in range(5)]
+        },
+        headers=account.cookies,
+    )
+
+
+async def list_projects(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    return await ctx.client.get(
+        PROJECTS["BASE_URL"] + PROJECTS["GET_ALL_PROJECTS"],
+        params={"page": 1, "page_size": 20},
+        headers=ctx.account(n).cookies,
+    )
+
+
+async def fetch_members(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    account = ctx.account(n)
+    return await ctx.client.get(
+        PROJECTS["BASE_URL"]
+        + PROJECTS["MEMBERS"].format(project_id=account.project_id),
+        headers=account.cookies,
+    )
+
+
+async def upload_document(ctx: BenchmarkContext, n: int) -> httpx.Response:
+    account = ctx.account(n)
+    return await ctx.client.post(
+        PROJECTS["BASE_URL"]
+        + PROJECTS["DOCUMENTS"].format(project_id=account.project_id),
+        files=[("files", (f"bench-{n}.pdf", DOCUMENT_BYTES, "application/pdf"))],
+        headers=account.cookies,
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "register": register,
+    "login": login,
+    "whoami": whoami,
+    "get_user_by_id": get_user_by_id,
+    "list_users": list_users,
+    "create_project": create_project,
+    "add_members": add_members,
+    "list_projects": list_projects,
+    "fetch_members": fetch_members,
+    "upload_document": upload_document,
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+async def run_phase(
+    ctx: BenchmarkContext, scenario: Scenario, requests: int, concurrency: int
+) -> dict:
+    """
+    Issue `requests` requests of one scenario from `concurrency` workers.
+
+    Returns:
+    dict: Latency percentiles in milliseconds, throughput and error counts.
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    next_request = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for n in next_request:
+            started_at = time.perf_counter()
+            try:
+                response = await scenario(ctx, n)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started_at)
+            key = str(response.status_code)
+            statuses[key] = statuses.get(key, 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    to_ms = 1000.0
+    return {
+        "requests": requests,
+        "errors": errors,
+        "status_codes": statuses,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": (
+                round(sum(latencies) / len(latencies) * to_ms, 2) if latencies else 0.0
+            ),
+            "p50": round(percentile(latencies, 0.50) * to_ms, 2),
+            "p95": round(percentile(latencies, 0.95) * to_ms, 2),
+            "p99": round(percentile(latencies, 0.99) * to_ms, 2),
+            "max": round(latencies[-1] * to_ms, 2) if latencies else 0.0,
+        },
+    }
+
+
+async def create_accounts(client: httpx.AsyncClient, count: int) -> List[Account]:
+    """
+    Register, log in and create a project for each benchmark account.
+    """
+    run_id = uuid.uuid4().hex[:8]
+    accounts = [Account(f"bench_{run_id}_owner_{n}", "password") for n in range(count)]
+
+    async def prepare(account: Account) -> None:
+        response = await client.post(
+            USERS["BASE_URL"] + USERS["REGISTER"],
+            json=_registration(account.username, account.password),
+        )
+        response.raise_for_status()
+        account.id = response.json()["id"]
+
+        response = await client.post(
+            USERS["BASE_URL"] + USERS["LOGIN"],
+            json={"identifier": account.username, "password": account.password},
+        )
+        response.raise_for_status()
+        account.token = response.json()["token"]
+
+        response = await client.post(
+            PROJECTS["BASE_URL"] + PROJECTS["DETAILS"],
+            json=PROJECT_PAYLOAD,
+            headers=account.cookies,
+        )
+        response.raise_for_status()
+        account.project_id = response.json()["id"]
+
+    await asyncio.gather(*(prepare(account) for account in accounts))
+    return accounts
+
+
+@asynccontextmanager
+async def open_client(
+    base_url: Optional[str], concurrency: int
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Open a client against a running server, or against main.app in-process.
+    """
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    timeout = httpx.Timeout(60.0)
+    if base_url:
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=timeout
+        ) as client:
+            yield client
+        return
+
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="https://testserver",
+            limits=limits,
+            timeout=timeout,
+        ) as client:
+            yield client
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: Dict[str, dict], baseline: Optional[dict]) -> None:
+    header = (
+        f"{'route':<16} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'errors':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for route, result in results.items():
+        latency = result["latency_ms"]
+        print(
+            f"{route:<16} {result['throughput_rps']:>8} {latency['p50']:>9} "
+            f"{latency['p95']:>9} {latency['p99']:>9} {result['errors']:>7}"
+        )
+        previous = (baseline or {}).get("routes", {}).get(route)
+        if previous:
+            print(
+                f"{'  vs baseline':<16} "
+                f"{_change(previous['throughput_rps'], result['throughput_rps']):>8} "
+                f"{_change(previous['latency_ms']['p50'], latency['p50']):>9} "
+                f"{_change(previous['latency_ms']['p95'], latency['p95']):>9} "
+                f"{_change(previous['latency_ms']['p99'], latency['p99']):>9}"
+            )
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.0f}%"
+
+
+async def run(args: argparse.Namespace) -> dict:
+    routes = args.routes.split(",") if args.routes else list(SCENARIOS)
+    unknown = [route for route in routes if route not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown routes: {', '.join(unknown)}")
+
+    async with open_client(args.base_url, args.concurrency) as client:
+        ctx = BenchmarkContext(client, await create_accounts(client, args.accounts))
+        results = {}
+        for route in routes:
+            scenario = SCENARIOS[route]
+            if args.warmup:
+                await run_phase(ctx, scenario, args.warmup, args.concurrency)
+            results[route] = await run_phase(
+                ctx, scenario, args.requests, args.concurrency
+            )
+    return {
+        "benchmark": "http_load",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "mode": "http" if args.base_url else "asgi",
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "requests_per_route": args.requests,
+        "warmup_per_route": args.warmup,
+        "environment": {
+            "python": platform.python_version(),
+            "database_async_enabled": os.environ.get("DATABASE_ASYNC_ENABLED"),
+            "auth_mode": os.environ.get("AUTH_MODE"),
+        },
+        "routes": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--concurrency", type=int, default=10, help="Concurrent clients (default: 10)"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Requests per route (default: 200)"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=10,
+        help="Unrecorded requests per route (default: 10)",
+    )
+    parser.add_argument(
+        "--accounts",
+        type=int,
+        default=10,
+        help="Benchmark users created up front (default: 10)",
+    )
+    parser.add_argument(
+        "--routes", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}"
+    )
+    parser.add_argument(
+        "--base-url", help="Benchmark a running server instead of main.app"
+    )
+    parser.add_argument("--output", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    print_report(report["routes"], baseline)
+
+    output = args.output or os.path.join(
+        RESULTS_FOLDER, f"http_load_{report['commit'] or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
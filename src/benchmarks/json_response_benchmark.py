@@ -0,0 +1,146 @@
+"""
+Compare the default response path of the list endpoints with the
+ValidatedJSONResponse fast path.
+
+Usage:
+    python -m src.benchmarks.json_response_benchmark [--rows 10,100,500]
+        [--repeat 5]
+
+For pages of users and projects of each size, times what FastAPI does with a
+dict returned from a route with a response_model (validate, serialize back to
+Python objects, encode with the stdlib json module) against validating and
+encoding once with a precompiled TypeAdapter (for users, of StoredUsersPage,
+which does not validate stored emails again). Both paths must produce the
+same bytes; the script exits with status 1 if they differ.
+"""
+
+import argparse
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Tuple
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+
+from src.schemas.projects_schema import GetAllProjectsResponse
+from src.schemas.users_schema import GetAllUsers, StoredUsersPage
+from src.utils.json_response import ValidatedJSONResponse, response_adapter
+
+
+def users_page(rows: int) -> dict:
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return {
+        "success": True,
+        "data": [
+            {
+                "id": str(uuid.UUID(int=n, version=4)),
+                "first_name": "First",
+                "last_name": "Last",
+                "username": f"user{n}",
+                "email": f"user{n}@example.com",
+                "role": "USER",
+                "profile_picture": None,
+                "is_verified": True,
+                "is_deleted": False,
+                "created_at": created_at + timedelta(seconds=n),
+                "updated_at": created_at + timedelta(seconds=n),
+            }
+            for n in range(rows)
+        ],
+        "next_cursor": "cursor",
+    }
+
+
+def projects_page(rows: int) -> dict:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    owner_id = uuid.UUID(int=1, version=4)
+    return {
+        "success": True,
+        "data": [
+            {
+                "id": uuid.UUID(int=n, version=4),
+                "name": f"Project {n}",
+                "description": "Description",
+                "city": "Pune",
+                "country": "India",
+                "start_date": start,
+                "end_date": start + timedelta(days=30),
+                "status": "UPCOMING",
+                "created_at": start + timedelta(seconds=n),
+                "updated_at": start + timedelta(seconds=n),
+                "project_owner_id": owner_id,
+                "project_members_email_ids": [
+                    f"member{m}@example.com" for m in range(3)
+                ],
+                "owner_first_name": "First",
+                "owner_last_name": "Last",
+                "documents_path": [f"uploads/{n}_document.pdf"],
+            }
+            for n in range(rows)
+        ],
+        "next_cursor": None,
+    }
+
+
+def default_path(model) -> Callable[[dict], bytes]:  # type: ignore[no-untyped-def]
+    field = create_response_field(name="Response", type_=model)
+
+    def render(content: dict) -> bytes:
+        # The steps of fastapi.routing.serialize_response, without the coroutine
+        value, errors = field.validate(content, {}, loc=("response",))
+        assert not errors, errors
+        return JSONResponse(field.serialize(value, by_alias=True)).body
+
+    return render
+
+
+def fast_path(model) -> Callable[[dict], bytes]:  # type: ignore[no-untyped-def]
+    adapter = response_adapter(model)
+    return lambda content: ValidatedJSONResponse(adapter, content).body
+
+
+def best_seconds(func: Callable[[], object], repeat: int) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--rows", default="10,100,500", help="Comma-separated page sizes"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per case (default: 5)"
+    )
+    args = parser.parse_args()
+
+    # (response_model of the route, model of its fast path, page builder)
+    cases: Dict[str, Tuple[type, type, Callable[[int], dict]]] = {
+        "users": (GetAllUsers, StoredUsersPage, users_page),
+        "projects": (GetAllProjectsResponse, GetAllProjectsResponse, projects_page),
+    }
+    mismatches = []
+    print(f"{'case':<14} {'default us':>11} {'fast us':>9} {'speedup':>8}")
+    for name, (model, fast_model, build_page) in cases.items():
+        default_render, fast_render = default_path(model), fast_path(fast_model)
+        for rows in (int(size) for size in args.rows.split(",")):
+            page = build_page(rows)
+            if default_render(page) != fast_render(page):
+                mismatches.append(f"{name} x {rows}")
+            default = best_seconds(lambda: default_render(page), args.repeat)
+            fast = best_seconds(lambda: fast_render(page), args.repeat)
+            print(
+                f"{name + ' x ' + str(rows):<14} {default * 1e6:>11.1f} "
+                f"{fast * 1e6:>9.1f} {default / fast:>7.1f}x"
+            )
+
+    if mismatches:
+        print(f"Output differs from the default path for: {', '.join(mismatches)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Micro-benchmark the helpers that run on every request, with a regression gate.
+
+Usage:
+    python -m src.benchmarks.micro_benchmarks [--threshold 25]
+        [--only decode_jwt_token,is_valid_uuid] [--repeat 5]
+        [--baseline src/benchmarks/baselines/micro_benchmarks.json]
+        [--update-baseline]
+
+Each benchmark is timed with timeit: the loop count is chosen so one run
+takes at least 0.2s, the run is repeated --repeat times and the fastest run
+is kept, which is the most stable estimate on a noisy machine.
+
+Results are compared with the stored baseline and the script exits with
+status 1 if any helper got slower by more than --threshold percent.
+Baselines depend on the hardware, so regenerate them with --update-baseline
+on the machine that runs the gate (e.g. the CI runner) rather than comparing
+across machines. Benchmarks whose parameters changed since the baseline, such
+as the bcrypt cost, are reported but not gated.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from src.config.database.db_connection import rows_as_dicts
+from src.schemas.users_schema import GetAllUsers, UserInfo
+from src.utils.index import (
+    BCRYPT_ROUNDS,
+    decode_jwt_token,
+    generate_jwt_token,
+    hash_password,
+    is_valid_uuid,
+    verify_password,
+)
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(__file__), "baselines", "micro_benchmarks.json"
+)
+BENCHMARK_SECRET = "micro-benchmark-secret-of-32-bytes"
+
+USER_KEYS = (
+    "id",
+    "first_name",
+    "last_name",
+    "username",
+    "email",
+    "role",
+    "profile_picture_path",
+    "is_verified",
+    "is_deleted",
+    "created_at",
+    "updated_at",
+)
+
+
+def _user_row(n: int) -> tuple:
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return (
+        uuid.UUID(int=n, version=4),
+        "First",
+        "Last",
+        f"user{n}",
+        f"user{n}@example.com",
+        "USER",
+        None,
+        True,
+        False,
+        created_at,
+        created_at,
+    )
+
+
+def _setup_benchmarks() -> Dict[str, Tuple[Callable[[], object], dict]]:
+    """
+    Build the benchmarked callables and the parameters they depend on.
+    """
+    principal = {
+        "id": str(uuid.UUID(int=1, version=4)),
+        "email": "user1@example.com",
+        "first_name": "First",
+        "last_name": "Last",
+        "username": "user1",
+        "role": "USER",
+    }
+    token = generate_jwt_token(dict(principal), secret_key=BENCHMARK_SECRET)
+    user_id = principal["id"]
+
+    metadata = SimpleResultMetaData(USER_KEYS)
+    rows = [_user_row(n) for n in range(100)]
+
+    def rows_to_dicts() -> List[dict]:
+        # The conversion used by fetch_all_as_dicts and the services
+        result: IteratorResult[Tuple] = IteratorResult(metadata, iter(rows))
+        return rows_as_dicts(tuple(result.keys()), result.fetchall())
+
+    users_page: dict = {
+        "success": True,
+        "data": [{**dict(zip(USER_KEYS, row)), "id": str(row[0])} for row in rows[:20]],
+        "next_cursor": None,
+    }
+    password = "correct horse battery staple"
+    password_hash = hash_password(password, BCRYPT_ROUNDS)
+
+    return {
+        "decode_jwt_token": (
+            lambda: decode_jwt_token(token, secret_key=BENCHMARK_SECRET),
+            {},
+        ),
+        "is_valid_uuid": (lambda: is_valid_uuid(user_id), {}),
+        "rows_to_dicts_100": (rows_to_dicts, {"rows": len(rows)}),
+        "user_info_validate": (lambda: UserInfo.model_validate(principal), {}),
+        "get_all_users_validate_20": (
+            lambda: GetAllUsers.model_validate(users_page),
+            {"rows": len(users_page["data"])},
+        ),
+        "hash_password": (
+            lambda: hash_password(password, BCRYPT_ROUNDS),
+            {"rounds": BCRYPT_ROUNDS},
+        ),
+        "verify_password": (
+            lambda: verify_password(password, password_hash),
+            {"rounds": BCRYPT_ROUNDS},
+        ),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict:
+    """
+    Time a callable and return the fastest time per call.
+
+    Returns:
+    dict: Nanoseconds per call of the fastest run and the loop count used.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return {"ns_per_call": round(best / number * 1e9, 1), "loops": number}
+
+
+def compare(
+    results: Dict[str, dict], baseline: Optional[dict], threshold: float
+) -> List[str]:
+    """
+    Print every result against the baseline.
+
+    Returns:
+    List[str]: Names of the benchmarks that regressed beyond the threshold.
+    """
+    previous_results = (baseline or {}).get("benchmarks", {})
+    regressions = []
+    print(f"{'benchmark':<28} {'ns/call':>14} {'baseline':>14} {'change':>9}")
+    for name, result in results.items():
+        previous = previous_results.get(name)
+        current = result["ns_per_call"]
+        if previous is None:
+            verdict, reference = "new", "-"
+        elif previous.get("params") != result["params"]:
+            verdict, reference = "params changed", f"{previous['ns_per_call']:.1f}"
+        else:
+            change = (current - previous["ns_per_call"]) / previous["ns_per_call"] * 100
+            reference = f"{previous['ns_per_call']:.1f}"
+            verdict = f"{change:+.1f}%"
+            if change > threshold:
+                verdict += "  REGRESSION"
+                regressions.append(name)
+        print(f"{name:<28} {current:>14.1f} {reference:>14} {verdict:>9}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.environ.get("MICRO_BENCHMARK_THRESHOLD", "25")),
+        help="Allowed slowdown in percent (default: MICRO_BENCHMARK_THRESHOLD or 25)",
+    )
+    parser.add_argument("--only", help="Comma-separated subset of benchmarks")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per benchmark (default: 5)"
+    )
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results as the new baseline instead of gating",
+    )
+    args = parser.parse_args()
+
+    benchmarks = _setup_benchmarks()
+    names = args.only.split(",") if args.only else list(benchmarks)
+    unknown = [name for name in names if name not in benchmarks]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    results = {}
+    for name in names:
+        func, params = benchmarks[name]
+        results[name] = {**measure(func, args.repeat), "params": params}
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.update_baseline:
+        merged = dict((baseline or {}).get("benchmarks", {}))
+        merged.update(results)
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(
+                {
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "benchmarks": merged,
+                },
+                file,
+                indent=2,
+            )
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if regressions:
+        print(
+            f"{len(regressions)} benchmark(s) regressed by more than "
+            f"{args.threshold}%: {', '.join(regressions)}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
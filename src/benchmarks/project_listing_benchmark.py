@@ -0,0 +1,226 @@
+"""
+Benchmark the projects listing query against the previous implementation.
+
+Usage:
+    python -m src.benchmarks.project_listing_benchmark [--projects 500]
+        [--member-rows 3] [--emails 20] [--documents 10] [--repeat 30]
+
+Seeds one owner with many projects, member rows and documents inside a
+transaction, times the first, a middle and the last page with both the
+legacy join/array_agg/DISTINCT query and build_projects_page_query, then
+rolls everything back. Requires the database from the usual environment.
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from typing import Callable, List
+
+from sqlalchemy import Connection, Select, func, insert, select
+
+from src.config.database.db_connection import get_engine
+from src.models.project_documents_model import ProjectDocumentsModel
+from src.models.project_members_model import ProjectMembersModel
+from src.models.project_membership_model import ProjectMembershipModel
+from src.models.project_model import ProjectModel
+from src.models.user_model import UserModel
+from src.services.project_service import build_projects_page_query
+
+
+def legacy_projects_page_query(owner_id: str, page: int, page_size: int) -> Select:
+    """
+    The listing query used before the LATERAL rewrite, kept for comparison.
+    """
+    return (
+        select(
+            ProjectModel,
+            ProjectMembersModel.id.label("project_members_id"),
+            ProjectMembersModel.email_ids.label("project_members_email_ids"),
+            UserModel.id.label("project_owner_id"),
+            UserModel.first_name.label("owner_first_name"),
+            UserModel.last_name.label("owner_last_name"),
+            func.array_agg(ProjectDocumentsModel.document_path).label("documents_path"),
+        )
+        .join(
+            ProjectMembersModel,
+            ProjectMembersModel.project_id == ProjectModel.id,
+            isouter=True,
+        )
+        .join(
+            ProjectDocumentsModel,
+            ProjectDocumentsModel.project_id == ProjectModel.id,
+        )
+        .join(UserModel, ProjectModel.project_owner_id == UserModel.id)
+        .where(ProjectModel.project_owner_id == owner_id)
+        .group_by(
+            ProjectModel.id,
+            ProjectModel.name,
+            ProjectModel.project_owner_id,
+            ProjectMembersModel.id,
+            UserModel.id,
+            UserModel.first_name,
+            UserModel.last_name,
+        )
+        .distinct()
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+
+
+def seed_owner(
+    conn: Connection, projects: int, member_rows: int, emails: int, documents: int
+) -> str:
+    """
+    Insert one owner with the requested number of projects and children.
+
+    Returns:
+    str: The owner's user ID.
+    """
+    suffix = uuid.uuid4().hex[:12]
+    owner_id = conn.execute(
+        insert(UserModel)
+        .values(
+            first_name="Bench",
+            last_name="Owner",
+            username=f"bench_{suffix}",
+            email=f"bench_{suffix}@example.com",
+            password="x",
+        )
+        .returning(UserModel.id)
+    ).scalar_one()
+
+    project_ids = (
+        conn.execute(
+            insert(ProjectModel).returning(ProjectModel.id),
+            [
+                {
+                    "name": f"Project {index}",
+                    "description": "Benchmark project",
+                    "city": "City",
+                    "country": "Country",
+                    "start_date": "2024-01-01",
+                    "end_date": "2024-12-31",
+                    "project_owner_id": owner_id,
+                }
+                for index in range(projects)
+            ],
+        )
+        .scalars()
+        .all()
+    )
+
+    if member_rows:
+        # The legacy query reads the email arrays, the current one the
+        # normalised memberships
+        conn.execute(
+            insert(ProjectMembershipModel),
+            [
+                {
+                    "project_id": project_id,
+                    "email": f"member{row}_{index}@example.com",
+                }
+                for project_id in project_ids
+                for row in range(member_rows)
+                for index in range(emails)
+            ],
+        )
+        conn.execute(
+            insert(ProjectMembersModel),
+            [
+                {
+                    "project_id": project_id,
+                    "email_ids": [
+                        f"member{row}_{index}@example.com" for index in range(emails)
+                    ],
+                }
+                for project_id in project_ids
+                for row in range(member_rows)
+            ],
+        )
+    if documents:
+        conn.execute(
+            insert(ProjectDocumentsModel),
+            [
+                {"project_id": project_id, "document_path": f"uploads/doc_{index}.pdf"}
+                for project_id in project_ids
+                for index in range(documents)
+            ],
+        )
+    return str(owner_id)
+
+
+def time_query(conn: Connection, build: Callable[[], Select], repeat: int) -> dict:
+    """
+    Execute a query repeatedly and summarise its latency.
+
+    Returns:
+    dict: Row count and p50/p95/mean latency in milliseconds.
+    """
+    timings: List[float] = []
+    rows = 0
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        rows = len(conn.execute(build()).fetchall())
+        timings.append((time.perf_counter() - started_at) * 1000)
+    timings.sort()
+    return {
+        "rows": rows,
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "mean_ms": statistics.fmean(timings),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--member-rows", type=int, default=3)
+    parser.add_argument("--emails", type=int, default=20)
+    parser.add_argument("--documents", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    last_page = max(1, -(-args.projects // args.page_size))
+    pages = sorted({1, max(1, last_page // 2), last_page})
+
+    with get_engine().connect() as conn:
+        transaction = conn.begin()
+        try:
+            owner_id = seed_owner(
+                conn, args.projects, args.member_rows, args.emails, args.documents
+            )
+            conn.exec_driver_sql("ANALYZE")
+
+            print(
+                f"{args.projects} projects x {args.member_rows} member rows "
+                f"({args.emails} emails) x {args.documents} documents, "
+                f"page size {args.page_size}, {args.repeat} runs"
+            )
+            print(
+                f"{'query':<8} {'page':>5} {'rows':>5} "
+                f"{'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}"
+            )
+            for page in pages:
+                queries = {
+                    "legacy": lambda: legacy_projects_page_query(
+                        owner_id, page, args.page_size
+                    ),
+                    "lateral": lambda: build_projects_page_query(
+                        owner_id, page, args.page_size
+                    ),
+                }
+                for name, build in queries.items():
+                    result = time_query(conn, build, args.repeat)
+                    print(
+                        f"{name:<8} {page:>5} {result['rows']:>5} "
+                        f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                        f"{result['mean_ms']:>9.2f}"
+                    )
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Compare the row mapping of the list endpoints with the previous mapping on
+large pages read from the database.
+
+Usage:
+    python -m src.benchmarks.row_mapping_benchmark [--rows 10000] [--repeat 5]
+
+Needs a database holding at least --rows users, e.g. seeded with
+`python -m src.config.database.seeders.seed --users 20000`.
+
+For a page of users and the largest page of projects of a single owner,
+times fetching and mapping the rows, then also encoding the response, with:
+- previous: the full UserModel selected, keys looked up per row, then the
+  password dropped and the id stringified per row,
+- current: the projected columns of build_users_page_query mapped by
+  fetch_all_as_dicts, with UUIDs left to the response serializer.
+Both paths must return the same users; the script exits with status 1 if
+they differ.
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import Connection, func, select
+
+from src.config.database.db_connection import fetch_all_as_dicts, get_engine
+from src.models.project_documents_model import ProjectDocumentsModel  # noqa: F401
+from src.models.project_membership_model import ProjectMembershipModel  # noqa: F401
+from src.models.project_model import ProjectModel
+from src.models.user_model import UserModel
+from src.schemas.projects_schema import GetAllProjectsResponse
+from src.schemas.users_schema import StoredUsersPage
+from src.services.project_service import build_projects_page_query
+from src.services.user_service import build_users_page_query
+from src.utils.json_response import ValidatedJSONResponse, response_adapter
+from src.utils.pagination import paginate
+
+USERS_ADAPTER = response_adapter(StoredUsersPage)
+PROJECTS_ADAPTER = response_adapter(GetAllProjectsResponse)
+
+
+def previous_users(conn: Connection, rows: int) -> List[dict]:
+    query = paginate(
+        select(UserModel).where(UserModel.is_deleted.is_(False)),
+        UserModel.created_at,
+        UserModel.id,
+        1,
+        rows,
+    )
+    result = conn.execute(query)
+    users = [dict(zip(result.keys(), row)) for row in result.fetchall()]
+    return [
+        dict(
+            (key, str(value)) if key == "id" else (key, value)
+            for key, value in user.items()
+            if key != "password"
+        )
+        for user in users
+    ]
+
+
+def current_users(conn: Connection, rows: int) -> List[dict]:
+    return fetch_all_as_dicts(conn, build_users_page_query(1, rows))
+
+
+def previous_projects(conn: Connection, owner_id: str, rows: int) -> List[dict]:
+    result = conn.execute(build_projects_page_query(owner_id, 1, rows))
+    return [dict(zip(result.keys(), row)) for row in result.fetchall()]
+
+
+def current_projects(conn: Connection, owner_id: str, rows: int) -> List[dict]:
+    return fetch_all_as_dicts(conn, build_projects_page_query(owner_id, 1, rows))
+
+
+def best_ms(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings) * 1000
+
+
+def encode(adapter: TypeAdapter, data: List[dict]) -> bytes:
+    return ValidatedJSONResponse(
+        adapter, {"success": True, "data": data, "next_cursor": None}
+    ).body
+
+
+def fetch_and_encode(
+    adapter: TypeAdapter, fetch: Callable[[], List[dict]]
+) -> Callable[[], bytes]:
+    return lambda: encode(adapter, fetch())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--rows", type=int, default=10000, help="Rows per page (default: 10000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per case (default: 5)"
+    )
+    args = parser.parse_args()
+
+    with get_engine().connect() as conn:
+        users = current_users(conn, args.rows)
+        if len(users) < args.rows:
+            print(f"Only {len(users)} users found, seed the database first")
+            sys.exit(1)
+        owner_id, projects = conn.execute(
+            select(ProjectModel.project_owner_id, func.count())
+            .group_by(ProjectModel.project_owner_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).one()
+
+        def users_json(fetch: Callable) -> dict:
+            # The serialized users, without the profile picture, which the
+            # previous mapping dropped under the wrong key
+            data = json.loads(encode(USERS_ADAPTER, fetch(conn, args.rows)))["data"]
+            for user in data:
+                user.pop("profile_picture_path")
+            return data
+
+        same_users = users_json(previous_users) == users_json(current_users)
+
+        cases = {
+            f"users x {args.rows}": (
+                lambda: previous_users(conn, args.rows),
+                lambda: current_users(conn, args.rows),
+                USERS_ADAPTER,
+            ),
+            f"projects x {projects}": (
+                lambda: previous_projects(conn, owner_id, projects),
+                lambda: current_projects(conn, owner_id, projects),
+                PROJECTS_ADAPTER,
+            ),
+        }
+        print(
+            f"{'case':<18} {'stage':<14} {'previous ms':>12} {'current ms':>11} "
+            f"{'change':>8}"
+        )
+        for name, (previous, current, adapter) in cases.items():
+            stages = {
+                "fetch + map": (previous, current),
+                "+ encode": (
+                    fetch_and_encode(adapter, previous),
+                    fetch_and_encode(adapter, current),
+                ),
+            }
+            for stage, (previous_stage, current_stage) in stages.items():
+                previous_ms = best_ms(previous_stage, args.repeat)
+                current_ms = best_ms(current_stage, args.repeat)
+                print(
+                    f"{name:<18} {stage:<14} {previous_ms:>12.1f} {current_ms:>11.1f} "
+                    f"{(current_ms - previous_ms) / previous_ms * 100:>+7.1f}%"
+                )
+
+    if not same_users:
+        print("The current mapping returned different users")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
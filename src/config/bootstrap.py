@@ -0,0 +1,10 @@
+"""
+Starts the startup clock.
+
+main.py imports this module before anything else, so the time spent
+importing the application modules is part of the measured startup.
+"""
+
+from src.utils.startup_profiler import startup_profiler
+
+startup_profiler.start()
@@ -6,6 +6,7 @@ from sqlalchemy import engine_from_config, pool
 from src.models.user_model import UserModel
 from src.models.project_model import ProjectModel
 from src.models.project_members_model import ProjectMembersModel
+from src.models.project_membership_model import ProjectMembershipModel  # noqa: F401
 from src.models.project_documents_model import ProjectDocumentsModel
 
 
@@ -0,0 +1,39 @@
+"""add_pagination_indexes
+
+Revision ID: 5c9e2f7a4b13
+Revises: 322e0883f22e
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c9e2f7a4b13"
+down_revision: Union[str, None] = "322e0883f22e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "users_created_at_id_index",
+        "users",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+    op.create_index(
+        "projects_owner_created_at_id_index",
+        "projects",
+        ["project_owner_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("projects_owner_created_at_id_index", table_name="projects")
+    op.drop_index("users_created_at_id_index", table_name="users")
@@ -0,0 +1,37 @@
+"""add_project_children_indexes
+
+Revision ID: 8e41d0b6c2f7
+Revises: 5c9e2f7a4b13
+Create Date: 2026-10-17 10:02:17.540961
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e41d0b6c2f7"
+down_revision: Union[str, None] = "5c9e2f7a4b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "project_members_project_id_index",
+        "project_members",
+        ["project_id"],
+        unique=False,
+    )
+    op.create_index(
+        "project_documents_project_id_index",
+        "project_documents",
+        ["project_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("project_documents_project_id_index", table_name="project_documents")
+    op.drop_index("project_members_project_id_index", table_name="project_members")
@@ -0,0 +1,61 @@
+"""create_project_memberships_table
+
+Revision ID: a3f7c9e1d524
+Revises: 8e41d0b6c2f7
+Create Date: 2026-10-17 11:20:05.904127
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f7c9e1d524"
+down_revision: Union[str, None] = "8e41d0b6c2f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_memberships",
+        sa.Column(
+            "id",
+            sa.UUID(),
+            server_default=sa.text("(gen_random_uuid())"),
+            nullable=False,
+        ),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["project_id"],
+            ["projects.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "project_id", "email", name="project_memberships_project_id_email_key"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("project_memberships")
@@ -0,0 +1,26 @@
+"""add_users_updated_at_index
+
+Revision ID: a7e2d9c4b610
+Revises: f3c1a8d5e072
+Create Date: 2026-10-17 16:40:12.504817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e2d9c4b610"
+down_revision: Union[str, None] = "f3c1a8d5e072"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets every worker's identifier filter sync read only recently changed users
+    op.create_index("users_updated_at_index", "users", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("users_updated_at_index", table_name="users")
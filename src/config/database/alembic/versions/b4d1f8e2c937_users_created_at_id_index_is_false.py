@@ -0,0 +1,39 @@
+"""users_created_at_id_index_is_false
+
+Revision ID: b4d1f8e2c937
+Revises: a7e2d9c4b610
+Create Date: 2026-10-17 18:05:41.230517
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d1f8e2c937"
+down_revision: Union[str, None] = "a7e2d9c4b610"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_users_created_at_id_index(predicate: str) -> None:
+    op.drop_index("users_created_at_id_index", table_name="users")
+    op.create_index(
+        "users_created_at_id_index",
+        "users",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text(predicate),
+    )
+
+
+def upgrade() -> None:
+    # The planner only uses a partial index when the query repeats its
+    # predicate, and the users queries now filter with "IS false"
+    _recreate_users_created_at_id_index("is_deleted IS false")
+
+
+def downgrade() -> None:
+    _recreate_users_created_at_id_index("is_deleted = false")
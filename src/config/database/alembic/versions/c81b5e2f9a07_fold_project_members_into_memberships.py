@@ -0,0 +1,58 @@
+"""fold_project_members_into_memberships
+
+Copies every email of the legacy project_members.email_ids arrays into
+project_memberships, one row per (project, lowercased email). Duplicates
+across member rows collapse into the earliest one. The legacy table is
+left untouched, so downgrading only removes the copied rows.
+
+Revision ID: c81b5e2f9a07
+Revises: a3f7c9e1d524
+Create Date: 2026-10-17 11:24:48.117630
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c81b5e2f9a07"
+down_revision: Union[str, None] = "a3f7c9e1d524"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO project_memberships
+            (project_id, email, user_id, created_at, updated_at)
+        SELECT member.project_id, member.email, users.id,
+               member.created_at, member.created_at
+        FROM (
+            SELECT project_members.project_id,
+                   lower(trim(member_email.email)) AS email,
+                   min(project_members.created_at) AS created_at
+            FROM project_members
+            CROSS JOIN LATERAL unnest(project_members.email_ids) AS member_email(email)
+            WHERE project_members.project_id IS NOT NULL
+              AND trim(member_email.email) <> ''
+            GROUP BY project_members.project_id, lower(trim(member_email.email))
+        ) AS member
+        LEFT JOIN users ON users.email = member.email
+        ON CONFLICT (project_id, email) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM project_memberships
+        USING project_members
+        WHERE project_memberships.project_id = project_members.project_id
+          AND project_memberships.email IN (
+              SELECT lower(trim(email)) FROM unnest(project_members.email_ids) AS email
+          )
+        """
+    )
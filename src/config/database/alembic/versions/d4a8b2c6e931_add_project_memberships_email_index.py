@@ -0,0 +1,30 @@
+"""add_project_memberships_email_index
+
+Revision ID: d4a8b2c6e931
+Revises: c81b5e2f9a07
+Create Date: 2026-10-17 12:03:52.661845
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a8b2c6e931"
+down_revision: Union[str, None] = "c81b5e2f9a07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "project_memberships_email_index",
+        "project_memberships",
+        ["email", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("project_memberships_email_index", table_name="project_memberships")
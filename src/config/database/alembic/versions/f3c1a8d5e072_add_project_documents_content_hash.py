@@ -0,0 +1,48 @@
+"""add_project_documents_content_hash
+
+Revision ID: f3c1a8d5e072
+Revises: d4a8b2c6e931
+Create Date: 2026-10-17 14:21:08.318270
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c1a8d5e072"
+down_revision: Union[str, None] = "d4a8b2c6e931"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Null for documents stored before content addressing, until
+    # src/scripts/dedup_uploads.py moves them into the store
+    op.add_column(
+        "project_documents",
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+    )
+    op.add_column(
+        "project_documents", sa.Column("size_bytes", sa.BigInteger(), nullable=True)
+    )
+    op.add_column(
+        "project_documents", sa.Column("file_name", sa.String(), nullable=True)
+    )
+    op.create_index(
+        "project_documents_content_hash_index",
+        "project_documents",
+        ["content_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "project_documents_content_hash_index", table_name="project_documents"
+    )
+    op.drop_column("project_documents", "file_name")
+    op.drop_column("project_documents", "size_bytes")
+    op.drop_column("project_documents", "content_hash")
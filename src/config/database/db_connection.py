@@ -1,12 +1,30 @@
+import asyncio
 import logging
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
+import anyio
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from sqlalchemy import Connection, Engine, Executable, Row, create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-from src.utils.index import get_required_env_variable
+from src.config.database.pool_stats import PoolStatistics, instrumented_pool_class
+from src.config.database.query_stats import instrument_queries
+from src.utils.index import get_env_variable, get_required_env_variable
 
 # Load environment variables
 load_dotenv(dotenv_path="src/config/env-files/.env.local")
@@ -22,33 +40,304 @@ POSTGRES_PASSWORD = get_required_env_variable("POSTGRES_PASSWORD")
 POSTGRES_HOST = get_required_env_variable("POSTGRES_HOST")
 POSTGRES_PORT = get_required_env_variable("POSTGRES_PORT")
 
+# Run service queries on the asyncpg engine ("true") or on the psycopg2 engine
+# in the threadpool ("false")
+DATABASE_ASYNC_ENABLED = (
+    get_env_variable("DATABASE_ASYNC_ENABLED", "true").lower() == "true"
+)
+
+# Connection pool settings, shared by both engines
+DATABASE_POOL_SIZE = int(get_env_variable("DATABASE_POOL_SIZE", "10"))
+DATABASE_MAX_OVERFLOW = int(get_env_variable("DATABASE_MAX_OVERFLOW", "20"))
+DATABASE_POOL_TIMEOUT = float(get_env_variable("DATABASE_POOL_TIMEOUT", "30"))
+DATABASE_POOL_RECYCLE = int(get_env_variable("DATABASE_POOL_RECYCLE", "1800"))
+DATABASE_POOL_PRE_PING = (
+    get_env_variable("DATABASE_POOL_PRE_PING", "true").lower() == "true"
+)
+POOL_OPTIONS = {
+    "pool_size": DATABASE_POOL_SIZE,
+    "max_overflow": DATABASE_MAX_OVERFLOW,
+    "pool_timeout": DATABASE_POOL_TIMEOUT,
+    "pool_recycle": DATABASE_POOL_RECYCLE,
+    "pool_pre_ping": DATABASE_POOL_PRE_PING,
+}
+
 # Database URL format for SQLAlchemy
-DATABASE_URL = f"postgresql://{POSTGRES_USERNAME}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB_NAME}"
+DATABASE_ADDRESS = (
+    f"{POSTGRES_USERNAME}:{POSTGRES_PASSWORD}"
+    f"@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB_NAME}"
+)
+DATABASE_URL = f"postgresql://{DATABASE_ADDRESS}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DATABASE_ADDRESS}"
+
+# Rows fetched per round trip when streaming results through a server-side cursor
+DATABASE_STREAM_BATCH_SIZE = int(get_env_variable("DATABASE_STREAM_BATCH_SIZE", "1000"))
 
-# Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
-session = Session(engine)
+# Retries for the first connection made while the application starts
+DATABASE_CONNECT_RETRIES = int(get_env_variable("DATABASE_CONNECT_RETRIES", "5"))
+DATABASE_CONNECT_BACKOFF_SECONDS = float(
+    get_env_variable("DATABASE_CONNECT_BACKOFF_SECONDS", "0.5")
+)
+DATABASE_CONNECT_MAX_BACKOFF_SECONDS = float(
+    get_env_variable("DATABASE_CONNECT_MAX_BACKOFF_SECONDS", "10")
+)
 
-# Log database connection status
-try:
-    # Try to establish a connection
-    with engine.connect() as connection:
-        logger.info("Database connection successful")
+# Pool statistics outlive the engines, which are created on first use
+pool_statistics = PoolStatistics()
+async_pool_statistics = PoolStatistics()
 
-except (Exception, SQLAlchemyError) as error:
-    # Log any errors
-    logger.error(f"Database connection error: {error}")
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
 
-# Create a SessionLocal class to handle database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create a SessionLocal class to handle database sessions; it is bound to the
+# engine when a session is opened
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 # Create a Base class for declarative models
 Base = declarative_base()
 
+T = TypeVar("T")
+
+
+def get_engine() -> Engine:
+    """
+    Return the psycopg2 engine, creating it on first use.
+
+    Returns:
+    Engine: The synchronous SQLAlchemy engine.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    DATABASE_URL,
+                    poolclass=instrumented_pool_class(QueuePool, pool_statistics),
+                    **POOL_OPTIONS,
+                )
+                pool_statistics.instrument(engine)
+                instrument_queries(engine)
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the asyncpg engine, creating it on first use.
+
+    Returns:
+    AsyncEngine: The asynchronous SQLAlchemy engine.
+    """
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                async_engine = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    poolclass=instrumented_pool_class(
+                        AsyncAdaptedQueuePool, async_pool_statistics
+                    ),
+                    **POOL_OPTIONS,
+                )
+                async_pool_statistics.instrument(async_engine.sync_engine)
+                instrument_queries(async_engine.sync_engine)
+                _async_engine = async_engine
+    return _async_engine
+
+
+async def init_database() -> None:
+    """
+    Check that the database is reachable, retrying with exponential backoff.
+
+    Raises:
+    - SQLAlchemyError: If the database is still unreachable after
+      DATABASE_CONNECT_RETRIES attempts.
+    """
+    backoff = DATABASE_CONNECT_BACKOFF_SECONDS
+    for attempt in range(1, DATABASE_CONNECT_RETRIES + 1):
+        try:
+            if DATABASE_ASYNC_ENABLED:
+                async with get_async_engine().connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            else:
+                await run_in_threadpool(_check_sync_connection)
+            logger.info("Database connection successful")
+            return
+        except (OSError, SQLAlchemyError) as error:
+            if attempt == DATABASE_CONNECT_RETRIES:
+                logger.error(f"Database connection error: {error}")
+                raise
+            logger.warning(
+                f"Database connection attempt {attempt} failed, "
+                f"retrying in {backoff:.1f}s: {error}"
+            )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, DATABASE_CONNECT_MAX_BACKOFF_SECONDS)
+
+
+def _check_sync_connection() -> None:
+    with get_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def dispose_database() -> None:
+    """
+    Close the connections held by whichever engines were created.
+    """
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
 # Function to get a new session
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
         db.close()
+
+
+def get_pool_stats() -> dict:
+    """
+    Return live connection pool statistics for both engines.
+
+    Returns:
+    dict: Pool configuration and per-engine pool statistics, None for an
+    engine that has not been created yet.
+    """
+    return {
+        "async_enabled": DATABASE_ASYNC_ENABLED,
+        "settings": POOL_OPTIONS,
+        "sync": pool_statistics.snapshot(_engine.pool) if _engine else None,
+        "async": (
+            async_pool_statistics.snapshot(_async_engine.pool)
+            if _async_engine
+            else None
+        ),
+    }
+
+
+async def run_in_transaction(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run `func(conn, *args)` inside a transaction without blocking the event loop.
+
+    With DATABASE_ASYNC_ENABLED the function runs on the asyncpg engine
+    through AsyncConnection.run_sync, so concurrency is bounded by the
+    connection pool. Otherwise it runs on the psycopg2 engine in the
+    threadpool. The function receives a regular synchronous Connection
+    either way, so queries are written once.
+
+    Parameters:
+    - func (Callable[..., T]): Function taking a Connection and the arguments.
+    - args (Any): Extra arguments passed to the function.
+
+    Returns:
+    T: The return value of the function.
+    """
+    if DATABASE_ASYNC_ENABLED:
+        async with get_async_engine().begin() as conn:
+            return await conn.run_sync(func, *args)
+    return await run_in_threadpool(_run_in_sync_transaction, func, *args)
+
+
+def _run_in_sync_transaction(func: Callable[..., T], *args: Any) -> T:
+    with get_engine().begin() as conn:
+        return func(conn, *args)
+
+
+async def stream_in_batches(
+    stmt: Executable, batch_size: int = DATABASE_STREAM_BATCH_SIZE
+) -> AsyncIterator[List[dict]]:
+    """
+    Stream the rows of a query through a server-side cursor.
+
+    Only one batch is held in memory at a time, and the first batch is
+    yielded as soon as the database returns it. The connection is held
+    until the iterator is exhausted or closed.
+
+    Parameters:
+    - stmt (Executable): The query to stream.
+    - batch_size (int): Number of rows fetched per round trip.
+
+    Returns:
+    AsyncIterator[List[dict]]: Batches of rows as dictionaries.
+    """
+    if DATABASE_ASYNC_ENABLED:
+        async with get_async_engine().connect() as conn:
+            result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+            keys = tuple(result.keys())
+            async for rows in result.partitions():
+                yield rows_as_dicts(keys, rows)
+    else:
+        batches = _stream_sync_batches(stmt, batch_size)
+        try:
+            async for batch in iterate_in_threadpool(batches):
+                yield batch
+        finally:
+            # Release the cursor and its connection when the consumer stops
+            # early, e.g. the client disconnected, rather than on collection
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(batches.close)
+
+
+def _stream_sync_batches(
+    stmt: Executable, batch_size: int
+) -> Generator[List[dict], None, None]:
+    with get_engine().connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(stmt)
+        keys = tuple(result.keys())
+        for rows in result.partitions():
+            yield rows_as_dicts(keys, rows)
+
+
+def rows_as_dicts(keys: Sequence[str], rows: Sequence[Row]) -> List[dict]:
+    """
+    Convert rows to dictionaries keyed by column name.
+
+    Rows are paired with the keys directly, which is several times faster
+    than building a RowMapping per row, so select only the columns the
+    caller needs and let the response models convert UUIDs and enums.
+
+    Parameters:
+    - keys (Sequence[str]): The column names, e.g. tuple(result.keys()).
+    - rows (Sequence[Row]): The rows to convert.
+
+    Returns:
+    List[dict]: One dictionary per row.
+    """
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def fetch_one_as_dict(conn: Connection, stmt: Executable) -> Optional[dict]:
+    """
+    Execute a statement and return its first row as a dictionary.
+    """
+    row = conn.execute(stmt).mappings().first()
+    return dict(row) if row is not None else None
+
+
+def fetch_all_as_dicts(conn: Connection, stmt: Executable) -> List[dict]:
+    """
+    Execute a statement and return every row as a dictionary.
+    """
+    result = conn.execute(stmt)
+    return rows_as_dicts(tuple(result.keys()), result.fetchall())
+
+
+def insert_and_get_id(conn: Connection, stmt: Executable) -> str:
+    """
+    Execute an insert and return the new row's primary key as a string.
+    """
+    return str(conn.execute(stmt).inserted_primary_key[0])
+
+
+def execute_statement(conn: Connection, stmt: Executable) -> None:
+    """
+    Execute a statement, discarding any result.
+    """
+    conn.execute(stmt)
@@ -0,0 +1,103 @@
+import time
+from typing import Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+from src.utils.metrics import Counter, Histogram
+
+
+class PoolStatistics:
+    """
+    Counters describing how an engine's connection pool is used.
+
+    Attributes:
+    - checkout_wait (Histogram): Seconds spent getting a connection from the pool,
+      including opening a new one when the pool has to grow.
+    - connects (Counter): New database connections opened.
+    - connect_failures (Counter): Failed attempts to open a connection.
+    - checkout_timeouts (Counter): Checkouts that gave up after the pool timeout.
+    """
+
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram()
+        self.connects = Counter()
+        self.connect_failures = Counter()
+        self.checkout_timeouts = Counter()
+
+    def instrument(self, engine: Engine) -> None:
+        """
+        Count new connections opened by an engine.
+
+        Parameters:
+        - engine (Engine): The (sync) engine to listen to.
+        """
+        event.listen(engine, "connect", lambda *_: self.connects.inc())
+
+    def snapshot(self, pool: Pool) -> dict:
+        """
+        Return the current pool state together with the counters.
+
+        Parameters:
+        - pool (Pool): The pool these statistics belong to.
+
+        Returns:
+        dict: Pool size, connections in use, overflow in use and the counters.
+        """
+        state = {}
+        # Both engines use QueuePool subclasses, see instrumented_pool_class
+        if isinstance(pool, QueuePool):
+            state = {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow_in_use": max(0, pool.overflow()),
+            }
+        return {
+            **state,
+            "connects": int(self.connects.value),
+            "connect_failures": int(self.connect_failures.value),
+            "checkout_timeouts": int(self.checkout_timeouts.value),
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+        }
+
+
+class _InstrumentedPoolMixin:
+    statistics: PoolStatistics
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except TimeoutError:
+            self.statistics.checkout_timeouts.inc()
+            raise
+        except Exception:
+            self.statistics.connect_failures.inc()
+            raise
+        self.statistics.checkout_wait.observe(time.perf_counter() - started_at)
+        return connection
+
+
+def instrumented_pool_class(pool_class: Type[Pool], statistics: PoolStatistics) -> type:
+    """
+    Build a pool class that records checkout times and failures.
+
+    The statistics live on the class, so they survive the pool being
+    recreated when the engine is disposed.
+
+    Parameters:
+    - pool_class (Type[Pool]): The pool class to extend, e.g. QueuePool.
+    - statistics (PoolStatistics): Where the measurements are recorded.
+
+    Returns:
+    type: A subclass of pool_class to pass as create_engine(poolclass=...).
+    """
+    return type(
+        f"Instrumented{pool_class.__name__}",
+        (_InstrumentedPoolMixin, pool_class),
+        # Keep the pool's logger under "sqlalchemy.pool" like the base class
+        {"statistics": statistics, "__module__": pool_class.__module__},
+    )
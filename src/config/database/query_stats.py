@@ -0,0 +1,245 @@
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from starlette.types import ASGIApp
+
+from src.utils.index import get_env_variable
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged with a warning, 0 to disable
+DATABASE_SLOW_QUERY_MS = float(get_env_variable("DATABASE_SLOW_QUERY_MS", "200"))
+# Expose the query count and database time of each request as response headers
+DATABASE_QUERY_HEADERS = (
+    get_env_variable("DATABASE_QUERY_HEADERS", "false").lower() == "true"
+)
+STATEMENT_LOG_LENGTH = 500
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """
+    Queries issued on behalf of one request (or one capture).
+
+    Attributes:
+    - label (str): What the queries belong to, e.g. "GET /users/whoami".
+    - count (int): Number of statements executed.
+    - total_seconds (float): Time spent executing them.
+    - slowest_seconds (float): Duration of the slowest statement.
+    - slowest_statement (Optional[str]): SQL of the slowest statement.
+    - statements (Optional[List[str]]): Every statement, when recorded.
+    """
+
+    __slots__ = (
+        "label",
+        "count",
+        "total_seconds",
+        "slowest_seconds",
+        "slowest_statement",
+        "statements",
+    )
+
+    def __init__(self, label: str = "", record_statements: bool = False):
+        self.label = label
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Optional[List[str]] = [] if record_statements else None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def merge(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        if other.slowest_seconds >= self.slowest_seconds:
+            self.slowest_seconds = other.slowest_seconds
+            self.slowest_statement = other.slowest_statement
+        if self.statements is not None and other.statements is not None:
+            self.statements.extend(other.statements)
+
+    def summary(self) -> dict:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.total_seconds * 1000, 2),
+            "slowest_ms": round(self.slowest_seconds * 1000, 2),
+            "slowest_statement": _compact(self.slowest_statement),
+        }
+
+
+# Stats of the request being handled; contextvars follow the request into
+# run_sync greenlets and threadpool workers.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+# Open capture_queries() blocks, which also collect finished requests
+_captures: Set[QueryStats] = set()
+
+
+def _compact(statement: Optional[str]) -> Optional[str]:
+    if statement is None:
+        return None
+    return _WHITESPACE.sub(" ", statement).strip()[:STATEMENT_LOG_LENGTH]
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if DATABASE_SLOW_QUERY_MS and elapsed * 1000 >= DATABASE_SLOW_QUERY_MS:
+        # Parameters are left out: they may hold password hashes or emails
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms)"
+            f"{' in ' + stats.label if stats is not None else ''}: "
+            f"{_compact(statement)}"
+        )
+
+
+def _handle_error(exception_context) -> None:  # type: ignore[no-untyped-def]
+    # after_cursor_execute does not run for failed statements
+    started_at = exception_context.connection.info.get("query_started_at")
+    if started_at:
+        started_at.pop()
+
+
+def instrument_queries(engine: Engine) -> None:
+    """
+    Time every statement an engine executes.
+
+    Parameters:
+    - engine (Engine): The (sync) engine to listen to.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """
+    Record the statements executed while the block runs, both directly by
+    the block and by every HTTP request that completes meanwhile, whichever
+    thread serves it (e.g. a TestClient). Background tasks are not included.
+
+    Returns:
+    Iterator[QueryStats]: Stats that fill up as statements run.
+    """
+    stats = QueryStats(label="capture", record_statements=True)
+    token = current_query_stats.set(stats)
+    _captures.add(stats)
+    try:
+        yield stats
+    finally:
+        _captures.discard(stats)
+        current_query_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Fail if the block executes more than `max_queries` statements.
+
+    Meant for checks like:
+
+        with assert_max_queries(2):
+            client.get("/users/whoami")
+
+    Parameters:
+    - max_queries (int): The largest acceptable number of statements.
+
+    Returns:
+    Iterator[QueryStats]: The captured statements.
+
+    Raises:
+    - AssertionError: If more statements were executed, listing them.
+    """
+    with capture_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        statements = "\n".join(
+            f"  {n}. {_compact(statement)}"
+            for n, statement in enumerate(stats.statements or [], start=1)
+        )
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {stats.count} were executed:\n"
+            f"{statements}"
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware collecting the queries of each request.
+
+    With DATABASE_QUERY_HEADERS the response gets X-DB-Query-Count and
+    X-DB-Time-Ms headers covering the queries run before the response
+    started. The complete numbers, including queries run while a body is
+    streamed, are logged at DEBUG level when the request finishes.
+    """
+
+    def __init__(self, app: ASGIApp, expose_headers: bool = DATABASE_QUERY_HEADERS):
+        self.app = app
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope, receive, send):  # type: ignore[no-untyped-def]
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(
+            label=f"{scope['method']} {scope['path']}",
+            record_statements=bool(_captures),
+        )
+        token = current_query_stats.set(stats)
+
+        async def send_with_headers(message) -> None:  # type: ignore[no-untyped-def]
+            if message["type"] == "http.response.start" and self.expose_headers:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.total_seconds * 1000:.2f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_query_stats.reset(token)
+            for capture in tuple(_captures):
+                capture.merge(stats)
+            if stats.count and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{stats.label}: {stats.summary()}")
@@ -0,0 +1,465 @@
+"""
+Generate a large, deterministic synthetic data set for benchmarking.
+
+Usage:
+    python -m src.config.database.seeders.seed [--users 10000]
+        [--projects 20000] [--members 8] [--documents 3] [--seed 42]
+        [--prefix seed] [--reset]
+
+Users, projects, memberships and documents are generated from a seeded
+random number generator and bulk-loaded with COPY in a single transaction,
+so the same arguments always produce the same rows (apart from the bcrypt
+salt of the shared password). The data is skewed the way production data is:
+a few owners hold most projects, a few users are members of many projects,
+member and document counts per project are long-tailed, and recent rows
+outnumber old ones.
+
+--reset truncates the users, projects, project_memberships,
+project_documents and project_members tables first, which is what makes two
+benchmark runs comparable. Never run it against a database you care about.
+"""
+
+import argparse
+import csv
+import io
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from psycopg2.extensions import cursor as Cursor
+
+from src.config.database.db_connection import get_engine
+from src.utils.constants import UPLOADS_FOLDER_PATH
+from src.utils.index import hash_password
+
+# Rows buffered in memory per COPY statement
+COPY_CHUNK_ROWS = 50000
+
+FIRST_NAMES = (
+    "James",
+    "Mary",
+    "Robert",
+    "Patricia",
+    "John",
+    "Jennifer",
+    "Michael",
+    "Linda",
+    "David",
+    "Elizabeth",
+    "William",
+    "Barbara",
+    "Richard",
+    "Susan",
+    "Joseph",
+    "Jessica",
+    "Thomas",
+    "Sarah",
+    "Priya",
+    "Wei",
+    "Fatima",
+    "Carlos",
+    "Yuki",
+    "Olga",
+    "Ahmed",
+    "Aisha",
+    "Mateo",
+    "Chloe",
+    "Noah",
+    "Amara",
+)
+LAST_NAMES = (
+    "Smith",
+    "Johnson",
+    "Williams",
+    "Brown",
+    "Jones",
+    "Garcia",
+    "Miller",
+    "Davis",
+    "Rodriguez",
+    "Martinez",
+    "Hernandez",
+    "Lopez",
+    "Gonzalez",
+    "Wilson",
+    "Anderson",
+    "Thomas",
+    "Taylor",
+    "Moore",
+    "Patel",
+    "Nguyen",
+    "Kim",
+    "Singh",
+    "Chen",
+    "Ivanova",
+    "Okafor",
+    "Tanaka",
+    None,
+)
+# (city, country, weight): a handful of locations dominate
+LOCATIONS = (
+    ("London", "United Kingdom", 20),
+    ("New York", "United States", 18),
+    ("Berlin", "Germany", 10),
+    ("Bengaluru", "India", 10),
+    ("Singapore", "Singapore", 8),
+    ("Toronto", "Canada", 6),
+    ("Sydney", "Australia", 5),
+    ("Lagos", "Nigeria", 4),
+    ("Sao Paulo", "Brazil", 4),
+    ("Tokyo", "Japan", 4),
+    ("Reykjavik", "Iceland", 1),
+    ("Nairobi", "Kenya", 1),
+)
+PROJECT_STATUSES = (("OPEN", 25), ("UPCOMING", 15), ("IN_PROGRESS", 40), ("CLOSED", 20))
+DOCUMENT_EXTENSIONS = ("pdf", "pdf", "pdf", "docx", "xlsx", "png", "jpg")
+
+
+def _skewed_index(rng: random.Random, size: int, skew: float) -> int:
+    """
+    Draw an index in [0, size) where low indexes are far more likely.
+
+    With skew 3, the first 10% of indexes receive about 46% of the draws.
+    """
+    return min(int(size * rng.random() ** skew), size - 1)
+
+
+def _long_tail_count(rng: random.Random, mean: float, cap: int) -> int:
+    """
+    Draw a log-normally distributed count with the given mean.
+    """
+    if mean <= 0:
+        return 0
+    sigma = 1.0
+    mu = math.log(mean) - sigma**2 / 2
+    return min(int(rng.lognormvariate(mu, sigma)), cap)
+
+
+def _recent_between(rng: random.Random, start: datetime, end: datetime) -> datetime:
+    """
+    Draw a timestamp in [start, end], biased towards end.
+    """
+    return start + (end - start) * math.sqrt(rng.random())
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _weighted(rng: random.Random, choices: Sequence[tuple]) -> tuple:
+    return rng.choices(choices, weights=[choice[-1] for choice in choices])[0]
+
+
+class SyntheticDataSet:
+    """
+    Deterministic generator of users, projects, memberships and documents.
+
+    Rows are produced lazily, but the generators must be consumed in order
+    (users, projects, memberships, documents) because later tables refer to
+    rows drawn earlier from the same random number generator.
+    """
+
+    def __init__(
+        self,
+        users: int,
+        projects: int,
+        members_per_project: float,
+        documents_per_project: float,
+        seed: int,
+        prefix: str,
+        end: datetime,
+        days: int,
+        password_hash: str,
+    ):
+        self.users = users
+        self.projects = projects
+        self.members_per_project = members_per_project
+        self.documents_per_project = documents_per_project
+        self.prefix = prefix
+        self.end = end
+        self.start = end - timedelta(days=days)
+        self.password_hash = password_hash
+        self.rng = random.Random(seed)
+        self.user_rows: List[Tuple[uuid.UUID, str, datetime]] = []
+        self.project_rows: List[Tuple[uuid.UUID, datetime]] = []
+        self.counts = {"users": 0, "projects": 0, "memberships": 0, "documents": 0}
+
+    def generate_users(self) -> Iterator[tuple]:
+        rng = self.rng
+        for n in range(self.users):
+            user_id = _uuid(rng)
+            username = f"{self.prefix}_user_{n:07d}"
+            email = f"{username}@example.com"
+            created_at = _recent_between(rng, self.start, self.end)
+            role = "ADMIN" if n < max(1, self.users // 1000) else "USER"
+            self.user_rows.append((user_id, email, created_at))
+            self.counts["users"] += 1
+            yield (
+                user_id,
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                username,
+                email,
+                self.password_hash,
+                role,
+                rng.random() < 0.8,
+                rng.random() < 0.02,
+                created_at,
+            )
+
+    def generate_projects(self) -> Iterator[tuple]:
+        rng = self.rng
+        for n in range(self.projects):
+            # A few power users own most of the projects
+            owner_id, _, owner_created_at = self.user_rows[
+                _skewed_index(rng, len(self.user_rows), 3)
+            ]
+            project_id = _uuid(rng)
+            created_at = _recent_between(rng, owner_created_at, self.end)
+            start_date = created_at + timedelta(days=rng.randint(0, 90))
+            end_date = start_date + timedelta(days=rng.randint(7, 365))
+            city, country, _ = _weighted(rng, LOCATIONS)
+            self.project_rows.append((project_id, created_at))
+            self.counts["projects"] += 1
+            yield (
+                project_id,
+                f"Project {n:07d}",
+                f"Synthetic project {n} in {city}",
+                city,
+                country,
+                start_date,
+                end_date,
+                _weighted(rng, PROJECT_STATUSES)[0],
+                owner_id,
+                created_at,
+                created_at,
+            )
+
+    def generate_memberships(self) -> Iterator[tuple]:
+        rng = self.rng
+        guests = max(1, self.users // 2)
+        cap = max(1, self.users // 4)
+        for project_id, project_created_at in self.project_rows:
+            wanted = _long_tail_count(rng, self.members_per_project, cap)
+            emails: Set[str] = set()
+            for _ in range(wanted * 3):
+                if len(emails) == wanted:
+                    break
+                if rng.random() < 0.1:
+                    # Invited people who never registered
+                    guest = _skewed_index(rng, guests, 2)
+                    email = f"{self.prefix}_guest_{guest:07d}@example.org"
+                    user_id: Optional[uuid.UUID] = None
+                else:
+                    user_id, email, _ = self.user_rows[
+                        _skewed_index(rng, len(self.user_rows), 2)
+                    ]
+                if email in emails:
+                    continue
+                emails.add(email)
+                created_at = _recent_between(rng, project_created_at, self.end)
+                self.counts["memberships"] += 1
+                yield (_uuid(rng), project_id, email, user_id, created_at, created_at)
+
+    def generate_documents(self) -> Iterator[tuple]:
+        rng = self.rng
+        for project_id, project_created_at in self.project_rows:
+            for n in range(_long_tail_count(rng, self.documents_per_project, 500)):
+                extension = rng.choice(DOCUMENT_EXTENSIONS)
+                created_at = _recent_between(rng, project_created_at, self.end)
+                self.counts["documents"] += 1
+                yield (
+                    _uuid(rng),
+                    f"{UPLOADS_FOLDER_PATH}/{project_id}-{n}.{extension}",
+                    project_id,
+                    created_at,
+                    created_at,
+                )
+
+
+def _copy_rows(
+    cursor: Cursor, table: str, columns: Sequence[str], rows: Iterable[tuple]
+) -> None:
+    """
+    Load rows into a table with COPY, COPY_CHUNK_ROWS rows at a time.
+    """
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffered = 0
+    for row in rows:
+        # In CSV format an unquoted empty field is NULL
+        writer.writerow(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            ]
+        )
+        buffered += 1
+        if buffered == COPY_CHUNK_ROWS:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            buffer.seek(0)
+            buffer.truncate()
+            buffered = 0
+    if buffered:
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+
+
+def seed_database(data_set: SyntheticDataSet, reset: bool) -> dict:
+    """
+    Load a synthetic data set in one transaction and refresh planner statistics.
+
+    Parameters:
+    - data_set (SyntheticDataSet): The data to load.
+    - reset (bool): Truncate the seeded tables first.
+
+    Returns:
+    dict: Rows loaded per table.
+    """
+    connection = get_engine().raw_connection()
+    try:
+        cursor = connection.cursor()
+        if reset:
+            cursor.execute(
+                "TRUNCATE project_documents, project_memberships, project_members, "
+                "projects, users"
+            )
+        # users.updated_at keeps its server default (the load time) so the
+        # identifier filter's incremental sync picks the new users up
+        _copy_rows(
+            cursor,
+            "users",
+            (
+                "id",
+                "first_name",
+                "last_name",
+                "username",
+                "email",
+                "password",
+                "role",
+                "is_verified",
+                "is_deleted",
+                "created_at",
+            ),
+            data_set.generate_users(),
+        )
+        _copy_rows(
+            cursor,
+            "projects",
+            (
+                "id",
+                "name",
+                "description",
+                "city",
+                "country",
+                "start_date",
+                "end_date",
+                "status",
+                "project_owner_id",
+                "created_at",
+                "updated_at",
+            ),
+            data_set.generate_projects(),
+        )
+        _copy_rows(
+            cursor,
+            "project_memberships",
+            ("id", "project_id", "email", "user_id", "created_at", "updated_at"),
+            data_set.generate_memberships(),
+        )
+        _copy_rows(
+            cursor,
+            "project_documents",
+            ("id", "document_path", "project_id", "created_at", "updated_at"),
+            data_set.generate_documents(),
+        )
+        # Unlike VACUUM, ANALYZE can run in the loading transaction
+        cursor.execute(
+            "ANALYZE users, projects, project_memberships, project_documents"
+        )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return data_set.counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--users", type=int, default=10000, help="Users (default: 10000)"
+    )
+    parser.add_argument(
+        "--projects", type=int, default=20000, help="Projects (default: 20000)"
+    )
+    parser.add_argument(
+        "--members",
+        type=float,
+        default=8,
+        help="Mean members per project, long-tailed (default: 8)",
+    )
+    parser.add_argument(
+        "--documents",
+        type=float,
+        default=3,
+        help="Mean documents per project, long-tailed (default: 3)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Random seed (default: 42)"
+    )
+    parser.add_argument(
+        "--prefix",
+        default="seed",
+        help="Prefix of generated usernames and emails (default: seed)",
+    )
+    parser.add_argument(
+        "--end",
+        default="2024-01-01",
+        help="Newest creation date, fixed so runs match (default: 2024-01-01)",
+    )
+    parser.add_argument(
+        "--days", type=int, default=730, help="Days of history (default: 730)"
+    )
+    parser.add_argument(
+        "--password",
+        default="password",
+        help="Password of every generated user (default: password)",
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="Truncate the seeded tables first"
+    )
+    args = parser.parse_args()
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+
+    data_set = SyntheticDataSet(
+        users=args.users,
+        projects=args.projects,
+        members_per_project=args.members,
+        documents_per_project=args.documents,
+        seed=args.seed,
+        prefix=args.prefix,
+        end=datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc),
+        days=args.days,
+        # One hash shared by every user; bcrypt per row would dominate the load
+        password_hash=hash_password(args.password),
+    )
+
+    started_at = time.perf_counter()
+    counts = seed_database(data_set, reset=args.reset)
+    elapsed = time.perf_counter() - started_at
+    print(
+        ", ".join(f"{table}={count}" for table, count in counts.items())
+        + f" loaded in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,47 @@
+import time
 from typing import Annotated, Optional
 
-from fastapi import Cookie, HTTPException, status
+from fastapi import Cookie, Depends, HTTPException, status
 from jwt import DecodeError, ExpiredSignatureError
 from sqlalchemy import and_, select
 from sqlalchemy.exc import NoResultFound
 
-from schemas.users_schema import UserInfo
-from src.config.database.db_connection import engine
+from schemas.users_schema import UserInfo, UserRoleEnum
+from src.config.database.db_connection import fetch_one_as_dict, run_in_transaction
 from src.models.user_model import UserModel
-from src.utils.index import decode_jwt_token
+from src.utils.cache import TTLCache
+from src.utils.constants import (
+    PRINCIPAL_CLAIMS,
+    STATEFUL_AUTH_MODE,
+    STATELESS_AUTH_MODE,
+)
+from src.utils.index import decode_jwt_token, get_env_variable, token_version
 
+# "stateful" re-reads the user for every token, "stateless" trusts the claims
+# signed into the token while its version stamp is within the freshness window.
+AUTH_MODE = get_env_variable("AUTH_MODE", STATEFUL_AUTH_MODE).lower()
+AUTH_FRESHNESS_SECONDS = float(get_env_variable("AUTH_FRESHNESS_SECONDS", "300"))
 
-def verify_auth_token(token: Annotated[str | None, Cookie()] = None) -> Optional[dict]:
+# Principals resolved from a token are cached so repeated requests with the
+# same token skip the users lookup until the entry expires or is invalidated.
+AUTH_CACHE_MAX_SIZE = int(get_env_variable("AUTH_CACHE_MAX_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(get_env_variable("AUTH_CACHE_TTL_SECONDS", "60"))
+
+principal_cache = TTLCache(
+    max_size=AUTH_CACHE_MAX_SIZE, ttl_seconds=AUTH_CACHE_TTL_SECONDS
+)
+
+
+async def verify_auth_token(
+    token: Annotated[str | None, Cookie()] = None,
+) -> Optional[dict]:
     """
     Verify the user's authentication token and retrieve user information.
 
+    In stateless mode the user information is built from the token claims
+    alone, and the database is only consulted once the token's version stamp
+    is older than AUTH_FRESHNESS_SECONDS.
+
     Parameters:
     - token (Annotated[str | None, Cookie()]): The authentication token from the request cookies.
 
@@ -22,10 +49,29 @@ def verify_auth_token(token: Annotated[str | None, Cookie()] = None) -> Optional
     Optional[dict]: User information dictionary if the token is valid, None otherwise.
 
     Raises:
-    - HTTPException: If the token is invalid or expired.
+    - HTTPException: If the token is invalid, expired or carries a stale version.
     """
     try:
+        if token is None:
+            raise DecodeError("Missing token")
         payload = decode_jwt_token(token)
+        is_stateless_token = (
+            AUTH_MODE == STATELESS_AUTH_MODE
+            and all(claim in payload for claim in PRINCIPAL_CLAIMS)
+            and "ver" in payload
+            and "iat" in payload
+        )
+
+        if (
+            is_stateless_token
+            and time.time() - payload["iat"] <= AUTH_FRESHNESS_SECONDS
+        ):
+            return {claim: payload[claim] for claim in PRINCIPAL_CLAIMS}
+
+        cached_user = principal_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+
         stmt = (
             select(
                 UserModel.id,
@@ -34,6 +80,7 @@ def verify_auth_token(token: Annotated[str | None, Cookie()] = None) -> Optional
                 UserModel.last_name,
                 UserModel.username,
                 UserModel.role,
+                UserModel.updated_at,
             )
             .where(
                 and_(
@@ -45,20 +92,60 @@ def verify_auth_token(token: Annotated[str | None, Cookie()] = None) -> Optional
             .limit(1)
         )
 
-        with engine.begin() as conn:
-            result = conn.execute(stmt)
-            user_data = result.fetchone()
+        user_dict: UserInfo = await run_in_transaction(fetch_one_as_dict, stmt)
 
-            if user_data:
-                user_dict: UserInfo = dict(zip(result.keys(), user_data))
-                user_dict["id"] = str(user_dict["id"])
-                return user_dict
-            else:
-                # User not found in the database
-                return None
+        if user_dict:
+            updated_at = user_dict.pop("updated_at")
+
+            if is_stateless_token and payload["ver"] != token_version(updated_at):
+                # The user changed after the token was issued
+                raise DecodeError("Stale token version")
+
+            user_dict["id"] = str(user_dict["id"])
+            principal_cache.set(token, user_dict, group=user_dict["id"])
+            return user_dict
+        else:
+            # User not found in the database
+            return None
 
     except (KeyError, DecodeError, ExpiredSignatureError, NoResultFound):
         # Invalid or expired token
         raise HTTPException(
             detail="Invalid Token!", status_code=status.HTTP_401_UNAUTHORIZED
         )
+
+
+async def verify_admin_role(
+    user: Annotated[Optional[dict], Depends(verify_auth_token)],
+) -> dict:
+    """
+    Verify that the authenticated user is an administrator.
+
+    Parameters:
+    - user (Optional[dict]): The user resolved by verify_auth_token.
+
+    Returns:
+    dict: The user information.
+
+    Raises:
+    - HTTPException: 401 if the token is invalid, 403 if the user is not an admin.
+    """
+    if not user:
+        raise HTTPException(
+            detail="Invalid Token!", status_code=status.HTTP_401_UNAUTHORIZED
+        )
+    if user["role"] != UserRoleEnum.ADMIN:
+        raise HTTPException(
+            detail="Admin Access Required!", status_code=status.HTTP_403_FORBIDDEN
+        )
+    return user
+
+
+def invalidate_cached_principal(user_id: str) -> None:
+    """
+    Drop every cached principal of a user so the next request re-reads it.
+
+    Parameters:
+    - user_id (str): The ID of the user whose details changed.
+    """
+    principal_cache.invalidate_group(str(user_id))
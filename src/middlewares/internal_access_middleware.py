@@ -0,0 +1,49 @@
+import secrets
+from typing import Annotated
+
+from fastapi import Header, HTTPException, Request, status
+
+from src.utils.index import get_env_variable
+
+# Internal endpoints require this value in the X-Internal-Token header, and
+# are closed to everyone while it is empty
+INTERNAL_API_TOKEN = get_env_variable("INTERNAL_API_TOKEN", "")
+# Opt-in for local development: also let loopback clients in without the
+# token. Never enable it behind a reverse proxy on the same host, where every
+# request comes from loopback.
+INTERNAL_ALLOW_LOOPBACK = (
+    get_env_variable("INTERNAL_ALLOW_LOOPBACK", "false").lower() == "true"
+)
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+def verify_internal_access(
+    request: Request,
+    x_internal_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """
+    Restrict internal endpoints to operators.
+
+    Parameters:
+    - request (Request): The incoming request.
+    - x_internal_token (Annotated[str | None, Header()]): The internal API
+      token header.
+
+    Raises:
+    - HTTPException: If the token is missing or wrong, unless loopback
+      clients are allowed and the caller is local.
+    """
+    if (
+        INTERNAL_API_TOKEN
+        and x_internal_token
+        and secrets.compare_digest(x_internal_token, INTERNAL_API_TOKEN)
+    ):
+        return
+    if (
+        INTERNAL_ALLOW_LOOPBACK
+        and request.client is not None
+        and request.client.host in LOOPBACK_HOSTS
+    ):
+        return
+
+    raise HTTPException(detail="Forbidden", status_code=status.HTTP_403_FORBIDDEN)
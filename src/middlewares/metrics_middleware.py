@@ -0,0 +1,190 @@
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.routing import Mount
+from starlette.types import ASGIApp
+
+from src.utils.index import get_env_variable
+from src.utils.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    format_labels,
+    format_value,
+    histogram_samples,
+)
+
+METRICS_ENABLED = get_env_variable("METRICS_ENABLED", "true").lower() == "true"
+# Anything else is reported as OTHER to keep the number of series bounded
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RouteMetrics:
+    """
+    Metrics of one method and route template.
+
+    Attributes:
+    - in_flight (Gauge): Requests currently being handled.
+    - duration (Histogram): Seconds from receiving the request to the end of
+      the response.
+    - responses (Dict[int, Counter]): Completed requests per status code.
+    """
+
+    __slots__ = ("in_flight", "duration", "responses")
+
+    def __init__(self) -> None:
+        self.in_flight = Gauge()
+        self.duration = Histogram()
+        self.responses: Dict[int, Counter] = {}
+
+    def count_response(self, status_code: int) -> None:
+        counter = self.responses.get(status_code)
+        if counter is None:
+            counter = self.responses.setdefault(status_code, Counter())
+        counter.inc()
+
+
+class HttpMetrics:
+    """
+    Registry of per-route HTTP metrics, rendered in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def route(self, method: str, route: str) -> RouteMetrics:
+        """
+        Return the metrics of a method and route template, creating them once.
+        """
+        key = (method, route)
+        metrics = self._routes.get(key)
+        if metrics is None:
+            metrics = self._routes.setdefault(key, RouteMetrics())
+        return metrics
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+        str: The exposition text, ending with a newline.
+        """
+        requests: List[str] = []
+        in_flight: List[str] = []
+        durations: List[str] = []
+        for (method, route), metrics in sorted(self._routes.items()):
+            labels = {"method": method, "route": route}
+            for status_code, counter in sorted(metrics.responses.items()):
+                requests.append(
+                    f"http_requests_total"
+                    f"{format_labels({**labels, 'status': str(status_code)})} "
+                    f"{format_value(counter.value)}"
+                )
+            in_flight.append(
+                f"http_requests_in_flight{format_labels(labels)} "
+                f"{format_value(metrics.in_flight.value)}"
+            )
+            durations.extend(
+                histogram_samples(
+                    "http_request_duration_seconds", labels, metrics.duration.snapshot()
+                )
+            )
+
+        return (
+            "\n".join(
+                [
+                    "# HELP http_requests_total Completed HTTP requests.",
+                    "# TYPE http_requests_total counter",
+                    *requests,
+                    "# HELP http_requests_in_flight HTTP requests being handled.",
+                    "# TYPE http_requests_in_flight gauge",
+                    *in_flight,
+                    "# HELP http_request_duration_seconds HTTP request latency.",
+                    "# TYPE http_request_duration_seconds histogram",
+                    *durations,
+                ]
+            )
+            + "\n"
+        )
+
+
+http_metrics = HttpMetrics()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, status codes, in-flight
+    requests and latency per method and route template.
+
+    Routes are labelled with their template (e.g. /users/{user_id}) rather
+    than the raw path, so the number of series stays bounded. The template
+    is resolved from the application's routes before the request is handled,
+    which is what allows an in-flight gauge per route.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HttpMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+        self._static_routes: Dict[str, str] = {}
+        self._templates: Optional[List[Tuple[re.Pattern, str]]] = None
+
+    async def __call__(self, scope, receive, send):  # type: ignore[no-untyped-def]
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        metrics = self.metrics.route(method, self._route_template(scope))
+        status_code = 500
+
+        async def send_with_status(message) -> None:  # type: ignore[no-untyped-def]
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.duration.observe(time.perf_counter() - started_at)
+            metrics.in_flight.dec()
+            metrics.count_response(status_code)
+
+    def _route_template(self, scope) -> str:  # type: ignore[no-untyped-def]
+        if self._templates is None:
+            self._static_routes, self._templates = self._build_templates(
+                scope["app"].routes
+            )
+        path = scope["path"]
+        template = self._static_routes.get(path)
+        if template is not None:
+            return template
+        for path_regex, template in self._templates:
+            if path_regex.match(path):
+                return template
+        return UNMATCHED_ROUTE
+
+    @staticmethod
+    def _build_templates(routes) -> tuple:  # type: ignore[no-untyped-def]
+        # Paths without parameters are looked up directly; the rest are
+        # matched in routing order. Mounted applications are labelled with
+        # their mount path.
+        static_routes: Dict[str, str] = {}
+        templates: List[Tuple[re.Pattern, str]] = []
+        for route in routes:
+            if not hasattr(route, "path_regex"):
+                continue
+            if isinstance(route, Mount):
+                templates.append((route.path_regex, route.path))
+            elif route.param_convertors or any(
+                path_regex.match(route.path_format) for path_regex, _ in templates
+            ):
+                # Also keeps static paths shadowed by an earlier template in order
+                templates.append((route.path_regex, route.path_format))
+            else:
+                static_routes.setdefault(route.path_format, route.path_format)
+        return static_routes, templates
@@ -1,6 +1,5 @@
 from typing import Any
-from datetime import datetime
-from sqlalchemy import Column, DateTime, String, text, ForeignKey
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import expression
@@ -37,16 +36,32 @@ class ProjectDocumentsModel(Base):
         server_default=text("(gen_random_uuid())"),
     )
     document_path = Column(String, nullable=False)
+    # SHA-256 of the content, shared by every document with the same bytes
+    content_hash = Column(String(64), nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    file_name = Column(String, nullable=True)
     project_id = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id"))
     project = relationship("ProjectModel", back_populates="project_documents")
 
-    created_at: datetime = Column(
+    created_at = Column(
         DateTime(timezone=True),
         nullable=False,
         server_default=Utcnow(),
     )
-    updated_at: datetime = Column(
+    updated_at = Column(
         DateTime(timezone=True),
         nullable=False,
         server_default=Utcnow(),
     )
+
+
+project_documents_project_id_index = Index(
+    "project_documents_project_id_index",
+    ProjectDocumentsModel.project_id,
+    ProjectDocumentsModel.created_at,
+)
+
+project_documents_content_hash_index = Index(
+    "project_documents_content_hash_index",
+    ProjectDocumentsModel.content_hash,
+)
@@ -1,6 +1,6 @@
 from typing import Any
 from datetime import datetime
-from sqlalchemy import Column, DateTime, String, text, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import expression
@@ -22,7 +22,9 @@ def pg_utcnow(element: Any, compiler: Any, **kw: Any) -> Any:
 
 class ProjectMembersModel(Base):
     """
-    SQLAlchemy model for the 'project_members' table.
+    SQLAlchemy model for the legacy 'project_members' table.
+
+    Superseded by ProjectMembershipModel; kept for existing data only.
     """
 
     __tablename__ = "project_members"
@@ -38,7 +40,7 @@ class ProjectMembersModel(Base):
     )
     email_ids = Column(ARRAY(String), nullable=False)
     project_id = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id"))
-    project = relationship("ProjectModel", back_populates="project_members")
+    project = relationship("ProjectModel")
 
     created_at: datetime = Column(
         DateTime(timezone=True),
@@ -50,3 +52,8 @@ class ProjectMembersModel(Base):
         nullable=False,
         server_default=Utcnow(),
     )
+
+
+project_members_project_id_index = Index(
+    "project_members_project_id_index", ProjectMembersModel.project_id
+)
@@ -0,0 +1,78 @@
+from typing import Any
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import mapped_column, relationship
+from sqlalchemy.sql import expression
+
+from src.config.database.db_connection import Base
+
+
+class Utcnow(expression.FunctionElement):
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(Utcnow, "postgresql")
+def pg_utcnow(element: Any, compiler: Any, **kw: Any) -> Any:
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+class ProjectMembershipModel(Base):
+    """
+    SQLAlchemy model for the 'project_memberships' table.
+
+    One row per member email of a project. Emails are stored lowercased, and
+    user_id links the registered user with that email when the member was added.
+    """
+
+    __tablename__ = "project_memberships"
+    __table_args__ = (
+        UniqueConstraint(
+            "project_id", "email", name="project_memberships_project_id_email_key"
+        ),
+    )
+
+    class Config:
+        orm_mode = True
+
+    id = Column(
+        UUID(as_uuid=True),
+        nullable=False,
+        primary_key=True,
+        server_default=text("(gen_random_uuid())"),
+    )
+    project_id = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False
+    )
+    email = Column(String, nullable=False)
+    user_id = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    project = relationship("ProjectModel", back_populates="memberships")
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=Utcnow(),
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=Utcnow(),
+    )
+
+
+project_memberships_email_index = Index(
+    "project_memberships_email_index",
+    ProjectMembershipModel.email,
+    ProjectMembershipModel.created_at,
+    ProjectMembershipModel.id,
+)
@@ -1,5 +1,4 @@
 from typing import Any, List
-from datetime import datetime
 from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.compiler import compiles
@@ -36,10 +35,10 @@ class ProjectModel(Base):
         primary_key=True,
         server_default=text("(gen_random_uuid())"),
     )
-    name: str = Column(String, index=True, nullable=False)
-    description: str = Column(String, nullable=False)
-    city: str = Column(String, nullable=False)
-    country: str = Column(String, nullable=False)
+    name = Column(String, index=True, nullable=False)
+    description = Column(String, nullable=False)
+    city = Column(String, nullable=False)
+    country = Column(String, nullable=False)
     start_date = Column(
         DateTime(timezone=True),
         nullable=False,
@@ -54,17 +53,17 @@ class ProjectModel(Base):
         server_default=ProjectStatusEnum.UPCOMING,
         nullable=False,
     )
-    created_at: datetime = Column(
+    created_at = Column(
         DateTime(timezone=True),
         nullable=False,
         server_default=Utcnow(),
     )
-    updated_at: datetime = Column(
+    updated_at = Column(
         DateTime(timezone=True),
         nullable=False,
         server_default=Utcnow(),
     )
-    project_members = relationship("ProjectMembersModel", back_populates="project")
+    memberships = relationship("ProjectMembershipModel", back_populates="project")
     project_documents = relationship("ProjectDocumentsModel", back_populates="project")
     project_owner = relationship("UserModel", back_populates="projects")
     
@@ -72,3 +71,9 @@ class ProjectModel(Base):
 
 
 project_index = Index("project_index", ProjectModel.name)
+projects_owner_created_at_id_index = Index(
+    "projects_owner_created_at_id_index",
+    ProjectModel.project_owner_id,
+    ProjectModel.created_at,
+    ProjectModel.id,
+)
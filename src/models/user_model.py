@@ -9,6 +9,7 @@ from sqlalchemy.orm import relationship
 from src.config.database.db_connection import Base
 from src.schemas.users_schema import UserRoleEnum
 
+
 class Utcnow(expression.FunctionElement):
     type = DateTime()
     inherit_cache = True
@@ -73,3 +74,11 @@ class UserModel(Base):
 
 
 users_name_index = Index("users_name_index", UserModel.first_name, UserModel.last_name)
+users_created_at_id_index = Index(
+    "users_created_at_id_index",
+    UserModel.created_at,
+    UserModel.id,
+    postgresql_where=UserModel.is_deleted.is_(False),
+)
+# Incremental syncs of the identifier filter read users changed since a time
+users_updated_at_index = Index("users_updated_at_index", UserModel.updated_at)
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from src.config.database.db_connection import get_pool_stats
+from src.middlewares.authentication_middleware import principal_cache
+from src.middlewares.internal_access_middleware import verify_internal_access
+from src.middlewares.metrics_middleware import http_metrics
+from src.schemas.internal_schema import ProfilerSettings
+from src.services.identifier_filter_service import identifier_filter
+from src.utils.constants import API_ENDPOINTS
+from src.utils.password_hasher import password_hasher
+from src.utils.request_profiler import PROFILER_ENABLED, request_profiler
+from src.utils.startup_profiler import startup_profiler
+
+router = APIRouter(tags=["Internal"], dependencies=[Depends(verify_internal_access)])
+
+
+@router.get(API_ENDPOINTS["INTERNAL"]["STATS"], description="Runtime Statistics API")
+def get_runtime_stats() -> dict:
+    """
+    Endpoint for inspecting connection pools, caches and worker pools.
+
+    Returns:
+    dict: Live statistics of the database pools, the principal cache,
+    the password hasher, the identifier filter and the startup timings.
+    """
+    return {
+        "database_pool": get_pool_stats(),
+        "auth_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "identifier_filter": {"ready": identifier_filter.is_ready},
+        "startup": startup_profiler.report(),
+    }
+
+
+@router.get(
+    API_ENDPOINTS["INTERNAL"]["METRICS"],
+    description="Prometheus Metrics API",
+    response_class=PlainTextResponse,
+)
+def get_metrics() -> PlainTextResponse:
+    """
+    Endpoint for scraping the per-route HTTP metrics.
+
+    Returns:
+    PlainTextResponse: The metrics in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(
+        http_metrics.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.get(API_ENDPOINTS["INTERNAL"]["PROFILER"], description="Request Profiler API")
+def get_profiler_settings() -> dict:
+    """
+    Endpoint for inspecting the request profiler.
+
+    Returns:
+    dict: The profiler settings and the most recently written profiles.
+    """
+    return request_profiler.settings()
+
+
+@router.put(API_ENDPOINTS["INTERNAL"]["PROFILER"], description="Request Profiler API")
+def update_profiler_settings(settings: ProfilerSettings) -> dict:
+    """
+    Endpoint for changing the profiled fraction of requests or the profiling
+    mode without a restart.
+
+    Parameters:
+    - settings (ProfilerSettings): The settings to change.
+
+    Returns:
+    dict: The updated profiler settings.
+
+    Raises:
+    - HTTPException: If the profiler middleware is not installed.
+    """
+    if not PROFILER_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profiler Is Disabled, Set PROFILER_ENABLED=true!",
+        )
+    if settings.sample_rate is not None:
+        request_profiler.sample_rate = settings.sample_rate
+    if settings.mode is not None:
+        request_profiler.mode = settings.mode
+    return request_profiler.settings()
@@ -1,41 +1,50 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, File, Response, UploadFile
+from fastapi import APIRouter, Depends, File, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 
 from src.middlewares.authentication_middleware import verify_auth_token
 from src.middlewares.validate_file_middleware import validate_file
 
 from src.services.project_service import (
     create_project,
+    export_projects,
     add_project_members,
     fetch_project_member_by_project_id,
     create_project_documents_by_project_id,
     get_all_projects_with_pagination,
+    get_member_of_projects_with_pagination,
 )
 
-from src.schemas.index import BaseSuccessResponse
+from src.schemas.index import BaseSuccessResponse, ExportFormatEnum
 from src.schemas.projects_schema import (
+    AddProjectMembersResponse,
     CreateProjectDetails,
     CreateProjectMembers,
     GetAllProjectsResponse,
+    GetMemberOfProjectsResponse,
 )
-from src.utils.constants import API_ENDPOINTS
+from src.utils.constants import API_ENDPOINTS, MAX_PAGE_SIZE
 from src.utils.index import is_valid_uuid
+from src.utils.json_response import ValidatedJSONResponse, response_adapter
 
 router = APIRouter(tags=["Projects"])
 
 AuthMiddleWare = Annotated[str, Depends(verify_auth_token)]
 ValidateFileMiddleWare = Annotated[File, Depends(validate_file)]
 
+GetAllProjectsAdapter = response_adapter(GetAllProjectsResponse)
+GetMemberOfProjectsAdapter = response_adapter(GetMemberOfProjectsResponse)
+
 
 @router.post(
     API_ENDPOINTS["PROJECTS"]["DETAILS"],
     description="Create Project Details API",
     response_model=BaseSuccessResponse,
 )
-def create_project_details(
+async def create_project_details(
     user: AuthMiddleWare, body: CreateProjectDetails, response: Response
-) -> BaseSuccessResponse:
+) -> dict:
     """
     Endpoint for create new project.
 
@@ -50,19 +59,19 @@ def create_project_details(
     - SQLAlchemyError: If there is an error in the database operation.
     - Exception: For unexpected errors during create new project.
     """
-    return create_project(body, user, response)
+    return await create_project(body, user, response)
 
 
 @router.post(
     API_ENDPOINTS["PROJECTS"]["MEMBERS"],
     description="Add Project Members in Project API",
-    response_model=BaseSuccessResponse,
+    response_model=AddProjectMembersResponse,
 )
-def create_project_members(
+async def create_project_members(
     _: AuthMiddleWare, project_id: str, body: CreateProjectMembers, response: Response
-) -> BaseSuccessResponse:
+) -> dict:
     is_valid_uuid(project_id)
-    return add_project_members(project_id, body, response)
+    return await add_project_members(project_id, body, response)
 
 
 @router.get(
@@ -70,27 +79,96 @@ def create_project_members(
     description="Fetch all Projects API",
     response_model=GetAllProjectsResponse,
 )
-def get_all_projects(
+async def get_all_projects(
     user: AuthMiddleWare,
     response: Response,
-    page: int = 1,
-    page_size: int = 10,
-) -> GetAllProjectsResponse:
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> ValidatedJSONResponse:
     """
-    Endpoint for create new project.
+    Endpoint for fetching the user's projects with pagination.
 
     Parameters:
-    - body (): New project details.
+    - user (AuthMiddleWare): The authenticated user.
     - response (Response): FastAPI Response object.
+    - page (int): Page number (default: 1), ignored when a cursor is given.
+    - page_size (int): Number of items per page (default: 10, at most MAX_PAGE_SIZE).
+    - cursor (Optional[str]): The next_cursor of the previous page.
 
     Returns:
-    ProjectResponse: The project response.
+    ValidatedJSONResponse: The projects and the next page cursor as
+    GetAllProjectsResponse, validated and encoded in a single pass.
 
     Raises:
     - SQLAlchemyError: If there is an error in the database operation.
-    - Exception: For unexpected errors during create new project.
     """
-    return get_all_projects_with_pagination(response, user, page, page_size)
+    return ValidatedJSONResponse(
+        GetAllProjectsAdapter,
+        await get_all_projects_with_pagination(response, user, page, page_size, cursor),
+    )
+
+
+@router.get(
+    API_ENDPOINTS["PROJECTS"]["MEMBER_OF"],
+    description="Fetch Projects the User is a Member of API",
+    response_model=GetMemberOfProjectsResponse,
+)
+async def get_member_of_projects(
+    user: AuthMiddleWare,
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> ValidatedJSONResponse:
+    """
+    Endpoint for fetching the projects whose members include the user's email.
+
+    Parameters:
+    - user (AuthMiddleWare): The authenticated user.
+    - response (Response): FastAPI Response object.
+    - page (int): Page number (default: 1), ignored when a cursor is given.
+    - page_size (int): Number of items per page (default: 10, at most MAX_PAGE_SIZE).
+    - cursor (Optional[str]): The next_cursor of the previous page.
+
+    Returns:
+    ValidatedJSONResponse: The projects and the next page cursor as
+    GetMemberOfProjectsResponse, validated and encoded in a single pass.
+
+    Raises:
+    - SQLAlchemyError: If there is an error in the database operation.
+    """
+    return ValidatedJSONResponse(
+        GetMemberOfProjectsAdapter,
+        await get_member_of_projects_with_pagination(
+            response, user, page, page_size, cursor
+        ),
+    )
+
+
+@router.get(
+    API_ENDPOINTS["PROJECTS"]["EXPORT"],
+    description="Export all Projects as NDJSON or CSV",
+    response_class=StreamingResponse,
+)
+async def export_all_projects(
+    user: AuthMiddleWare,
+    export_format: Annotated[ExportFormatEnum, Query(alias="format")] = (
+        ExportFormatEnum.NDJSON
+    ),
+) -> StreamingResponse:
+    """
+    Endpoint for downloading every project of the user in a single streamed response.
+
+    Parameters:
+    - user (AuthMiddleWare): The authenticated user.
+    - export_format (ExportFormatEnum): "ndjson" (default) or "csv".
+
+    Returns:
+    StreamingResponse: The projects with members and documents, streamed as they
+    are read.
+    """
+    return export_projects(user, export_format)
 
 
 @router.get(
@@ -98,13 +176,13 @@ def get_all_projects(
     description="Fetch Project Members By Project ID API",
     # response_model=GetAllProjectsResponse,
 )
-def fetch_project_members(
+async def fetch_project_members(
     project_id: str,
     user: AuthMiddleWare,
     response: Response,
 ):
     is_valid_uuid(project_id)
-    return fetch_project_member_by_project_id(
+    return await fetch_project_member_by_project_id(
         project_id,
         user,
         response,
@@ -115,7 +193,7 @@ def fetch_project_members(
     API_ENDPOINTS["PROJECTS"]["DOCUMENTS"],
     description="Add Project Documents in Project API",
 )
-def create_project_documents(
+async def create_project_documents(
     __: AuthMiddleWare,
     project_id: str,
     files: Annotated[
@@ -123,4 +201,4 @@ def create_project_documents(
     ],
 ):
     is_valid_uuid(project_id)
-    return create_project_documents_by_project_id(project_id, files)
+    return await create_project_documents_by_project_id(project_id, files)
@@ -1,41 +1,64 @@
-from typing import Annotated
-
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile
+from typing import Annotated, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 
-from src.middlewares.authentication_middleware import verify_auth_token
+from src.middlewares.authentication_middleware import (
+    verify_admin_role,
+    verify_auth_token,
+)
 from src.middlewares.validate_file_middleware import validate_file
 from src.services.user_service import (
     authenticate_user,
+    bulk_register_users,
     create_account,
+    export_users,
     get_all_users_with_pagination,
     get_user_info_by_id,
+    parse_bulk_records,
     update_user_with_image,
 )
-from src.utils.constants import API_ENDPOINTS
+from src.utils.constants import API_ENDPOINTS, MAX_PAGE_SIZE
 from src.utils.index import is_valid_uuid
+from src.utils.json_response import ValidatedJSONResponse, response_adapter
 from src.schemas.users_schema import (
+    BulkRegisterResponse,
     GetAllUsers,
     LoginResponse,
     LoginUser,
     RegisterUser,
+    StoredUsersPage,
     UserRoleEnum,
     UserInfoExtended,
     WhoAMIResponse,
 )
-from src.schemas.index import BaseSuccessResponse
+from src.schemas.index import BaseSuccessResponse, ExportFormatEnum
 
 router = APIRouter(tags=["Users"])
 
 AuthMiddleWare = Annotated[str, Depends(verify_auth_token)]
+AdminMiddleWare = Annotated[dict, Depends(verify_admin_role)]
 ValidateFileMiddleWare = Annotated[File, Depends(validate_file)]
 
+GetAllUsersAdapter = response_adapter(StoredUsersPage)
+
 
 @router.post(
     API_ENDPOINTS["USERS"]["REGISTER"],
     description="Register Account API",
     response_model=BaseSuccessResponse,
 )
-def register_user(body: RegisterUser, response: Response) -> BaseSuccessResponse:
+async def register_user(body: RegisterUser, response: Response) -> dict:
     """
     Endpoint for registering a new user.
 
@@ -49,7 +72,36 @@ def register_user(body: RegisterUser, response: Response) -> BaseSuccessResponse
     Raises:
     - DatabaseException: If there is an error in the database operation.
     """
-    return create_account(body, response)
+    return await create_account(body, response)
+
+
+@router.post(
+    API_ENDPOINTS["USERS"]["BULK_REGISTER"],
+    description="Register Accounts in Bulk from a JSON Array or CSV",
+    response_model=BulkRegisterResponse,
+)
+async def bulk_register(_: AdminMiddleWare, request: Request) -> dict:
+    """
+    Endpoint for registering many users at once.
+
+    The body is a JSON array of RegisterUser records, or a CSV with the same
+    columns when the Content-Type is text/csv.
+
+    Parameters:
+    - _: CommonsDep: Dependency for verifying admin access.
+    - request (Request): FastAPI Request object.
+
+    Returns:
+    BulkRegisterResponse: Counts per outcome and the result of every record.
+
+    Raises:
+    - HTTPException: If the body cannot be parsed or has too many records.
+    - DatabaseException: If there is an error in the database operation.
+    """
+    records = parse_bulk_records(
+        await request.body(), request.headers.get("content-type")
+    )
+    return await bulk_register_users(records)
 
 
 @router.post(
@@ -57,7 +109,7 @@ def register_user(body: RegisterUser, response: Response) -> BaseSuccessResponse
     description="Login User API",
     response_model=LoginResponse,
 )
-def login_user(body: LoginUser, response: Response) -> LoginResponse:
+async def login_user(body: LoginUser, response: Response) -> LoginResponse:
     """
     Endpoint for user authentication.
 
@@ -72,7 +124,7 @@ def login_user(body: LoginUser, response: Response) -> LoginResponse:
     - SQLAlchemyError: If there is an error in the database operation.
     - Exception: For unexpected errors during user authentication.
     """
-    return authenticate_user(body, response)
+    return await authenticate_user(body, response)
 
 
 @router.get(
@@ -80,7 +132,7 @@ def login_user(body: LoginUser, response: Response) -> LoginResponse:
     description="Fetch Who Am I information",
     response_model=WhoAMIResponse,
 )
-def who_am_i(userInfo: AuthMiddleWare) -> WhoAMIResponse:
+async def who_am_i(userInfo: AuthMiddleWare) -> WhoAMIResponse:
     """
     Endpoint for fetching user information.
 
@@ -99,14 +151,36 @@ def who_am_i(userInfo: AuthMiddleWare) -> WhoAMIResponse:
         return error.detail
 
 
+@router.get(
+    API_ENDPOINTS["USERS"]["EXPORT"],
+    description="Export All Users as NDJSON or CSV",
+    response_class=StreamingResponse,
+)
+async def export_all_users(
+    _: AuthMiddleWare,
+    export_format: Annotated[ExportFormatEnum, Query(alias="format")] = (
+        ExportFormatEnum.NDJSON
+    ),
+) -> StreamingResponse:
+    """
+    Endpoint for downloading every user in a single streamed response.
+
+    Parameters:
+    - _: CommonsDep: Dependency for verifying authentication.
+    - export_format (ExportFormatEnum): "ndjson" (default) or "csv".
+
+    Returns:
+    StreamingResponse: The users, streamed as they are read.
+    """
+    return export_users(export_format)
+
+
 @router.get(
     API_ENDPOINTS["USERS"]["USER_BY_ID"],
     description="Fetch User Info By ID",
     response_model=WhoAMIResponse,
 )
-def get_user_by_id(
-    user_id: str, _: AuthMiddleWare, response: Response
-) -> WhoAMIResponse:
+async def get_user_by_id(user_id: str, _: AuthMiddleWare, response: Response) -> dict:
     """
     Endpoint for fetching user information by ID.
 
@@ -121,7 +195,7 @@ def get_user_by_id(
     Raises:
     - SQLAlchemyError: If there is an error in the database operation.
     """
-    return get_user_info_by_id(user_id, response)
+    return await get_user_info_by_id(user_id, response)
 
 
 @router.get(
@@ -129,29 +203,35 @@ def get_user_by_id(
     description="Fetch All Users",
     response_model=GetAllUsers,
 )
-def get_all_users(
+async def get_all_users(
     _: AuthMiddleWare,
     response: Response,
-    page: int = 1,
-    page_size: int = 10,
-) -> GetAllUsers:
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> ValidatedJSONResponse:
     """
     Endpoint for fetching all users with pagination.
 
     Parameters:
     - _: CommonsDep: Dependency for verifying authentication.
     - response (Response): FastAPI Response object.
-    - page (int): Page number (default: 1).
-    - page_size (int): Number of items per page (default: 10).
+    - page (int): Page number (default: 1), ignored when a cursor is given.
+    - page_size (int): Number of items per page (default: 10, at most MAX_PAGE_SIZE).
+    - cursor (Optional[str]): The next_cursor of the previous page.
 
     Returns:
-    GetAllUsers: Response containing the list of users.
+    ValidatedJSONResponse: The users as GetAllUsers, validated and encoded
+    in a single pass.
 
     Raises:
     - NoResultFound: If no users are found.
     - SQLAlchemyError: If there is an error in the database operation.
     """
-    return get_all_users_with_pagination(response, page, page_size)
+    return ValidatedJSONResponse(
+        GetAllUsersAdapter,
+        await get_all_users_with_pagination(response, page, page_size, cursor),
+    )
 
 
 @router.put(
@@ -198,7 +278,6 @@ async def update_user(
     SQLAlchemyError: If there is an error in the database operation.
     """
     is_valid_uuid(user_id)
-    profile_picture_path = f"/uploads/{file.filename}" if file else None
 
     payload: UserInfoExtended = {
         "id": user_id,
@@ -209,6 +288,5 @@ async def update_user(
         "role": role,
         "is_verified": is_verified,
         "is_deleted": is_deleted,
-        "profile_picture": profile_picture_path,
     }
-    return update_user_with_image(response, payload, file)
+    return await update_user_with_image(response, payload, file)
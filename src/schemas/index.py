@@ -1,4 +1,5 @@
 
+from enum import Enum as PythonEnum
 from typing import Optional
 
 from pydantic import BaseModel
@@ -15,4 +16,17 @@ class BaseSuccessResponse(BaseModel):
 
     message: str
     success: bool
-    id: Optional[str]
\ No newline at end of file
+    id: Optional[str]
+
+
+class ExportFormatEnum(str, PythonEnum):
+    """
+    Enumeration for export formats.
+
+    Possible values:
+    - NDJSON: One JSON object per line
+    - CSV: Comma separated values with a header row
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
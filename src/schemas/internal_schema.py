@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfilerSettings(BaseModel):
+    """
+    Model for changing the request profiler at runtime.
+
+    Attributes:
+    - sample_rate (Optional[float]): Fraction of requests to profile, 0 stops it.
+    - mode (Optional[str]): "sample" for collapsed stacks, "cprofile" for pstats.
+    """
+
+    sample_rate: Optional[float] = Field(default=None, ge=0, le=1)
+    mode: Optional[str] = Field(default=None, pattern="^(sample|cprofile)$")
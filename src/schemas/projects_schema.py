@@ -4,6 +4,8 @@ from typing import List, Optional
 
 from pydantic import UUID4, BaseModel
 
+from src.schemas.index import BaseSuccessResponse
+
 
 class ProjectStatusEnum(str, PythonEnum):
     """
@@ -35,6 +37,19 @@ class CreateProjectMembers(BaseModel):
     email_ids: List[str]
 
 
+class AddProjectMembersResponse(BaseSuccessResponse):
+    """
+    Model for the response after adding project members.
+
+    Attributes:
+    - added (int): Number of emails that became members.
+    - skipped (int): Number of emails that were already members.
+    """
+
+    added: int = 0
+    skipped: int = 0
+
+
 class ProjectInfoExtended(BaseModel):
     id: UUID4
     name: str
@@ -47,13 +62,39 @@ class ProjectInfoExtended(BaseModel):
     created_at: datetime
     updated_at: datetime
     project_owner_id: UUID4
-    project_members_id: UUID4
-    project_members_email_ids: List[str]
+    project_members_id: Optional[UUID4] = None
+    project_members_email_ids: List[str] = []
     owner_first_name: str
-    owner_last_name: str
-    documents_path: list[str]
+    owner_last_name: Optional[str] = None
+    documents_path: List[str] = []
+    # Download names of the documents, in the order of documents_path
+    documents_name: List[Optional[str]] = []
 
 
 class GetAllProjectsResponse(BaseModel):
     success: bool
     data: List[ProjectInfoExtended]
+    next_cursor: Optional[str] = None
+
+
+class MemberOfProjectInfo(BaseModel):
+    id: UUID4
+    name: str
+    description: str
+    city: str
+    country: str
+    start_date: datetime
+    end_date: datetime
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    project_owner_id: UUID4
+    owner_first_name: str
+    owner_last_name: Optional[str] = None
+    member_since: datetime
+
+
+class GetMemberOfProjectsResponse(BaseModel):
+    success: bool
+    data: List[MemberOfProjectInfo]
+    next_cursor: Optional[str] = None
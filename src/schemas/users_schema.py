@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum as PythonEnum
 from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import UUID4, BaseModel, EmailStr
 
 
 class UserRoleEnum(str, PythonEnum):
@@ -41,6 +41,46 @@ class RegisterUser(BaseModel):
     role: Optional[UserRoleEnum] = UserRoleEnum.USER
 
 
+class BulkRegisterResult(BaseModel):
+    """
+    Model for the outcome of one record of a bulk registration.
+
+    Attributes:
+    - index (int): Position of the record in the request.
+    - username (Optional[str]): Lowercased username, if the record had one.
+    - email (Optional[str]): Lowercased email, if the record had one.
+    - status (str): "created", "duplicate" or "invalid".
+    - id (Optional[str]): ID of the created user.
+    - message (str): Details of the outcome.
+    """
+
+    index: int
+    username: Optional[str] = None
+    email: Optional[str] = None
+    status: str
+    id: Optional[str] = None
+    message: str
+
+
+class BulkRegisterResponse(BaseModel):
+    """
+    Model for the response of a bulk registration.
+
+    Attributes:
+    - success (bool): Indicates the success of the operation.
+    - created (int): Number of users created.
+    - duplicates (int): Number of records whose username or email was taken.
+    - invalid (int): Number of records that failed validation.
+    - results (List[BulkRegisterResult]): Outcome of every record, in order.
+    """
+
+    success: bool
+    created: int
+    duplicates: int
+    invalid: int
+    results: List[BulkRegisterResult]
+
+
 class LoginUser(BaseModel):
     """
     Model for user login data.
@@ -140,7 +180,59 @@ class GetAllUsers(BaseModel):
     Attributes:
     - success (bool): Indicates whether the query was successful.
     - data (List[UserInfoExtended]): List of extended user information.
+    - next_cursor (Optional[str]): Cursor of the next page, None on the last page.
     """
 
     success: bool
     data: List[UserInfoExtended]
+    next_cursor: Optional[str] = None
+
+
+class StoredUserInfoExtended(BaseModel):
+    """
+    Model for extended user information read back from the database.
+
+    Emails were validated when the user registered, so they are not
+    validated again, and the UUID primary key is converted to a string by
+    the serializer; the JSON output is the same as UserInfoExtended.
+
+    Attributes:
+    - id (UUID4): User ID.
+    - first_name (str): First name of the user.
+    - last_name (str): Last name of the user.
+    - username (str): Username of the user.
+    - email (str): Email address of the user.
+    - role (str): User role.
+    - is_verified (bool): Indicates whether the user is verified.
+    - is_deleted (bool): Indicates whether the user is deleted.
+    - created_at (datetime): Timestamp of user creation.
+    - updated_at (datetime): Timestamp of last user update.
+    """
+
+    id: UUID4
+    first_name: str
+    last_name: Optional[str] = None
+    username: str
+    email: str
+    role: UserRoleEnum
+    profile_picture_path: Optional[str] = None
+    is_verified: bool
+    is_deleted: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class StoredUsersPage(BaseModel):
+    """
+    Model for a page of users built from database rows, used to encode the
+    users list in the GetAllUsers format.
+
+    Attributes:
+    - success (bool): Indicates whether the query was successful.
+    - data (List[StoredUserInfoExtended]): List of extended user information.
+    - next_cursor (Optional[str]): Cursor of the next page, None on the last page.
+    """
+
+    success: bool
+    data: List[StoredUserInfoExtended]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,64 @@
+"""
+Register users in bulk from a JSON array or CSV file.
+
+Usage:
+    python -m src.scripts.bulk_register users.csv [--report report.json]
+
+Rows are validated, de-duplicated against each other and the users table,
+hashed in parallel and inserted in chunks, exactly like
+POST /users/bulk-register. The summary is printed, and the per-row report is
+written to --report when given. Exits with status 1 if any row was not created.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from src.config.database.db_connection import dispose_database
+# Every mapped model must be registered before the first ORM query
+from src.models.project_documents_model import ProjectDocumentsModel  # noqa: F401
+from src.models.project_membership_model import ProjectMembershipModel  # noqa: F401
+from src.models.project_model import ProjectModel  # noqa: F401
+from src.services.user_service import bulk_register_users, parse_bulk_records
+from src.utils.constants import BULK_CREATED
+from src.utils.password_hasher import password_hasher
+
+
+async def run(path: str) -> dict:
+    with open(path, "rb") as file:
+        content = file.read()
+    content_type = "text/csv" if path.lower().endswith(".csv") else "application/json"
+    try:
+        return await bulk_register_users(parse_bulk_records(content, content_type))
+    finally:
+        await dispose_database()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("path", help="JSON array or .csv file of users")
+    parser.add_argument("--report", help="Write the per-row results to this file")
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(run(args.path))
+    finally:
+        password_hasher.shutdown()
+
+    print(
+        f"created={report['created']} duplicates={report['duplicates']} "
+        f"invalid={report['invalid']}"
+    )
+    if args.report:
+        with open(args.report, "w") as file:
+            json.dump(report["results"], file, indent=2)
+    else:
+        for result in report["results"]:
+            if result["status"] != BULK_CREATED:
+                print(f"row {result['index']}: {result['status']}: {result['message']}")
+    sys.exit(0 if report["created"] == len(report["results"]) else 1)
+
+
+if __name__ == "__main__":
+    main()
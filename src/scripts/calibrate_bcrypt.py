@@ -0,0 +1,74 @@
+"""
+Calibrate the bcrypt work factor for this machine.
+
+Usage:
+    python -m src.scripts.calibrate_bcrypt --target-ms 250 [--write]
+
+Prints the work factor whose hash time is closest to the target, never below
+MIN_BCRYPT_ROUNDS. With --write, the value is stored as BCRYPT_ROUNDS in the
+environment file, and weaker existing hashes are upgraded transparently the
+next time their users log in. Run it once per deployment, on an idle host
+like the ones serving it, so every worker uses the same work factor.
+"""
+
+import argparse
+import os
+
+from src.utils.index import calibrate_bcrypt_rounds
+
+DEFAULT_ENV_FILE = "src/config/env-files/.env.local"
+
+
+def write_env_value(env_file: str, name: str, value: str) -> None:
+    """
+    Set a variable in an environment file, replacing any existing value.
+
+    Parameters:
+    - env_file (str): Path of the environment file.
+    - name (str): The name of the environment variable.
+    - value (str): The value to store.
+    """
+    lines = []
+    if os.path.exists(env_file):
+        with open(env_file) as file:
+            lines = [
+                line
+                for line in file.read().splitlines()
+                if not line.startswith(f"{name}=")
+            ]
+    lines.append(f"{name}={value}")
+
+    with open(env_file, "w") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250,
+        help="Target latency of a single hash in milliseconds (default: 250)",
+    )
+    parser.add_argument(
+        "--write",
+        action="store_true",
+        help="Store the result as BCRYPT_ROUNDS in the environment file",
+    )
+    parser.add_argument(
+        "--env-file",
+        default=DEFAULT_ENV_FILE,
+        help=f"Environment file to update (default: {DEFAULT_ENV_FILE})",
+    )
+    args = parser.parse_args()
+
+    rounds = calibrate_bcrypt_rounds(args.target_ms)
+    print(f"BCRYPT_ROUNDS={rounds}")
+
+    if args.write:
+        write_env_value(args.env_file, "BCRYPT_ROUNDS", str(rounds))
+        print(f"Saved to {args.env_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Check that every endpoint stays within its query budget.
+
+Usage:
+    python -m src.scripts.check_query_counts
+
+Starts the application in-process, registers a throwaway user and walks
+through the user and project endpoints, counting the SQL statements each
+request executes with assert_max_queries. Prints the count of every
+endpoint and exits with status 1 if any exceeds its budget in
+QUERY_BUDGETS, so it can run in CI next to check_query_plans. The throwaway
+user and project are left in the database.
+"""
+
+import sys
+import uuid
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.config.database.query_stats import assert_max_queries
+from src.utils.constants import API_ENDPOINTS
+
+USERS = API_ENDPOINTS["USERS"]
+PROJECTS = API_ENDPOINTS["PROJECTS"]
+
+# Maximum statements per request. The auth lookup is included where a
+# request is the first one made with its token.
+QUERY_BUDGETS: Dict[str, int] = {
+    "register": 2,
+    "login": 1,
+    "whoami (first request with the token)": 1,
+    "whoami (cached principal)": 0,
+    "get user by id": 1,
+    "list users": 1,
+    "create project": 1,
+    "add members": 1,
+    "list projects": 1,
+    "fetch members": 1,
+    # One lookup of the project, then one insert of every file
+    "upload 3 documents": 2,
+}
+
+
+def run_checks(client: TestClient) -> List[Tuple[str, int, int]]:
+    """
+    Call every endpoint once and count its queries.
+
+    Returns:
+    List[Tuple[str, int, int]]: (endpoint, queries, budget) per endpoint.
+    """
+    suffix = uuid.uuid4().hex[:12]
+    username = f"query_check_{suffix}"
+    state: Dict[str, str] = {}
+
+    def register() -> httpx.Response:
+        response = client.post(
+            USERS["BASE_URL"] + USERS["REGISTER"],
+            json={
+                "firstName": "Query",
+                "lastName": "Check",
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": "password",
+            },
+        )
+        state["user_id"] = response.json()["id"]
+        return response
+
+    def login() -> httpx.Response:
+        response = client.post(
+            USERS["BASE_URL"] + USERS["LOGIN"],
+            json={"identifier": username, "password": "password"},
+        )
+        client.cookies.set("token", response.json()["token"])
+        return response
+
+    def create_project() -> httpx.Response:
+        response = client.post(
+            PROJECTS["BASE_URL"] + PROJECTS["DETAILS"],
+            json={
+                "name": "Query check",
+                "description": "check_query_counts",
+                "city": "City",
+                "country": "Country",
+                "start_date": "2024-01-01T00:00:00Z",
+                "end_date": "2024-02-01T00:00:00Z",
+            },
+        )
+        state["project_id"] = response.json()["id"]
+        return response
+
+    def members_url() -> str:
+        return PROJECTS["BASE_URL"] + PROJECTS["MEMBERS"].format(
+            project_id=state["project_id"]
+        )
+
+    requests: List[Tuple[str, Callable]] = [
+        ("register", register),
+        ("login", login),
+        (
+            "whoami (first request with the token)",
+            lambda: client.get(USERS["BASE_URL"] + USERS["WHO_AM_I"]),
+        ),
+        (
+            "whoami (cached principal)",
+            lambda: client.get(USERS["BASE_URL"] + USERS["WHO_AM_I"]),
+        ),
+        (
+            "get user by id",
+            lambda: client.get(
+                USERS["BASE_URL"] + USERS["USER_BY_ID"].format(user_id=state["user_id"])
+            ),
+        ),
+        (
+            "list users",
+            lambda: client.get(
+                USERS["BASE_URL"] + USERS["GET_ALL_USERS"], params={"page_size": 5}
+            ),
+        ),
+        ("create project", create_project),
+        (
+            "add members",
+            lambda: client.post(
+                members_url(),
+                json={
+                    "email_ids": [f"member{n}_{suffix}@example.com" for n in range(5)]
+                },
+            ),
+        ),
+        (
+            "list projects",
+            lambda: client.get(
+                PROJECTS["BASE_URL"] + PROJECTS["GET_ALL_PROJECTS"],
+                params={"page_size": 5},
+            ),
+        ),
+        ("fetch members", lambda: client.get(members_url())),
+        (
+            "upload 3 documents",
+            lambda: client.post(
+                PROJECTS["BASE_URL"]
+                + PROJECTS["DOCUMENTS"].format(project_id=state["project_id"]),
+                files=[
+                    ("files", (f"check-{n}.txt", b"query check", "text/plain"))
+                    for n in range(3)
+                ],
+            ),
+        ),
+    ]
+
+    results = []
+    for name, request in requests:
+        budget = QUERY_BUDGETS[name]
+        try:
+            with assert_max_queries(budget) as stats:
+                response = request()
+        except AssertionError as error:
+            print(error)
+        response.raise_for_status()
+        results.append((name, stats.count, budget))
+    return results
+
+
+def main() -> None:
+    from main import app
+
+    with TestClient(app, base_url="https://testserver") as client:
+        results = run_checks(client)
+
+    failed = False
+    for name, count, budget in results:
+        verdict = "ok" if count <= budget else "OVER BUDGET"
+        failed = failed or count > budget
+        print(f"{name:<40} {count:>3} / {budget:<3} {verdict}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
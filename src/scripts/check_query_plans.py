@@ -0,0 +1,208 @@
+"""
+Check that paginated queries are served by their indexes.
+
+Usage:
+    python -m src.scripts.check_query_plans [--owners 10] [--projects 500]
+        [--members 20]
+
+Seeds synthetic users, projects and memberships inside a transaction, runs
+ANALYZE, and EXPLAINs each listing query on its first and a cursor page.
+Prints the plan of any query that does not use its expected index and exits
+with status 1, so it can run in CI next to the migrations. Everything is
+rolled back afterwards.
+"""
+
+import argparse
+import json
+import sys
+import uuid
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import Connection, Select, text
+
+from src.config.database.db_connection import get_engine
+from src.services.project_service import (
+    build_member_of_query,
+    build_projects_page_query,
+)
+from src.services.user_service import build_users_page_query
+from src.utils.pagination import encode_cursor
+
+PROBE_EMAIL = "plan-check@example.com"
+
+
+def seed(conn: Connection, owners: int, projects: int, members: int) -> str:
+    """
+    Insert the synthetic data set.
+
+    Returns:
+    str: ID of the first owner.
+    """
+    suffix = uuid.uuid4().hex[:12]
+    owner_ids = (
+        conn.execute(
+            text(
+                """
+            INSERT INTO users (first_name, last_name, username, email, password)
+            SELECT 'Plan', 'Owner', 'plan_' || :suffix || '_' || n,
+                   'plan_' || :suffix || '_' || n || '@example.com', 'x'
+            FROM generate_series(1, :owners) AS n
+            RETURNING id
+            """
+            ),
+            {"suffix": suffix, "owners": owners},
+        )
+        .scalars()
+        .all()
+    )
+    conn.execute(
+        text(
+            """
+            INSERT INTO projects (name, description, city, country, start_date,
+                                  end_date, status, project_owner_id, created_at)
+            SELECT 'Project ' || n, 'Plan check', 'City', 'Country', now(), now(),
+                   'OPEN', owner_id, now() - n * interval '1 second'
+            FROM unnest(CAST(:owner_ids AS uuid[])) AS owner_id,
+                 generate_series(1, :projects) AS n
+            """
+        ),
+        {"owner_ids": [str(owner_id) for owner_id in owner_ids], "projects": projects},
+    )
+    # Every project gets `members` distinct emails; the probe email is a
+    # member of one project in fifty
+    conn.execute(
+        text(
+            """
+            INSERT INTO project_memberships (project_id, email, created_at)
+            SELECT projects.id,
+                   CASE WHEN n = 1 AND abs(hashtext(projects.id::text)) % 50 = 0
+                        THEN :probe
+                        ELSE 'member' || n || '_' || projects.id || '@example.com'
+                   END,
+                   projects.created_at
+            FROM projects, generate_series(1, :members) AS n
+            WHERE projects.project_owner_id = ANY(CAST(:owner_ids AS uuid[]))
+            """
+        ),
+        {
+            "probe": PROBE_EMAIL,
+            "members": members,
+            "owner_ids": [str(owner_id) for owner_id in owner_ids],
+        },
+    )
+    conn.exec_driver_sql("ANALYZE users, projects, project_memberships")
+    return str(owner_ids[0])
+
+
+def explain(conn: Connection, query: Select) -> dict:
+    """
+    Return the JSON plan of a query.
+    """
+    compiled = query.compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    sql = str(compiled).replace("%", "%%")
+    return conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar_one()[0]
+
+
+def index_names(plan: dict) -> Iterator[str]:
+    """
+    Yield every index name used anywhere in a plan.
+    """
+    node = plan.get("Plan", plan)
+    if "Index Name" in node:
+        yield node["Index Name"]
+    for child in node.get("Plans", []):
+        yield from index_names(child)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--owners", type=int, default=10)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--members", type=int, default=20)
+    args = parser.parse_args()
+
+    failures = 0
+    with get_engine().connect() as conn:
+        transaction = conn.begin()
+        try:
+            owner_id = seed(conn, args.owners, args.projects, args.members)
+            cursor = encode_cursor(
+                *conn.execute(
+                    text(
+                        "SELECT created_at, id FROM projects "
+                        "WHERE project_owner_id = :owner_id "
+                        "ORDER BY created_at DESC, id DESC OFFSET 100 LIMIT 1"
+                    ),
+                    {"owner_id": owner_id},
+                ).one()
+            )
+            member_cursor = encode_cursor(
+                *conn.execute(
+                    text(
+                        "SELECT created_at, id FROM project_memberships "
+                        "WHERE email = :email ORDER BY created_at DESC, id DESC "
+                        "OFFSET 10 LIMIT 1"
+                    ),
+                    {"email": PROBE_EMAIL},
+                ).one()
+            )
+
+            user_cursor = encode_cursor(
+                *conn.execute(
+                    text(
+                        "SELECT created_at, id FROM users WHERE is_deleted IS false "
+                        "ORDER BY created_at DESC, id DESC OFFSET 5 LIMIT 1"
+                    )
+                ).one()
+            )
+
+            checks: List[Tuple[str, Select, str]] = [
+                (
+                    "users listing, first page",
+                    build_users_page_query(1, 10),
+                    "users_created_at_id_index",
+                ),
+                (
+                    "users listing, cursor page",
+                    build_users_page_query(1, 10, user_cursor),
+                    "users_created_at_id_index",
+                ),
+                (
+                    "projects listing, first page",
+                    build_projects_page_query(owner_id, 1, 10),
+                    "projects_owner_created_at_id_index",
+                ),
+                (
+                    "projects listing, cursor page",
+                    build_projects_page_query(owner_id, 1, 10, cursor),
+                    "projects_owner_created_at_id_index",
+                ),
+                (
+                    "member-of, first page",
+                    build_member_of_query(PROBE_EMAIL, 1, 10),
+                    "project_memberships_email_index",
+                ),
+                (
+                    "member-of, cursor page",
+                    build_member_of_query(PROBE_EMAIL, 1, 10, member_cursor),
+                    "project_memberships_email_index",
+                ),
+            ]
+            for name, query, expected_index in checks:
+                plan = explain(conn, query)
+                if expected_index in set(index_names(plan)):
+                    print(f"ok    {name}: {expected_index}")
+                else:
+                    failures += 1
+                    print(f"FAIL  {name}: {expected_index} not used")
+                    print(json.dumps(plan, indent=2))
+        finally:
+            transaction.rollback()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measure a cold start of the application and enforce a startup budget.
+
+Usage:
+    python -m src.scripts.check_startup_budget --budget 3 [--top 25]
+
+Imports the application with per-module import timing, runs its startup
+(including the database connection), sends one request and prints the
+startup report as JSON. Exits with status 1 when the time to the first
+request exceeds the budget, so it can gate a CI job. A budget is required,
+from --budget or STARTUP_BUDGET_SECONDS.
+"""
+
+import argparse
+import json
+import sys
+
+from src.utils.startup_profiler import STARTUP_BUDGET_SECONDS, startup_profiler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=STARTUP_BUDGET_SECONDS,
+        help="Time-to-first-request budget in seconds (default: "
+        "STARTUP_BUDGET_SECONDS)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=25,
+        help="Number of slowest imports to report (default: 25)",
+    )
+    args = parser.parse_args()
+    if args.budget <= 0:
+        parser.error("a positive --budget or STARTUP_BUDGET_SECONDS is required")
+
+    startup_profiler.budget_seconds = args.budget
+    startup_profiler.start(track_imports=True)
+
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    with TestClient(app) as client:
+        client.get("/")
+
+    print(json.dumps(startup_profiler.report(top=args.top), indent=2))
+    if startup_profiler.over_budget():
+        print(f"Startup budget of {args.budget}s exceeded", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Move project documents stored before content addressing into the
+content-addressed store, removing duplicate files.
+
+Usage:
+    python -m src.scripts.dedup_uploads [--dry-run] [--collect-garbage]
+        [--min-age 3600] [--report report.json]
+
+Run from the project root, like the application. Every document path still
+named {timestamp}_{filename} is hashed and moved to uploads/objects/ab/cd/
+<sha256>. Files with identical content end up as a single object, shared by
+all of their documents. Each file is hard-linked into the store (or copied
+when the store is on another file system). Its rows are then updated, and
+only after that is the old file removed, so documents never point to a
+missing file.
+
+Files in uploads/ that no document references, such as profile pictures,
+are reported but left alone. With --collect-garbage, objects no document
+references are deleted, e.g. ones left by a failed upload, as are stale
+temporary files. Both must be older than --min-age seconds, so uploads in
+progress are not touched.
+
+The report lists the number of files and bytes before and after, and the
+bytes reclaimed. With --dry-run nothing is changed and the report shows
+what would happen.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterator, Set, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Engine
+
+from src.config.database.db_connection import get_engine
+from src.models.project_documents_model import ProjectDocumentsModel
+from src.models.project_membership_model import ProjectMembershipModel  # noqa: F401
+from src.models.project_model import ProjectModel  # noqa: F401
+from src.models.user_model import UserModel  # noqa: F401
+from src.utils.constants import DOCUMENT_OBJECTS_FOLDER_PATH, UPLOADS_FOLDER_PATH
+from src.utils.uploads import (
+    TEMPORARY_UPLOAD_PREFIX,
+    UPLOAD_CHUNK_SIZE,
+    object_path,
+    remove_files,
+    store_by_content,
+)
+
+# Objects being collected are renamed with this prefix until they are deleted
+QUARANTINE_PREFIX = ".collecting-"
+
+
+def hash_file(path: str) -> Tuple[str, int]:
+    """
+    Return the hex SHA-256 and the size of a file, read in chunks.
+    """
+    digest = hashlib.sha256()
+    size_bytes = 0
+    with open(path, "rb") as file:
+        while chunk := file.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            size_bytes += len(chunk)
+    return digest.hexdigest(), size_bytes
+
+
+def link_into_store(path: str, content_hash: str) -> bool:
+    """
+    Make a legacy file available as the object of its content.
+
+    Returns:
+    bool: False if the object already existed.
+    """
+    target = object_path(content_hash)
+    if os.path.exists(target):
+        return False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(path, target)
+    except FileExistsError:
+        return False
+    except OSError:
+        # Another file system, or links are not supported
+        with open(path, "rb") as file:
+            return store_by_content(file).created
+    return True
+
+
+def legacy_files() -> Iterator[str]:
+    """
+    Yield the files of the uploads folder outside the store.
+    """
+    for entry in os.scandir(UPLOADS_FOLDER_PATH):
+        if entry.is_file() and not entry.name.startswith(TEMPORARY_UPLOAD_PREFIX):
+            yield f"{UPLOADS_FOLDER_PATH}/{entry.name}"
+
+
+def store_size() -> Tuple[int, int]:
+    """
+    Return the number of objects and their total size.
+    """
+    objects, size_bytes = 0, 0
+    for directory, _, names in os.walk(DOCUMENT_OBJECTS_FOLDER_PATH):
+        for name in names:
+            if not name.startswith((TEMPORARY_UPLOAD_PREFIX, QUARANTINE_PREFIX)):
+                objects += 1
+                size_bytes += os.path.getsize(os.path.join(directory, name))
+    return objects, size_bytes
+
+
+def migrate_documents(report: Dict[str, int], dry_run: bool) -> Set[str]:
+    """
+    Move every legacy document file into the store and repoint its rows.
+
+    Returns:
+    Set[str]: The legacy paths referenced by documents.
+    """
+    engine = get_engine()
+    with engine.connect() as conn:
+        legacy_paths = conn.execute(
+            select(ProjectDocumentsModel.document_path, func.count())
+            .where(ProjectDocumentsModel.content_hash.is_(None))
+            .group_by(ProjectDocumentsModel.document_path)
+        ).all()
+
+    # Hashes already stored, or stored earlier in this run
+    known_hashes: Set[str] = set()
+    for document_path, documents in legacy_paths:
+        if not os.path.isfile(document_path):
+            report["missing_files"] += 1
+            report["documents_with_missing_file"] += documents
+            continue
+
+        content_hash, size_bytes = hash_file(document_path)
+        report["legacy_files"] += 1
+        report["legacy_bytes"] += size_bytes
+        report["documents_migrated"] += documents
+
+        if dry_run:
+            created = content_hash not in known_hashes and not os.path.exists(
+                object_path(content_hash)
+            )
+            known_hashes.add(content_hash)
+        else:
+            created = link_into_store(document_path, content_hash)
+            with engine.begin() as conn:
+                conn.execute(
+                    update(ProjectDocumentsModel)
+                    .where(
+                        ProjectDocumentsModel.document_path == document_path,
+                        ProjectDocumentsModel.content_hash.is_(None),
+                    )
+                    .values(
+                        document_path=object_path(content_hash),
+                        content_hash=content_hash,
+                        size_bytes=size_bytes,
+                        file_name=os.path.basename(document_path).split("_", 1)[-1],
+                    )
+                )
+            remove_files([document_path])
+
+        if created:
+            report["objects_created"] += 1
+        else:
+            report["duplicate_files"] += 1
+            report["bytes_reclaimed"] += size_bytes
+
+    return {document_path for document_path, _ in legacy_paths}
+
+
+def collect_garbage(report: Dict[str, int], min_age: float, dry_run: bool) -> None:
+    """
+    Delete objects no document references and stale temporary files.
+
+    Uploads run while the store is collected: one can reuse an object this
+    function found unreferenced, refreshing its modification time before it
+    saves the document referencing it. So every candidate is first renamed
+    out of its object path, where uploads can no longer reuse it, and only
+    deleted if it is still old and unreferenced once it is out of reach;
+    otherwise it is moved back. Candidates left renamed by an interrupted
+    run are moved back first.
+    """
+    engine = get_engine()
+    with engine.connect() as conn:
+        referenced = set(
+            conn.scalars(
+                select(ProjectDocumentsModel.content_hash)
+                .where(ProjectDocumentsModel.content_hash.is_not(None))
+                .distinct()
+            )
+        )
+
+    cutoff = time.time() - min_age
+    for directory, _, names in os.walk(DOCUMENT_OBJECTS_FOLDER_PATH):
+        for name in names:
+            path = os.path.join(directory, name)
+            if name.startswith(QUARANTINE_PREFIX):
+                if not dry_run:
+                    original = name.removeprefix(QUARANTINE_PREFIX)
+                    _restore(path, os.path.join(directory, original))
+                continue
+            temporary = name.startswith(TEMPORARY_UPLOAD_PREFIX)
+            if name in referenced or not _older_than(path, cutoff):
+                continue
+            if not temporary and _is_referenced(engine, name):
+                continue
+            try:
+                size_bytes = os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+            if dry_run or temporary:
+                # Temporary files are never reused, so they need no quarantine
+                if not dry_run:
+                    remove_files([path])
+            elif not _collect_object(engine, path, name, min_age):
+                continue
+            if temporary:
+                report["temporary_files_removed"] += 1
+            else:
+                report["unreferenced_objects_removed"] += 1
+            report["bytes_reclaimed"] += size_bytes
+
+
+def _collect_object(
+    engine: Engine, path: str, content_hash: str, min_age: float
+) -> bool:
+    """
+    Delete an unreferenced object unless an upload reused it meanwhile.
+
+    Returns:
+    bool: True if the object was deleted, False if it was moved back.
+    """
+    quarantine_path = os.path.join(
+        os.path.dirname(path), QUARANTINE_PREFIX + content_hash
+    )
+    try:
+        os.rename(path, quarantine_path)
+    except FileNotFoundError:
+        return False
+    # An upload that reused the object refreshed its modification time before
+    # the rename, and one arriving after it stores a new copy instead
+    if _older_than(quarantine_path, time.time() - min_age) and not _is_referenced(
+        engine, content_hash
+    ):
+        remove_files([quarantine_path])
+        return True
+    _restore(quarantine_path, path)
+    return False
+
+
+def _restore(quarantine_path: str, path: str) -> None:
+    # An upload may have stored the same content again in the meantime
+    if os.path.exists(path):
+        remove_files([quarantine_path])
+    else:
+        os.replace(quarantine_path, path)
+
+
+def _older_than(path: str, cutoff: float) -> bool:
+    # Temporary files are renamed into place while the store is walked
+    try:
+        return os.path.getmtime(path) <= cutoff
+    except FileNotFoundError:
+        return False
+
+
+def _is_referenced(engine: Engine, content_hash: str) -> bool:
+    with engine.connect() as conn:
+        return (
+            conn.scalar(
+                select(ProjectDocumentsModel.id)
+                .where(ProjectDocumentsModel.content_hash == content_hash)
+                .limit(1)
+            )
+            is not None
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report without changing anything"
+    )
+    parser.add_argument(
+        "--collect-garbage",
+        action="store_true",
+        help="Also delete unreferenced objects and stale temporary files",
+    )
+    parser.add_argument(
+        "--min-age",
+        type=float,
+        default=3600,
+        help="Seconds before unreferenced files are collected (default: 3600)",
+    )
+    parser.add_argument("--report", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    report: Dict[str, int] = dict.fromkeys(
+        (
+            "legacy_files",
+            "legacy_bytes",
+            "documents_migrated",
+            "objects_created",
+            "duplicate_files",
+            "missing_files",
+            "documents_with_missing_file",
+            "unreferenced_legacy_files",
+            "unreferenced_objects_removed",
+            "temporary_files_removed",
+            "bytes_reclaimed",
+        ),
+        0,
+    )
+    report["store_objects_before"], report["store_bytes_before"] = store_size()
+
+    referenced_paths = migrate_documents(report, args.dry_run)
+    report["unreferenced_legacy_files"] = sum(
+        1 for path in legacy_files() if path not in referenced_paths
+    )
+    if args.collect_garbage:
+        collect_garbage(report, args.min_age, args.dry_run)
+
+    report["store_objects_after"], report["store_bytes_after"] = store_size()
+    report["dry_run"] = args.dry_run
+
+    for key, value in report.items():
+        print(f"{key:<30} {value}")
+    if args.report:
+        with open(args.report, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
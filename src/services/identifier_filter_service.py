@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Connection, Executable, Row, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.config.database.db_connection import run_in_transaction, stream_in_batches
+from src.models.user_model import UserModel
+from src.utils.bloom_filter import BloomFilter
+from src.utils.index import get_env_variable
+
+logger = logging.getLogger(__name__)
+
+IDENTIFIER_FILTER_ENABLED = (
+    get_env_variable("IDENTIFIER_FILTER_ENABLED", "true").lower() == "true"
+)
+IDENTIFIER_FILTER_CAPACITY = int(
+    get_env_variable("IDENTIFIER_FILTER_CAPACITY", "1000000")
+)
+IDENTIFIER_FILTER_ERROR_RATE = float(
+    get_env_variable("IDENTIFIER_FILTER_ERROR_RATE", "0.001")
+)
+# How often users changed by other workers are folded in, and how often the
+# whole filter is rebuilt from scratch
+IDENTIFIER_FILTER_SYNC_SECONDS = float(
+    get_env_variable("IDENTIFIER_FILTER_SYNC_SECONDS", "5")
+)
+IDENTIFIER_FILTER_REBUILD_SECONDS = float(
+    get_env_variable("IDENTIFIER_FILTER_REBUILD_SECONDS", "3600")
+)
+# Incremental syncs look back this far to catch transactions that committed late
+SYNC_OVERLAP = timedelta(seconds=60)
+SCAN_BATCH_SIZE = 10000
+
+
+class IdentifierFilter:
+    """
+    Bloom filter of every registered lowercase username and email.
+
+    Until the first build finishes, every identifier is reported as possibly
+    registered, so callers always fall back to the database. Queries run on
+    the configured engine, like the services' queries.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initializes an empty, not yet built filter.
+
+        Parameters:
+        - capacity (int): Minimum number of identifiers the filter is sized for.
+        - error_rate (float): Target false positive rate.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom: Optional[BloomFilter] = None
+        self._synced_at: Optional[datetime] = None
+        # Monotonic time the last build or sync started, to coalesce syncs
+        self._sync_started_at: Optional[float] = None
+        self._sync_lock = asyncio.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._bloom is not None
+
+    def might_exist(self, identifier: str) -> bool:
+        """
+        Check whether an identifier may belong to a registered user.
+
+        Parameters:
+        - identifier (str): A username or email.
+
+        Returns:
+        bool: False only if the identifier was not registered at the last sync.
+        """
+        bloom = self._bloom
+        return bloom is None or identifier.lower() in bloom
+
+    async def might_be_registered(self, identifier: str) -> bool:
+        """
+        Check whether an identifier may belong to a registered user, including
+        users registered on other workers since the last sync.
+
+        A miss is confirmed by an incremental sync that started after it, so
+        an account registered on another worker is never reported missing.
+        Concurrent misses share one sync, so a flood of unknown identifiers
+        costs at most one indexed query at a time rather than one per request.
+
+        Parameters:
+        - identifier (str): A username or email.
+
+        Returns:
+        bool: False only if the identifier is definitely not registered.
+        """
+        if self.might_exist(identifier):
+            return True
+        missed_at = time.monotonic()
+        try:
+            async with self._sync_lock:
+                if self._sync_started_at is None or self._sync_started_at < missed_at:
+                    await self._sync()
+        except SQLAlchemyError:
+            logger.exception("Failed to sync the identifier filter")
+            return True
+        return self.might_exist(identifier)
+
+    def add(self, *identifiers: Optional[str]) -> None:
+        """
+        Record newly registered or updated identifiers.
+
+        Parameters:
+        - identifiers (Optional[str]): Usernames and emails; None is ignored.
+        """
+        bloom = self._bloom
+        if bloom is None:
+            return
+        for identifier in identifiers:
+            if identifier:
+                bloom.add(identifier.lower())
+
+    async def rebuild(self) -> None:
+        """
+        Build a fresh filter from a streaming scan of the users table.
+        """
+        async with self._sync_lock:
+            self._sync_started_at = time.monotonic()
+            synced_at, user_count = await run_in_transaction(
+                _fetch_one, select(func.now(), func.count()).select_from(UserModel)
+            )
+            bloom = BloomFilter(
+                capacity=max(self.capacity, user_count * 2),
+                error_rate=self.error_rate,
+            )
+            await _scan_into(bloom, since=None)
+            self._bloom = bloom
+            self._synced_at = synced_at
+        logger.info(f"Identifier filter rebuilt with {user_count} users")
+
+    async def sync(self) -> None:
+        """
+        Fold in users registered or updated since the last build or sync.
+        """
+        async with self._sync_lock:
+            await self._sync()
+
+    async def _sync(self) -> None:
+        if self._bloom is None or self._synced_at is None:
+            return
+        self._sync_started_at = time.monotonic()
+        (synced_at,) = await run_in_transaction(_fetch_one, select(func.now()))
+        await _scan_into(self._bloom, since=self._synced_at - SYNC_OVERLAP)
+        self._synced_at = synced_at
+
+
+def _fetch_one(conn: Connection, stmt: Executable) -> Row:
+    return conn.execute(stmt).one()
+
+
+async def _scan_into(bloom: BloomFilter, since: Optional[datetime]) -> None:
+    # users_updated_at_index keeps incremental scans to the changed users
+    query = select(UserModel.username, UserModel.email)
+    if since is not None:
+        query = query.where(UserModel.updated_at >= since)
+
+    async for rows in stream_in_batches(query, SCAN_BATCH_SIZE):
+        # Hashing a batch takes a while, so it is done off the event loop
+        await run_in_threadpool(_add_rows, bloom, rows)
+
+
+def _add_rows(bloom: BloomFilter, rows: List[dict]) -> None:
+    for row in rows:
+        bloom.add(row["username"].lower())
+        bloom.add(row["email"].lower())
+
+
+identifier_filter = IdentifierFilter(
+    capacity=IDENTIFIER_FILTER_CAPACITY, error_rate=IDENTIFIER_FILTER_ERROR_RATE
+)
+
+
+async def maintain_identifier_filter() -> None:
+    """
+    Build the identifier filter, then keep it in sync until cancelled.
+
+    Meant to run as a background task for the lifetime of the application.
+    """
+    if not IDENTIFIER_FILTER_ENABLED:
+        return
+
+    last_rebuild: Optional[float] = None
+    while True:
+        try:
+            if (
+                last_rebuild is None
+                or time.monotonic() - last_rebuild >= IDENTIFIER_FILTER_REBUILD_SECONDS
+            ):
+                await identifier_filter.rebuild()
+                last_rebuild = time.monotonic()
+            else:
+                await identifier_filter.sync()
+        except SQLAlchemyError:
+            logger.exception("Failed to refresh the identifier filter")
+        await asyncio.sleep(IDENTIFIER_FILTER_SYNC_SECONDS)
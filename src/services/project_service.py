@@ -1,140 +1,321 @@
 import os
+import uuid
 from fastapi import File, Response, UploadFile, status, HTTPException
-from typing import Annotated
-from sqlalchemy import func, insert, select, and_
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Annotated, Any, List, Optional
+from sqlalchemy import (
+    ColumnClause,
+    Insert,
+    SQLColumnExpression,
+    Select,
+    String,
+    Subquery,
+    and_,
+    column,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    UUID,
+    aggregate_order_by,
+    array_agg,
+    insert as pg_insert,
+)
 from sqlalchemy.exc import IntegrityError, NoResultFound, SQLAlchemyError
-from datetime import datetime
+from sqlalchemy.sql.selectable import LateralFromClause
 
-from src.config.database.db_connection import engine
+from src.config.database.db_connection import (
+    stream_in_batches,
+    fetch_all_as_dicts,
+    fetch_one_as_dict,
+    insert_and_get_id,
+    run_in_transaction,
+)
 
 from src.models.project_model import ProjectModel
-from src.models.project_members_model import ProjectMembersModel
+from src.models.project_membership_model import ProjectMembershipModel
 from src.models.project_documents_model import ProjectDocumentsModel
 from src.models.user_model import UserModel
 
 from src.schemas.users_schema import UserInfo
-from src.schemas.projects_schema import CreateProjectDetails, CreateProjectMembers
+from src.schemas.index import ExportFormatEnum
+from src.schemas.projects_schema import (
+    CreateProjectDetails,
+    CreateProjectMembers,
+    ProjectInfoExtended,
+)
 
-from src.utils.constants import UPLOADS_FOLDER_PATH
 from src.utils.exceptions import DatabaseException
+from src.utils.export import export_response
+from src.utils.pagination import paginate, split_page
+from src.utils.uploads import store_upload
 
+EMPTY_TEXT_ARRAY: ColumnClause[List[str]] = literal_column("'{}'::varchar[]")
+PROJECT_EXPORT_COLUMNS = tuple(ProjectInfoExtended.model_fields)
 
-def create_project(payload: CreateProjectDetails, user: UserInfo, response: Response):
+
+async def create_project(
+    payload: CreateProjectDetails, user: UserInfo, response: Response
+) -> dict:
     stmt = insert(ProjectModel).values(
         project_owner_id=user["id"], **payload.model_dump()
     )
-    with engine.begin() as conn:
-        try:
-            result = conn.execute(stmt)
-            return {
-                "success": True,
-                "message": "Project Created Successfully",
-                "id": str(result.inserted_primary_key[0]),
-            }
-        except IntegrityError:
-            response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
-            return {
-                "success": False,
-                "message": "Something went wrong while creating project details!",
-                "id": None,
-            }
-        except SQLAlchemyError as error:
-            response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
-            raise DatabaseException(
-                f"Something went wrong in DB while creating project details! {error}"
-            ) from error
+    try:
+        project_id = await run_in_transaction(insert_and_get_id, stmt)
+        return {
+            "success": True,
+            "message": "Project Created Successfully",
+            "id": project_id,
+        }
+    except IntegrityError:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        return {
+            "success": False,
+            "message": "Something went wrong while creating project details!",
+            "id": None,
+        }
+    except SQLAlchemyError as error:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        raise DatabaseException(
+            f"Something went wrong in DB while creating project details! {error}"
+        ) from error
+
 
+def build_add_members_statement(project_id: str, emails: List[str]) -> Insert:
+    """
+    Build a single statement adding many member emails to a project.
 
-def add_project_members(
+    The emails are sent as one array parameter and unnested server-side,
+    matched to registered users by email, and inserted with ON CONFLICT DO
+    NOTHING so existing members are skipped.
+
+    Parameters:
+    - project_id (str): ID of the project.
+    - emails (List[str]): Normalised, de-duplicated member emails.
+
+    Returns:
+    Insert: Statement returning the IDs of the memberships it created.
+    """
+    new_member = (
+        func.unnest(literal(emails, ARRAY(String)))
+        .table_valued(column("email", String))
+        .render_derived(name="new_member")
+    )
+    return (
+        pg_insert(ProjectMembershipModel)
+        .from_select(
+            ["project_id", "email", "user_id"],
+            select(
+                literal(uuid.UUID(project_id), UUID(as_uuid=True)),
+                new_member.c.email,
+                UserModel.id,
+            )
+            .select_from(new_member)
+            .outerjoin(UserModel, UserModel.email == new_member.c.email),
+        )
+        .on_conflict_do_nothing(index_elements=["project_id", "email"])
+        .returning(ProjectMembershipModel.id)
+    )
+
+
+async def add_project_members(
     project_id: str, body: CreateProjectMembers, response: Response
-):
-    stmt = insert(ProjectMembersModel).values(
-        project_id=project_id, email_ids=body.email_ids
+) -> dict:
+    emails = sorted(
+        {email.strip().lower() for email in body.email_ids if email.strip()}
     )
-    with engine.begin() as conn:
-        try:
-            result = conn.execute(stmt)
-            return {
-                "success": True,
-                "message": "Project Members Created Successfully",
-                "id": str(result.inserted_primary_key[0]),
-            }
-        except IntegrityError:
-            response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
-            return {
-                "success": False,
-                "message": "Something went wrong while creating project members!",
-                "id": None,
-            }
-        except SQLAlchemyError as error:
-            response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
-            raise DatabaseException(
-                f"Something went wrong in DB while creating project members! {error}"
-            ) from error
+    stmt = build_add_members_statement(project_id, emails)
+    try:
+        added = len(await run_in_transaction(fetch_all_as_dicts, stmt))
+        return {
+            "success": True,
+            "message": "Project Members Created Successfully",
+            "id": project_id,
+            "added": added,
+            "skipped": len(emails) - added,
+        }
+    except IntegrityError:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        return {
+            "success": False,
+            "message": "Something went wrong while creating project members!",
+            "id": None,
+        }
+    except SQLAlchemyError as error:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        raise DatabaseException(
+            f"Something went wrong in DB while creating project members! {error}"
+        ) from error
 
 
-def get_all_projects_with_pagination(
-    response: Response, user: UserInfo, page: int = 1, page_size: int = 10
-):
+def build_projects_page_query(
+    owner_id: str, page: int, page_size: int, cursor: Optional[str] = None
+) -> Select:
     """
-    Retrieve all projects with pagination.
+    Build the query for one page of an owner's projects.
+
+    The page of projects is selected first; members and documents are then
+    aggregated per project in LATERAL subqueries, so they neither multiply
+    each other's rows nor drop projects that have none.
+
+    Parameters:
+    - owner_id (str): ID of the projects' owner.
+    - page (int): Page number, used when no cursor is given.
+    - page_size (int): Number of items per page.
+    - cursor (Optional[str]): Cursor of the next page from a previous response.
+
+    Returns:
+    Select: Query returning the projects with owner, members and documents.
+    """
+    projects_page = paginate(
+        select(ProjectModel).where(ProjectModel.project_owner_id == owner_id),
+        ProjectModel.created_at,
+        ProjectModel.id,
+        page,
+        page_size,
+        cursor,
+    ).subquery("projects_page")
+
+    return _with_members_and_documents(projects_page)
+
+
+def _members_of(project_id: SQLColumnExpression[Any], name: str) -> LateralFromClause:
+    # Members of a project in the shape of its former project_members row:
+    # the sorted emails, and as its id the id of the first membership, null
+    # when the project has no members
+    membership_order = (ProjectMembershipModel.created_at, ProjectMembershipModel.id)
+    membership_ids = array_agg(
+        aggregate_order_by(ProjectMembershipModel.id, *membership_order)
+    )
+    return (
+        select(
+            membership_ids[1].label("project_members_id"),
+            func.coalesce(
+                array_agg(
+                    aggregate_order_by(
+                        ProjectMembershipModel.email, ProjectMembershipModel.email
+                    )
+                ),
+                EMPTY_TEXT_ARRAY,
+            ).label("project_members_email_ids"),
+            func.min(ProjectMembershipModel.created_at).label("created_at"),
+            func.max(ProjectMembershipModel.updated_at).label("updated_at"),
+        )
+        .where(ProjectMembershipModel.project_id == project_id)
+        .lateral(name)
+    )
+
+
+def _with_members_and_documents(projects: Subquery) -> Select:
+    # Aggregates members and documents per project of the given subquery,
+    # ordered newest first
+    members = _members_of(projects.c.id, "members")
+    document_order = (ProjectDocumentsModel.created_at, ProjectDocumentsModel.id)
+    # Documents stored before their names were recorded are named
+    # {timestamp}_{filename}, like their download name
+    document_name = func.coalesce(
+        ProjectDocumentsModel.file_name,
+        func.substring(ProjectDocumentsModel.document_path, "[^/_]*_(.*)$"),
+    )
+    documents = (
+        select(
+            func.coalesce(
+                array_agg(
+                    aggregate_order_by(
+                        ProjectDocumentsModel.document_path, *document_order
+                    )
+                ),
+                EMPTY_TEXT_ARRAY,
+            ).label("documents_path"),
+            func.coalesce(
+                array_agg(aggregate_order_by(document_name, *document_order)),
+                EMPTY_TEXT_ARRAY,
+            ).label("documents_name"),
+        )
+        .where(ProjectDocumentsModel.project_id == projects.c.id)
+        .lateral("documents")
+    )
+
+    return (
+        select(
+            projects,
+            members.c.project_members_id,
+            members.c.project_members_email_ids,
+            UserModel.first_name.label("owner_first_name"),
+            UserModel.last_name.label("owner_last_name"),
+            documents.c.documents_path,
+            documents.c.documents_name,
+        )
+        .join(UserModel, UserModel.id == projects.c.project_owner_id)
+        .join(members, true())
+        .join(documents, true())
+        .order_by(projects.c.created_at.desc(), projects.c.id.desc())
+    )
+
+
+def export_projects(
+    user: UserInfo, export_format: ExportFormatEnum
+) -> StreamingResponse:
+    """
+    Stream every project of the user, newest first, as NDJSON or CSV.
+
+    Parameters:
+    - user (UserInfo): The authenticated user.
+    - export_format (ExportFormatEnum): The output format.
+
+    Returns:
+    StreamingResponse: The streaming download.
+    """
+    projects = (
+        select(ProjectModel)
+        .where(ProjectModel.project_owner_id == user["id"])
+        .subquery("projects")
+    )
+    return export_response(
+        stream_in_batches(_with_members_and_documents(projects)),
+        export_format,
+        PROJECT_EXPORT_COLUMNS,
+        "projects",
+    )
+
+
+async def get_all_projects_with_pagination(
+    response: Response,
+    user: UserInfo,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Retrieve all projects with pagination, newest first.
 
     Parameters:
     - response (Response): FastAPI Response object.
-    - page (int): Page number (default: 1).
+    - page (int): Page number (default: 1), ignored when a cursor is given.
     - page_size (int): Number of items per page (default: 10).
+    - cursor (Optional[str]): Cursor of the next page from a previous response.
 
     Returns:
-    dict: Response containing the list of projects.
+    dict: Response containing the list of projects and the next page cursor.
 
     Raises:
     - NoResultFound: If no projects are found.
     - SQLAlchemyError: If there is an error in the database operation.
     """
     try:
-        skip = (page - 1) * page_size
-        query = (
-            select(
-                ProjectModel,
-                ProjectMembersModel.id.label("project_members_id"),
-                ProjectMembersModel.email_ids.label("project_members_email_ids"),
-                UserModel.id.label("project_owner_id"),
-                UserModel.first_name.label("owner_first_name"),
-                UserModel.last_name.label("owner_last_name"),
-                func.array_agg(ProjectDocumentsModel.document_path).label(
-                    "documents_path"
-                ),
-            )
-            .join(
-                ProjectMembersModel,
-                ProjectMembersModel.project_id == ProjectModel.id,
-                isouter=True,
-            )
-            .join(
-                ProjectDocumentsModel,
-                ProjectDocumentsModel.project_id == ProjectModel.id,
-            )
-            .join(UserModel, ProjectModel.project_owner_id == UserModel.id)
-            .where(ProjectModel.project_owner_id == user["id"])
-            .group_by(
-                ProjectModel.id,
-                ProjectModel.name,
-                ProjectModel.project_owner_id,
-                ProjectMembersModel.id,
-                UserModel.id,
-                UserModel.first_name,
-                UserModel.last_name,
-            )
-            .distinct()
-            .offset(skip)
-            .limit(page_size)
-        )
+        query = build_projects_page_query(user["id"], page, page_size, cursor)
 
-        with engine.begin() as conn:
-            result = conn.execute(query)
-            projects_list = [dict(zip(result.keys(), row)) for row in result.fetchall()]
+        projects_list, next_cursor = split_page(
+            await run_in_transaction(fetch_all_as_dicts, query), page_size
+        )
 
-            return {"success": True, "data": projects_list}
+        return {"success": True, "data": projects_list, "next_cursor": next_cursor}
 
     except NoResultFound:
         response.status_code = status.HTTP_404_NOT_FOUND
@@ -147,36 +328,133 @@ def get_all_projects_with_pagination(
         ) from error
 
 
-def fetch_project_member_by_project_id(
+def build_member_of_query(
+    email: str, page: int, page_size: int, cursor: Optional[str] = None
+) -> Select:
+    """
+    Build the query for one page of the projects an email is a member of.
+
+    Pages are ordered by membership, newest first, so the page is read from
+    the (email, created_at, id) index of project_memberships.
+
+    Parameters:
+    - email (str): The member's email.
+    - page (int): Page number, used when no cursor is given.
+    - page_size (int): Number of items per page.
+    - cursor (Optional[str]): Cursor of the next page from a previous response.
+
+    Returns:
+    Select: Query returning the projects with their owner and membership time.
+    """
+    return paginate(
+        select(
+            ProjectModel,
+            UserModel.first_name.label("owner_first_name"),
+            UserModel.last_name.label("owner_last_name"),
+            ProjectMembershipModel.id.label("membership_id"),
+            ProjectMembershipModel.created_at.label("member_since"),
+        )
+        .select_from(ProjectMembershipModel)
+        .join(ProjectModel, ProjectModel.id == ProjectMembershipModel.project_id)
+        .join(UserModel, UserModel.id == ProjectModel.project_owner_id)
+        .where(ProjectMembershipModel.email == email.lower()),
+        ProjectMembershipModel.created_at,
+        ProjectMembershipModel.id,
+        page,
+        page_size,
+        cursor,
+    )
+
+
+async def get_member_of_projects_with_pagination(
+    response: Response,
+    user: UserInfo,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Retrieve the projects the user is a member of, most recently joined first.
+
+    Parameters:
+    - response (Response): FastAPI Response object.
+    - user (UserInfo): The authenticated user.
+    - page (int): Page number (default: 1), ignored when a cursor is given.
+    - page_size (int): Number of items per page (default: 10).
+    - cursor (Optional[str]): Cursor of the next page from a previous response.
+
+    Returns:
+    dict: Response containing the list of projects and the next page cursor.
+
+    Raises:
+    - SQLAlchemyError: If there is an error in the database operation.
+    """
+    try:
+        query = build_member_of_query(user["email"], page, page_size, cursor)
+
+        projects_list, next_cursor = split_page(
+            await run_in_transaction(fetch_all_as_dicts, query),
+            page_size,
+            created_at_key="member_since",
+            id_key="membership_id",
+        )
+
+        return {"success": True, "data": projects_list, "next_cursor": next_cursor}
+
+    except SQLAlchemyError as error:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        raise SQLAlchemyError(
+            f"Error during member-of projects retrieval : {error}"
+        ) from error
+
+
+async def fetch_project_member_by_project_id(
     project_id: str,
     user: UserInfo,
     response: Response,
-):
+) -> dict:
+    members = _members_of(ProjectModel.id, "members")
     try:
         query = (
             select(
-                ProjectMembersModel,
+                members.c.project_members_id,
+                members.c.project_members_email_ids,
+                ProjectModel.id.label("project_id"),
+                members.c.created_at,
+                members.c.updated_at,
                 ProjectModel.name,
                 ProjectModel.status,
                 ProjectModel.project_owner_id,
             )
-            .join(ProjectModel)
-            .join(UserModel)
+            .join(members, true())
             .where(
                 and_(
-                    ProjectMembersModel.project_id == project_id,
+                    ProjectModel.id == project_id,
                     ProjectModel.project_owner_id == user["id"],
+                    members.c.project_members_id.is_not(None),
                 )
             )
         )
 
-        with engine.begin() as conn:
-            result = conn.execute(query)
-            project_members_list = [
-                dict(zip(result.keys(), row)) for row in result.fetchall()
-            ]
-
-            return {"success": True, "data": project_members_list}
+        rows = await run_in_transaction(fetch_all_as_dicts, query)
+
+        # One entry per project, shaped like the former project_members rows
+        project_members_list = [
+            {
+                "ProjectMembersModel": {
+                    "id": row["project_members_id"],
+                    "email_ids": row["project_members_email_ids"],
+                    "project_id": row["project_id"],
+                    "created_at": row["created_at"],
+                    "updated_at": row["updated_at"],
+                },
+                "name": row["name"],
+                "status": row["status"],
+                "project_owner_id": row["project_owner_id"],
+            }
+            for row in rows
+        ]
+        return {"success": True, "data": project_members_list}
 
     except NoResultFound:
         response.status_code = status.HTTP_404_NOT_FOUND
@@ -189,50 +467,73 @@ def fetch_project_member_by_project_id(
         ) from error
 
 
-def create_project_documents_by_project_id(
+async def create_project_documents_by_project_id(
     project_id: str,
     files: Annotated[
         list[UploadFile], File(description="Multiple files as UploadFile")
     ] = None,
-):
-    try:
-        project_document_ids = []
-
-        project_id_exists_stmt = select(ProjectModel.id).where(
-            ProjectModel.id == project_id
-        )
+) -> dict:
+    """
+    Store uploaded documents of a project.
 
-        with engine.begin() as conn:
-            project_result = conn.execute(project_id_exists_stmt)
+    Files are kept in the content-addressed store, so identical files are
+    stored once and shared by every document referencing them. Every file is
+    streamed to disk before its row is written, and the rows of all files
+    are inserted with a single statement, so a database connection is only
+    held for two short queries and never during disk I/O.
 
-        if project_result.fetchone() is None:
-            raise HTTPException(
-                detail="Invalid Project ID!",
-                status_code=status.HTTP_404_NOT_FOUND,
-            )
+    Parameters:
+    - project_id (str): ID of the project.
+    - files (list[UploadFile]): The uploaded documents.
 
-        for file in files:
-            timestamp = datetime.now().strftime("%Y-%m-%dT%H:%MZ")
-            file_path = f"{timestamp}_{file.filename.replace(' ', '-').lower()}"
+    Returns:
+    dict: The IDs of the new documents, in the order of the files.
 
-            document_path = f"{UPLOADS_FOLDER_PATH}/{file_path}"
+    Raises:
+    - HTTPException: If the project does not exist or the rows cannot be stored.
+    """
+    project_id_exists_stmt = select(ProjectModel.id).where(
+        ProjectModel.id == project_id
+    )
+    try:
+        project = await run_in_transaction(fetch_one_as_dict, project_id_exists_stmt)
+    except SQLAlchemyError as error:
+        raise HTTPException(
+            detail=(
+                "Something went wrong in DB while uploading project documents! "
+                f"{error}"
+            ),
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
 
-            with engine.begin() as conn:
-                stmt = insert(ProjectDocumentsModel).values(
-                    project_id=project_id, document_path=document_path
-                )
-                result = conn.execute(stmt)
+    if project is None:
+        raise HTTPException(
+            detail="Invalid Project ID!",
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
 
-                file_upload_path = os.path.join(UPLOADS_FOLDER_PATH, file_path)
-                with open(file_upload_path, "wb") as local_file:
-                    local_file.write(file.file.read())
-                project_document_ids.append(str(result.inserted_primary_key[0]))
+    documents = []
+    for file in files:
+        stored = await run_in_threadpool(store_upload, file)
+        documents.append(
+            {
+                "project_id": project_id,
+                "document_path": stored.path,
+                "content_hash": stored.content_hash,
+                "size_bytes": stored.size_bytes,
+                "file_name": os.path.basename(file.filename or ""),
+            }
+        )
 
-        return {
-            "success": True,
-            "message": "Project Documents Uploaded Successfully",
-            "id": project_document_ids,
-        }
+    # Objects left unreferenced by a failed insert are shared by content, so
+    # they are not removed here; dedup_uploads --collect-garbage removes them
+    stmt = (
+        insert(ProjectDocumentsModel)
+        .values(documents)
+        .returning(ProjectDocumentsModel.id)
+    )
+    try:
+        document_ids = await run_in_transaction(fetch_all_as_dicts, stmt)
     except IntegrityError as error:
         raise HTTPException(
             detail=f"Something went wrong while uploading project documents! {error}",
@@ -240,6 +541,15 @@ def create_project_documents_by_project_id(
         )
     except SQLAlchemyError as error:
         raise HTTPException(
-            detail=f"Something went wrong in DB while uploading project documents! {error}",
+            detail=(
+                "Something went wrong in DB while uploading project documents! "
+                f"{error}"
+            ),
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
+
+    return {
+        "success": True,
+        "message": "Project Documents Uploaded Successfully",
+        "id": [str(document["id"]) for document in document_ids],
+    }
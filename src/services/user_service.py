@@ -1,66 +1,340 @@
+import csv
+import io
+import json
 import logging
-import os
 from datetime import datetime, timezone
-from typing import Annotated, Dict
+from typing import Annotated, Any, Dict, List, Optional
 
 from fastapi import File, HTTPException, Response, UploadFile, status
-from sqlalchemy import insert, or_, select, update
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import Connection, Select, exists, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, NoResultFound, SQLAlchemyError
 
-from src.config.database.db_connection import engine
+from src.config.database.db_connection import (
+    stream_in_batches,
+    execute_statement,
+    fetch_all_as_dicts,
+    fetch_one_as_dict,
+    insert_and_get_id,
+    run_in_transaction,
+)
+from src.middlewares.authentication_middleware import (
+    AUTH_MODE,
+    invalidate_cached_principal,
+)
 from src.models.user_model import UserModel
+from src.services.identifier_filter_service import identifier_filter
 from src.utils.exceptions import DatabaseException
-from src.utils.index import generate_jwt_token, hash_password, verify_password
+from src.utils.index import generate_jwt_token, get_env_variable, token_version
+from src.utils.export import export_response
+from src.utils.pagination import paginate, split_page
+from src.utils.password_hasher import password_hasher
+from src.utils.uploads import remove_files, store_profile_picture
 from schemas.users_schema import LoginResponse, LoginUser, RegisterUser
-from src.schemas.index import BaseSuccessResponse
-from src.utils.constants import UPLOADS_FOLDER_PATH
+from src.schemas.index import ExportFormatEnum
+from src.utils.constants import (
+    BULK_CREATED,
+    BULK_DUPLICATE,
+    BULK_INVALID,
+    STATELESS_AUTH_MODE,
+)
 
+# Limits of a single bulk registration
+BULK_REGISTER_MAX_ROWS = int(get_env_variable("BULK_REGISTER_MAX_ROWS", "10000"))
+BULK_REGISTER_INSERT_CHUNK_SIZE = int(
+    get_env_variable("BULK_REGISTER_INSERT_CHUNK_SIZE", "1000")
+)
 
-logger = logging.getLogger(__name__)
 
+logger = logging.getLogger(__name__)
 
-def create_account(payload: RegisterUser, response: Response) -> BaseSuccessResponse:
+# Columns of a user in the users list, named as in UserInfoExtended
+USER_LIST_COLUMNS = (
+    UserModel.id,
+    UserModel.first_name,
+    UserModel.last_name,
+    UserModel.username,
+    UserModel.email,
+    UserModel.role,
+    UserModel.profile_picture.label("profile_picture_path"),
+    UserModel.is_verified,
+    UserModel.is_deleted,
+    UserModel.created_at,
+    UserModel.updated_at,
+)
+# Columns needed to verify a login and sign its token
+LOGIN_COLUMNS = (
+    UserModel.id,
+    UserModel.username,
+    UserModel.email,
+    UserModel.first_name,
+    UserModel.last_name,
+    UserModel.role,
+    UserModel.password,
+    UserModel.updated_at,
+)
+
+
+async def create_account(payload: RegisterUser, response: Response) -> dict:
     """
     Create a user account with the provided registration payload.
 
+    The password is hashed on the dedicated password hasher pool, so it
+    does not block the event loop.
+
     Parameters:
     - payload (RegisterUser): Registration payload.
     - response (Response): FastAPI Response object.
 
     Returns:
-    RegisterResponse: Registration response.
+    dict: Registration response.
 
     Raises:
     - DatabaseException: If there is an error in the database operation.
+    - HTTPException: 503 if the password hasher queue is full.
     """
-    hashed_password = hash_password(payload.password)
+    username, email = payload.username.lower(), payload.email.lower()
+
+    # Skip hashing and the failing insert when the account is already taken
+    if identifier_filter.might_exist(username) or identifier_filter.might_exist(email):
+        if await run_in_transaction(_account_exists, username, email):
+            response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+            return {"success": False, "message": "User Already Exists!", "id": None}
+
+    hashed_password = await password_hasher.hash_password(payload.password)
     stmt = insert(UserModel).values(
         first_name=payload.firstName,
         last_name=payload.lastName,
-        username=payload.username.lower(),
-        email=payload.email.lower(),
+        username=username,
+        email=email,
         password=hashed_password,
         role=payload.role,
     )
-    with engine.begin() as conn:
+    try:
+        user_id = await run_in_transaction(insert_and_get_id, stmt)
+    except IntegrityError:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        return {"success": False, "message": "User Already Exists!", "id": None}
+    except SQLAlchemyError as error:
+        raise DatabaseException("Error during user registration") from error
+
+    identifier_filter.add(username, email)
+    return {
+        "success": True,
+        "message": "User Registered Successfully",
+        "id": user_id,
+    }
+
+
+def parse_bulk_records(content: bytes, content_type: Optional[str]) -> List[dict]:
+    """
+    Parse a bulk registration upload.
+
+    Parameters:
+    - content (bytes): The request body or file contents.
+    - content_type (Optional[str]): "text/csv" for CSV, JSON array otherwise.
+
+    Returns:
+    List[dict]: One raw record per row.
+
+    Raises:
+    - HTTPException: 400 if the payload is not a CSV or a JSON array of objects.
+    """
+    try:
+        text_content = content.decode("utf-8-sig")
+        if content_type and "csv" in content_type:
+            return [
+                {key: value for key, value in row.items() if value not in ("", None)}
+                for row in csv.DictReader(io.StringIO(text_content))
+            ]
+        records = json.loads(text_content)
+    except (UnicodeDecodeError, ValueError, csv.Error):
+        records = None
+
+    if not isinstance(records, list) or not all(
+        isinstance(record, dict) for record in records
+    ):
+        raise HTTPException(
+            detail="Expected a JSON array of users or a CSV file!",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    return records
+
+
+async def bulk_register_users(records: List[dict]) -> dict:
+    """
+    Register many user accounts at once and report the outcome of every row.
+
+    Rows are validated as RegisterUser. Rows repeating a username or email
+    of an earlier row, or of an existing account, are reported as duplicates
+    before any hashing. The remaining passwords are hashed in parallel on the
+    password hasher pool, then inserted with multi-row INSERT ... ON CONFLICT
+    DO NOTHING in chunks of BULK_REGISTER_INSERT_CHUNK_SIZE. Rows that lose a
+    race with a concurrent registration are reported as duplicates too.
+
+    Parameters:
+    - records (List[dict]): Raw registration records.
+
+    Returns:
+    dict: Counts per outcome and the per-row results, in input order.
+
+    Raises:
+    - HTTPException: 413 if there are more than BULK_REGISTER_MAX_ROWS records,
+      503 if the password hasher queue is full.
+    - DatabaseException: If there is an error in the database operation.
+    """
+    if len(records) > BULK_REGISTER_MAX_ROWS:
+        raise HTTPException(
+            detail=f"At most {BULK_REGISTER_MAX_ROWS} users per request!",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+    results: List[dict] = []
+    accepted: List[tuple] = []
+    seen_usernames, seen_emails = set(), set()
+    for index, record in enumerate(records):
         try:
-            result = conn.execute(stmt)
-            return {
-                "success": True,
-                "message": "User Registered Successfully",
-                "id": str(result.inserted_primary_key[0]),
+            payload = RegisterUser.model_validate(record)
+        except ValidationError as error:
+            results.append(
+                _bulk_result(
+                    index,
+                    record.get("username"),
+                    record.get("email"),
+                    BULK_INVALID,
+                    _validation_message(error),
+                )
+            )
+            continue
+
+        username, email = payload.username.lower(), payload.email.lower()
+        result = _bulk_result(index, username, email, BULK_CREATED)
+        if username in seen_usernames or email in seen_emails:
+            result.update(status=BULK_DUPLICATE, message="Duplicate in request!")
+        else:
+            accepted.append((result, payload))
+        seen_usernames.add(username)
+        seen_emails.add(email)
+        results.append(result)
+
+    try:
+        if accepted:
+            taken_usernames, taken_emails = await run_in_transaction(
+                _find_taken_identifiers,
+                [result["username"] for result, _ in accepted],
+                [result["email"] for result, _ in accepted],
+            )
+            for result, _ in accepted:
+                if (
+                    result["username"] in taken_usernames
+                    or result["email"] in taken_emails
+                ):
+                    result.update(status=BULK_DUPLICATE, message="User Already Exists!")
+            accepted = [item for item in accepted if item[0]["status"] == BULK_CREATED]
+
+        hashed_passwords = await password_hasher.hash_many(
+            [payload.password for _, payload in accepted]
+        )
+        rows = [
+            {
+                "first_name": payload.firstName,
+                "last_name": payload.lastName,
+                "username": result["username"],
+                "email": result["email"],
+                "password": hashed_password,
+                "role": payload.role,
             }
-        except IntegrityError:
-            response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
-            return {"success": False, "message": "User Already Exists!", "id": None}
-        except SQLAlchemyError as error:
-            raise DatabaseException("Error during user registration") from error
+            for (result, payload), hashed_password in zip(accepted, hashed_passwords)
+        ]
+
+        created_ids: Dict[str, str] = {}
+        for start in range(0, len(rows), BULK_REGISTER_INSERT_CHUNK_SIZE):
+            stop = start + BULK_REGISTER_INSERT_CHUNK_SIZE
+            created_ids.update(
+                await run_in_transaction(_insert_new_users, rows[start:stop])
+            )
+    except SQLAlchemyError as error:
+        raise DatabaseException("Error during bulk user registration") from error
+
+    for result, _ in accepted:
+        user_id = created_ids.get(result["username"])
+        if user_id is None:
+            result.update(status=BULK_DUPLICATE, message="User Already Exists!")
+        else:
+            result["id"] = user_id
+            identifier_filter.add(result["username"], result["email"])
+
+    counts = {outcome: 0 for outcome in (BULK_CREATED, BULK_DUPLICATE, BULK_INVALID)}
+    for result in results:
+        counts[result["status"]] += 1
+
+    return {
+        "success": True,
+        "created": counts[BULK_CREATED],
+        "duplicates": counts[BULK_DUPLICATE],
+        "invalid": counts[BULK_INVALID],
+        "results": results,
+    }
+
+
+def _bulk_result(
+    index: int, username: Any, email: Any, outcome: str, message: str = ""
+) -> dict:
+    return {
+        "index": index,
+        "username": username if isinstance(username, str) else None,
+        "email": email if isinstance(email, str) else None,
+        "status": outcome,
+        "id": None,
+        "message": message or "User Registered Successfully",
+    }
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def _find_taken_identifiers(
+    conn: Connection, usernames: List[str], emails: List[str]
+) -> tuple:
+    query = select(UserModel.username, UserModel.email).where(
+        or_(UserModel.username.in_(usernames), UserModel.email.in_(emails))
+    )
+    rows = conn.execute(query).all()
+    return {row.username for row in rows}, {row.email for row in rows}
+
 
+def _insert_new_users(conn: Connection, rows: List[dict]) -> Dict[str, str]:
+    # Conflicts on either unique index (username or email) skip the row
+    stmt = (
+        pg_insert(UserModel)
+        .values(rows)
+        .on_conflict_do_nothing()
+        .returning(UserModel.id, UserModel.username)
+    )
+    return {row.username: str(row.id) for row in conn.execute(stmt)}
+
+
+def _account_exists(conn: Connection, username: str, email: str) -> bool:
+    query = select(
+        exists().where(or_(UserModel.username == username, UserModel.email == email))
+    )
+    return bool(conn.execute(query).scalar())
 
-def authenticate_user(payload: LoginUser, response: Response) -> LoginResponse:
+
+async def authenticate_user(payload: LoginUser, response: Response) -> LoginResponse:
     """
     Authenticate a user with the provided login payload.
 
+    The password is verified on the dedicated password hasher pool, after
+    the database connection used for the lookup has been released.
+
     Parameters:
     - payload (LoginUser): Login payload.
     - response (Response): FastAPI Response object.
@@ -70,73 +344,111 @@ def authenticate_user(payload: LoginUser, response: Response) -> LoginResponse:
 
     Raises:
     - SQLAlchemyError: If there is an error in the database operation.
+    - HTTPException: 503 if the password hasher queue is full.
     - Exception: For unexpected errors during user authentication.
     """
-    try:
-        query = (
-            select(UserModel)
-            .where(
-                or_(
-                    UserModel.email == payload.identifier.lower(),
-                    UserModel.username == payload.identifier.lower(),
+    identifier = payload.identifier.lower()
+    # Identifiers that were never registered are rejected without a login query
+    if not await identifier_filter.might_be_registered(identifier):
+        user_dict = None
+    else:
+        try:
+            query = (
+                select(*LOGIN_COLUMNS)
+                .where(
+                    or_(
+                        UserModel.email == identifier,
+                        UserModel.username == identifier,
+                    )
                 )
+                .limit(1)
             )
-            .limit(1)
-        )
+            user_dict = await run_in_transaction(fetch_one_as_dict, query)
+        except (SQLAlchemyError, NoResultFound) as error:
+            raise HTTPException(
+                detail=f"Error during user authentication{error}",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            ) from error
+
+    if user_dict is None:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {
+            "success": False,
+            "message": "This account is not registered with us!",
+            "token": None,
+        }
 
-        with engine.begin() as conn:
-            result = conn.execute(query)
-            user_data = result.fetchone()
-
-            if user_data is None:
-                response.status_code = status.HTTP_400_BAD_REQUEST
-                return {
-                    "success": False,
-                    "message": "This account is not registered with us!",
-                    "token": None,
-                }
-
-            user_dict = dict(zip(result.keys(), user_data))
-            is_password_verified = verify_password(
-                payload.password, user_dict["password"]
+    is_password_verified = await password_hasher.verify_password(
+        payload.password, user_dict["password"]
+    )
+
+    if is_password_verified:
+        if password_hasher.needs_rehash(user_dict["password"]):
+            await _rehash_password(user_dict, payload.password)
+
+        user_payload = {
+            "id": str(user_dict["id"]),
+            "username": user_dict["username"],
+            "email": user_dict["email"],
+        }
+        if AUTH_MODE == STATELESS_AUTH_MODE:
+            # Sign the full principal plus a version stamp into the token
+            user_payload.update(
+                first_name=user_dict["first_name"],
+                last_name=user_dict["last_name"],
+                role=user_dict["role"].value,
+                ver=token_version(user_dict["updated_at"]),
             )
+        jwt_token = generate_jwt_token(user_payload)
+        response.set_cookie(
+            key="token",
+            value=jwt_token,
+            httponly=True,
+            samesite="strict",
+            secure=True,
+            expires=3600,
+        )
 
-            if is_password_verified:
-                user_payload = {
-                    "id": str(user_dict["id"]),
-                    "username": user_dict["username"],
-                    "email": user_dict["email"],
-                }
-                jwt_token = generate_jwt_token(user_payload)
-                response.set_cookie(
-                    key="token",
-                    value=jwt_token,
-                    httponly=True,
-                    samesite="strict",
-                    secure=True,
-                    expires=3600,
-                )
+        return {
+            "success": True,
+            "message": "User logged in successfully!",
+            "token": jwt_token,
+        }
+    else:
+        return {
+            "success": False,
+            "message": "Email/Username or Password is incorrect!",
+            "token": None,
+        }
 
-                return {
-                    "success": True,
-                    "message": "User logged in successfully!",
-                    "token": jwt_token,
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": "Email/Username or Password is incorrect!",
-                    "token": None,
-                }
-
-    except (SQLAlchemyError, NoResultFound) as error:
-        raise HTTPException(
-            detail=f"Error during user authentication{error}",
-            status_code=status.HTTP_400_BAD_REQUEST,
-        ) from error
 
+async def _rehash_password(user_dict: dict, plain_password: str) -> None:
+    """
+    Replace a stored hash that uses an outdated bcrypt work factor.
+
+    Failures are logged and ignored so they never fail the login itself.
 
-def get_user_info_by_id(user_id: str, response: Response):
+    Parameters:
+    - user_dict (dict): The user row, including the stored password hash.
+    - plain_password (str): The verified plain text password.
+    """
+    try:
+        new_hash = await password_hasher.hash_password(plain_password)
+        # Only replace the hash that was verified, in case it changed meanwhile
+        stmt = (
+            update(UserModel)
+            .where(
+                UserModel.id == user_dict["id"],
+                UserModel.password == user_dict["password"],
+            )
+            .values(password=new_hash)
+        )
+        await run_in_transaction(execute_statement, stmt)
+    except (HTTPException, SQLAlchemyError):
+        logger.exception("Failed to rehash password on login")
+
+
+async def get_user_info_by_id(user_id: str, response: Response) -> dict:
     """
     Retrieve user information by ID.
 
@@ -148,6 +460,7 @@ def get_user_info_by_id(user_id: str, response: Response):
     dict: User information.
 
     Raises:
+    - HTTPException: 404 if there is no user with this ID.
     - SQLAlchemyError: If there is an error in the database operation.
     """
     try:
@@ -166,14 +479,14 @@ def get_user_info_by_id(user_id: str, response: Response):
             .limit(1)
         )
 
-        with engine.begin() as conn:
-            result = conn.execute(query)
-            user_data = result.fetchone()
-
-            user_dict = dict(zip(result.keys(), user_data))
-            user_dict["id"] = str(user_dict["id"])
+        user_dict = await run_in_transaction(fetch_one_as_dict, query)
+        if user_dict is None:
+            raise HTTPException(
+                detail="User Not Found!", status_code=status.HTTP_404_NOT_FOUND
+            )
+        user_dict["id"] = str(user_dict["id"])
 
-            return {"success": True, "data": user_dict}
+        return {"success": True, "data": user_dict}
 
     except SQLAlchemyError as error:
         response.status_code = status.HTTP_400_BAD_REQUEST
@@ -181,40 +494,63 @@ def get_user_info_by_id(user_id: str, response: Response):
         raise SQLAlchemyError("Error during user retrieval by ID") from error
 
 
-def get_all_users_with_pagination(
-    response: Response, page: int = 1, page_size: int = 10
-):
+def build_users_page_query(
+    page: int, page_size: int, cursor: Optional[str] = None
+) -> Select:
+    """
+    Build the query for one page of users, newest first.
+
+    Only the columns of the users list are selected, so password hashes
+    never leave the database.
+
+    Parameters:
+    - page (int): Page number, used when no cursor is given.
+    - page_size (int): Number of items per page.
+    - cursor (Optional[str]): Cursor of the next page from a previous response.
+
+    Returns:
+    Select: Query returning the users of the page.
+    """
+    return paginate(
+        select(*USER_LIST_COLUMNS).where(UserModel.is_deleted.is_(False)),
+        UserModel.created_at,
+        UserModel.id,
+        page,
+        page_size,
+        cursor,
+    )
+
+
+async def get_all_users_with_pagination(
+    response: Response,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+) -> dict:
     """
-    Retrieve all users with pagination.
+    Retrieve all users with pagination, newest first.
 
     Parameters:
     - response (Response): FastAPI Response object.
-    - page (int): Page number (default: 1).
+    - page (int): Page number (default: 1), ignored when a cursor is given.
     - page_size (int): Number of items per page (default: 10).
+    - cursor (Optional[str]): Cursor of the next page from a previous response.
 
     Returns:
-    dict: Response containing the list of users.
+    dict: Response containing the list of users and the next page cursor.
 
     Raises:
     - NoResultFound: If no users are found.
     - SQLAlchemyError: If there is an error in the database operation.
     """
     try:
-        skip = (page - 1) * page_size
-        query = select(UserModel).where(UserModel.is_deleted == False).offset(skip).limit(page_size)
-
-        with engine.begin() as conn:
-            result = conn.execute(query)
-            users_list = [
-                dict(
-                    (key, str(value)) if key == "id" else (key, value)
-                    for key, value in zip(result.keys(), user)
-                    if key != "password"
-                )
-                for user in result.fetchall()
-            ]
+        query = build_users_page_query(page, page_size, cursor)
 
-            return {"success": True, "data": users_list}
+        users_list, next_cursor = split_page(
+            await run_in_transaction(fetch_all_as_dicts, query), page_size
+        )
+
+        return {"success": True, "data": users_list, "next_cursor": next_cursor}
 
     except NoResultFound:
         response.status_code = status.HTTP_404_NOT_FOUND
@@ -226,7 +562,41 @@ def get_all_users_with_pagination(
         raise SQLAlchemyError("Error during user retrieval with pagination") from error
 
 
-def update_user_with_image(
+USER_EXPORT_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "username",
+    "email",
+    "role",
+    "profile_picture",
+    "is_verified",
+    "created_at",
+    "updated_at",
+)
+
+
+def export_users(export_format: ExportFormatEnum) -> StreamingResponse:
+    """
+    Stream every active user, newest first, as NDJSON or CSV.
+
+    Parameters:
+    - export_format (ExportFormatEnum): The output format.
+
+    Returns:
+    StreamingResponse: The streaming download.
+    """
+    query = (
+        select(*(getattr(UserModel, column) for column in USER_EXPORT_COLUMNS))
+        .where(UserModel.is_deleted.is_(False))
+        .order_by(UserModel.created_at.desc(), UserModel.id.desc())
+    )
+    return export_response(
+        stream_in_batches(query), export_format, USER_EXPORT_COLUMNS, "users"
+    )
+
+
+async def update_user_with_image(
     response: Response,
     user_info_extended: dict,
     file: Annotated[UploadFile, File()],
@@ -245,6 +615,7 @@ def update_user_with_image(
     IntegrityError: If there is an integrity violation (e.g., unique constraint).
     SQLAlchemyError: If there is an error in the database operation.
     """
+    picture_path = None
     try:
         payload = {}
         for key, val in user_info_extended.items():
@@ -253,6 +624,12 @@ def update_user_with_image(
                     payload[key] = val.lower()
                 else:
                     payload[key] = val
+
+        # Stored first, so the user never points to a missing picture
+        if file:
+            picture_path = await run_in_threadpool(store_profile_picture, file)
+            payload["profile_picture"] = "/" + picture_path
+
         stmt = (
             update(UserModel)
             .where(UserModel.id == payload.get("id"))
@@ -261,13 +638,10 @@ def update_user_with_image(
                 updated_at=datetime.utcnow().replace(tzinfo=timezone.utc),
             )
         )
-        with engine.begin() as conn:
-            conn.execute(stmt)
+        await run_in_transaction(execute_statement, stmt)
 
-            if file:
-                file_path = os.path.join(UPLOADS_FOLDER_PATH, file.filename)
-                with open(file_path, "wb") as local_file:
-                    local_file.write(file.file.read())
+        invalidate_cached_principal(str(payload["id"]))
+        identifier_filter.add(payload.get("username"), payload.get("email"))
 
         return {
             "success": True,
@@ -276,6 +650,8 @@ def update_user_with_image(
         }
 
     except IntegrityError:
+        if picture_path:
+            await run_in_threadpool(remove_files, [picture_path])
         response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
         return {
             "success": False,
@@ -284,5 +660,7 @@ def update_user_with_image(
         }
 
     except SQLAlchemyError:
+        if picture_path:
+            await run_in_threadpool(remove_files, [picture_path])
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {"success": False, "message": "Failed to update user!", "id": None}
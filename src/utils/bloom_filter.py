@@ -0,0 +1,62 @@
+import math
+import threading
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set of strings.
+
+    Membership tests never give false negatives: if an item is reported as
+    missing, it was never added. They may give false positives at roughly
+    the configured error rate while the filter holds at most `capacity` items.
+
+    Attributes:
+    - capacity (int): Number of items the filter is sized for.
+    - error_rate (float): Target false positive rate at full capacity.
+    - size (int): Number of bits in the filter.
+    - hash_count (int): Number of bit positions set per item.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initializes an empty filter sized for the given capacity and error rate.
+
+        Parameters:
+        - capacity (int): Number of items the filter is sized for.
+        - error_rate (float): Target false positive rate at full capacity.
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = math.ceil(
+            -self.capacity * math.log(error_rate) / (math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def add(self, item: str) -> None:
+        """
+        Add an item to the filter.
+
+        Parameters:
+        - item (str): The item to add.
+        """
+        positions = self._positions(item)
+        # Setting bits is a read-modify-write of a byte, so writers are serialised
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def _positions(self, item: str) -> list:
+        # Double hashing: derive every position from two 64-bit hashes
+        digest = blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a fixed TTL.
+
+    Entries can be tagged with a group (e.g. a user ID) so that every entry
+    belonging to that group can be invalidated at once.
+
+    Attributes:
+    - max_size (int): Maximum number of entries kept; 0 disables the cache.
+    - ttl_seconds (float): Lifetime of an entry in seconds.
+    - hits (int): Number of successful lookups.
+    - misses (int): Number of lookups that found no live entry.
+    - evictions (int): Number of entries dropped to respect max_size.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """
+        Initializes an empty cache.
+
+        Parameters:
+        - max_size (int): Maximum number of entries kept; 0 disables the cache.
+        - ttl_seconds (float): Lifetime of an entry in seconds.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._groups: Dict[Hashable, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for a key, or None if it is missing or expired.
+
+        Parameters:
+        - key (Hashable): The cache key.
+
+        Returns:
+        Optional[Any]: The cached value, if a live entry exists.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, group = entry
+            if expires_at <= time.monotonic():
+                self._remove(key, group)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, group: Optional[Hashable] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries when full.
+
+        Parameters:
+        - key (Hashable): The cache key.
+        - value (Any): The value to cache.
+        - group (Optional[Hashable]): Group used for bulk invalidation.
+        """
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, self._entries[key][2])
+
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, group)
+            if group is not None:
+                self._groups.setdefault(group, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                oldest_key, (_, _, oldest_group) = next(iter(self._entries.items()))
+                self._remove(oldest_key, oldest_group)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a single entry, if present.
+
+        Parameters:
+        - key (Hashable): The cache key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._remove(key, entry[2])
+
+    def invalidate_group(self, group: Hashable) -> None:
+        """
+        Drop every entry tagged with the given group.
+
+        Parameters:
+        - group (Hashable): The group to invalidate.
+        """
+        with self._lock:
+            for key in self._groups.pop(group, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop every entry. Counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._groups.clear()
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+        dict: Size, capacity, hits, misses and evictions.
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: Hashable, group: Optional[Hashable]) -> None:
+        self._entries.pop(key, None)
+        if group is not None:
+            keys = self._groups.get(group)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._groups[group]
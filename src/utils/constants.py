@@ -1,5 +1,10 @@
+from typing import Any, Dict
+
+# Largest page the list endpoints return
+MAX_PAGE_SIZE = 100
+
 # Define API endpoints using a nested dictionary structure
-API_ENDPOINTS = {
+API_ENDPOINTS: Dict[str, Any] = {
     "BASE_URL": "/api/v1",
     "HEALTH": "/health",
     "FILES": "/files",
@@ -10,6 +15,8 @@ API_ENDPOINTS = {
         "WHO_AM_I": "/whoami",
         "USER_BY_ID": "/{user_id}",
         "GET_ALL_USERS": "/",
+        "EXPORT": "/export",
+        "BULK_REGISTER": "/bulk-register",
     },
     "PROJECTS": {
         "BASE_URL": "/projects",
@@ -17,11 +24,29 @@ API_ENDPOINTS = {
         "MEMBERS": "/{project_id}/members",
         "DOCUMENTS": "/{project_id}/documents",
         "GET_ALL_PROJECTS": "/",
+        "EXPORT": "/export",
+        "MEMBER_OF": "/member-of",
+    },
+    "INTERNAL": {
+        "BASE_URL": "/internal",
+        "STATS": "/stats",
+        "METRICS": "/metrics",
+        "PROFILER": "/profiler",
     },
 }
 ALLOWED_IMAGES_TYPE = ["image/jpeg", "image/jpg", "image/png"]
 MAX_FILE_UPLOAD_SIZE = 2097152
 UPLOADS_FOLDER_PATH = "uploads"
+# Content-addressed project documents, stored as objects/ab/cd/<sha256>
+DOCUMENT_OBJECTS_FOLDER_PATH = f"{UPLOADS_FOLDER_PATH}/objects"
+# Profile pictures, stored under a generated name
+PROFILE_PICTURES_FOLDER_PATH = f"{UPLOADS_FOLDER_PATH}/profile_pictures"
+
+# Authentication modes for verify_auth_token
+STATEFUL_AUTH_MODE = "stateful"
+STATELESS_AUTH_MODE = "stateless"
+# Claims signed into stateless tokens to rebuild the principal without the DB
+PRINCIPAL_CLAIMS = ("id", "email", "first_name", "last_name", "username", "role")
 
 # Docstring for API_ENDPOINTS
 """
@@ -59,3 +84,8 @@ Structure:
 """
 
 # Note: The variable name 'API_ENDPOINTS' is kept as is, as it is a common convention to use uppercase for constants.
+
+# Per-row outcomes of a bulk registration
+BULK_CREATED = "created"
+BULK_DUPLICATE = "duplicate"
+BULK_INVALID = "invalid"
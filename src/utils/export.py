@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from datetime import date
+from enum import Enum
+from typing import Any, AsyncIterator, List, Sequence
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+
+from src.schemas.index import ExportFormatEnum
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv",
+}
+
+
+def _to_plain(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+def _to_csv_cell(value: Any) -> Any:
+    value = _to_plain(value)
+    return json.dumps(value) if isinstance(value, list) else value
+
+
+async def encode_batches(
+    batches: AsyncIterator[List[dict]],
+    export_format: ExportFormatEnum,
+    columns: Sequence[str],
+) -> AsyncIterator[bytes]:
+    """
+    Encode batches of rows as NDJSON lines or CSV records.
+
+    Each batch becomes one chunk, so the response is flushed once per
+    database round trip rather than once per row.
+
+    Parameters:
+    - batches (AsyncIterator[List[dict]]): Batches of rows.
+    - export_format (ExportFormatEnum): The output format.
+    - columns (Sequence[str]): Columns to export, in order.
+
+    Returns:
+    AsyncIterator[bytes]: Encoded chunks.
+    """
+    if export_format == ExportFormatEnum.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue().encode("utf-8")
+        async for rows in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                [_to_csv_cell(row[column]) for column in columns] for row in rows
+            )
+            yield buffer.getvalue().encode("utf-8")
+    else:
+        async for rows in batches:
+            yield "".join(
+                json.dumps({column: _to_plain(row[column]) for column in columns})
+                + "\n"
+                for row in rows
+            ).encode("utf-8")
+
+
+def export_response(
+    batches: AsyncIterator[List[dict]],
+    export_format: ExportFormatEnum,
+    columns: Sequence[str],
+    file_name: str,
+) -> StreamingResponse:
+    """
+    Build a streaming download of the given rows.
+
+    Parameters:
+    - batches (AsyncIterator[List[dict]]): Batches of rows.
+    - export_format (ExportFormatEnum): The output format.
+    - columns (Sequence[str]): Columns to export, in order.
+    - file_name (str): Download name without extension.
+
+    Returns:
+    StreamingResponse: The streaming response.
+    """
+    return StreamingResponse(
+        encode_batches(batches, export_format, columns),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{file_name}.{export_format.value}"'
+            )
+        },
+    )
@@ -0,0 +1,318 @@
+import os
+import re
+import secrets
+from email.utils import formatdate, parsedate_to_datetime
+from typing import List, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import HTTPException, Response, status
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+
+from src.utils.constants import DOCUMENT_OBJECTS_FOLDER_PATH, UPLOADS_FOLDER_PATH
+from src.utils.uploads import TEMPORARY_UPLOAD_PREFIX
+
+DOWNLOAD_MEDIA_TYPE = "application/octet-stream"
+# Objects are named by their content, so they never change
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Other uploads can be replaced, so caches revalidate them on every use
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Range requests with more ranges than this are answered with the whole file
+MAX_RANGES = 16
+
+_CONTENT_HASH = re.compile(r"^[0-9a-f]{64}$")
+_BYTE_RANGE = re.compile(r"^(\d*)-(\d*)$")
+
+
+class RangeFileResponse(Response):
+    """
+    206 Partial Content response streaming one or more byte ranges of a
+    file; several ranges are sent as multipart/byteranges.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        ranges: List[Tuple[int, int]],
+        size: int,
+        headers: Mapping[str, str],
+        media_type: str = DOWNLOAD_MEDIA_TYPE,
+    ):
+        """
+        Parameters:
+        - path (str): The file to send.
+        - ranges (List[Tuple[int, int]]): Sorted, non-overlapping, inclusive ranges.
+        - size (int): Size of the file.
+        - headers (Mapping[str, str]): Validator and caching headers.
+        - media_type (str): Content type of the file.
+        """
+        self.path = path
+        self.status_code = status.HTTP_206_PARTIAL_CONTENT
+        self.background = None
+        self.body = b""
+        self.init_headers(headers)
+
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.parts = [(b"", start, end)]
+            self.closing = b""
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+            self.headers["content-type"] = media_type
+        else:
+            boundary = secrets.token_hex(16)
+            self.parts = []
+            for n, (start, end) in enumerate(ranges):
+                header = (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {media_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+                ).encode("latin-1")
+                # Every part but the first starts on a new line
+                separator = b"" if n == 0 else b"\r\n"
+                self.parts.append((separator + header, start, end))
+            self.closing = f"\r\n--{boundary}--\r\n".encode("latin-1")
+            self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(
+            sum(len(header) + end - start + 1 for header, start, end in self.parts)
+            + len(self.closing)
+        )
+
+    async def __call__(  # type: ignore[no-untyped-def]
+        self, scope, receive, send
+    ) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            for header, start, end in self.parts:
+                if header:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": header,
+                            "more_body": True,
+                        }
+                    )
+                await file.seek(start)
+                remaining = end - start + 1
+                while remaining:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        # The file was truncated while being sent
+                        raise RuntimeError(f"File at path {self.path} changed size.")
+                    remaining -= len(chunk)
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+        await send(
+            {"type": "http.response.body", "body": self.closing, "more_body": False}
+        )
+
+
+def resolve_upload_path(file_path: str) -> str:
+    """
+    Resolve a requested path to a file inside the uploads folder.
+
+    Parameters:
+    - file_path (str): The path as requested, e.g. "uploads/objects/ab/cd/abcd...".
+
+    Returns:
+    str: The real path of the file.
+
+    Raises:
+    - HTTPException: If the path leaves the uploads folder or is not a file.
+    """
+    uploads_folder = os.path.realpath(UPLOADS_FOLDER_PATH)
+    path = os.path.realpath(file_path)
+    if (
+        os.path.commonpath([uploads_folder, path]) != uploads_folder
+        or os.path.basename(path).startswith(TEMPORARY_UPLOAD_PREFIX)
+        or not os.path.isfile(path)
+    ):
+        raise HTTPException(
+            detail="File Not Found!", status_code=status.HTTP_404_NOT_FOUND
+        )
+    return path
+
+
+class UploadsStaticFiles(StaticFiles):
+    """
+    Static files of the uploads folder, such as profile pictures.
+
+    Documents in the content-addressed store are only served by the files
+    endpoint, which checks their paths and answers conditional and Range
+    requests, so the store and temporary files are not found here.
+    """
+
+    def lookup_path(self, path: str) -> Tuple[str, Optional[os.stat_result]]:
+        full_path, stat_result = super().lookup_path(path)
+        objects_folder = os.path.realpath(DOCUMENT_OBJECTS_FOLDER_PATH)
+        if full_path and (
+            os.path.commonpath([objects_folder, full_path]) == objects_folder
+            or os.path.basename(full_path).startswith(TEMPORARY_UPLOAD_PREFIX)
+        ):
+            return "", None
+        return full_path, stat_result
+
+
+def parse_range_header(value: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse a Range header into sorted, merged, inclusive byte ranges.
+
+    Parameters:
+    - value (str): The Range header, e.g. "bytes=0-99,-500".
+    - size (int): Size of the file.
+
+    Returns:
+    Optional[List[Tuple[int, int]]]: The satisfiable ranges, an empty list
+    if none is, or None if the header is invalid or asks for too many
+    ranges, in which case the whole file is sent.
+    """
+    unit, _, range_set = value.partition("=")
+    if unit.strip().lower() != "bytes" or not range_set.strip():
+        return None
+    specs = [spec.strip() for spec in range_set.split(",")]
+    if len(specs) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for spec in specs:
+        match = _BYTE_RANGE.match(spec)
+        if match is None or match.groups() == ("", ""):
+            return None
+        first, last = match.groups()
+        if first == "":
+            # Suffix range: the last N bytes, of which an empty file has none
+            if int(last) == 0 or size == 0:
+                continue
+            ranges.append((max(size - int(last), 0), size - 1))
+            continue
+        start = int(first)
+        end = size - 1 if last == "" else min(int(last), size - 1)
+        if last != "" and int(last) < start:
+            return None
+        if start < size:
+            ranges.append((start, end))
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == etag
+        for candidate in (part.strip() for part in header.split(","))
+    )
+
+
+def _not_modified_since(header: str, modified_at: float) -> bool:
+    try:
+        return int(modified_at) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def document_file_response(
+    request_headers: Mapping[str, str], file_path: str, file_name: Optional[str] = None
+) -> Response:
+    """
+    Build the response for a document download.
+
+    Content-addressed objects get their hash as a strong ETag and are cached
+    for a year; other uploads get an ETag derived from their inode,
+    modification time and size and are revalidated on every use. Conditional
+    requests (If-None-Match, If-Modified-Since) are answered with 304 Not
+    Modified, and Range requests (also guarded by If-Range) with 206 Partial
+    Content or 416 Range Not Satisfiable. Blocking; run it in the threadpool.
+
+    Parameters:
+    - request_headers (Mapping[str, str]): The request headers.
+    - file_path (str): The requested path inside the uploads folder.
+    - file_name (Optional[str]): Download name, by default the file's name
+      without its upload timestamp.
+
+    Returns:
+    Response: 200, 206, 304 or 416 response.
+
+    Raises:
+    - HTTPException: If the file does not exist or is outside the uploads folder.
+    """
+    path = resolve_upload_path(file_path)
+    stat_result = os.stat(path)
+
+    name = os.path.basename(path)
+    objects_folder = os.path.realpath(DOCUMENT_OBJECTS_FOLDER_PATH)
+    if (
+        _CONTENT_HASH.match(name)
+        and os.path.commonpath([objects_folder, path]) == objects_folder
+    ):
+        etag, cache_control = f'"{name}"', IMMUTABLE_CACHE_CONTROL
+    else:
+        etag = (
+            f'"{stat_result.st_ino:x}-{stat_result.st_mtime_ns:x}-'
+            f'{stat_result.st_size:x}"'
+        )
+        cache_control = REVALIDATE_CACHE_CONTROL
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    headers = {
+        "etag": etag,
+        "last-modified": last_modified,
+        "cache-control": cache_control,
+        "accept-ranges": "bytes",
+    }
+
+    if_none_match = request_headers.get("if-none-match")
+    if_modified_since = request_headers.get("if-modified-since")
+    if (if_none_match is not None and _etag_matches(if_none_match, etag)) or (
+        if_none_match is None
+        and if_modified_since is not None
+        and _not_modified_since(if_modified_since, stat_result.st_mtime)
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    download_name = os.path.basename(file_name or name.split("_", 1)[-1])
+    quoted_name = quote(download_name)
+    headers["content-disposition"] = (
+        f'attachment; filename="{download_name}"'
+        if quoted_name == download_name
+        else f"attachment; filename*=utf-8''{quoted_name}"
+    )
+
+    range_header = request_headers.get("range")
+    if_range = request_headers.get("if-range")
+    # A Range whose If-Range no longer matches gets the whole, current file
+    if range_header is not None and (
+        if_range is None or if_range.strip() in (etag, last_modified)
+    ):
+        ranges = parse_range_header(range_header, stat_result.st_size)
+        if ranges == []:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "content-range": f"bytes */{stat_result.st_size}"},
+            )
+        if ranges is not None:
+            return RangeFileResponse(path, ranges, stat_result.st_size, headers)
+
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type=DOWNLOAD_MEDIA_TYPE,
+        stat_result=stat_result,
+    )
@@ -1,12 +1,13 @@
 import os
+import time
 import uuid
-from datetime import datetime, timedelta
-from typing import Annotated
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, List, Optional
 
 import bcrypt
 from dotenv import load_dotenv
 from fastapi import HTTPException, Path, status
-from jwt import DecodeError, ExpiredSignatureError, decode, encode
+from jwt import InvalidTokenError, decode, encode
 
 from src.utils.exceptions import MissingEnvironmentVariable
 
@@ -34,21 +35,89 @@ def get_required_env_variable(name: str) -> str:
     return value
 
 
-def hash_password(password: str) -> str:
+def get_env_variable(name: str, default: str) -> str:
+    """
+    Get the value of an optional environment variable.
+
+    Parameters:
+    - name (str): The name of the environment variable.
+    - default (str): The value to use when the variable is missing or empty.
+
+    Returns:
+    str: The value of the environment variable, or the default.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value
+
+
+# bcrypt work factor for new hashes, see src/scripts/calibrate_bcrypt.py
+BCRYPT_ROUNDS = int(get_env_variable("BCRYPT_ROUNDS", "12"))
+# Calibration never picks a work factor below this, however slow the host
+MIN_BCRYPT_ROUNDS = 10
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Hash the given password using bcrypt.
 
     Parameters:
     - password (str): The password to be hashed.
+    - rounds (Optional[int]): bcrypt work factor (default: BCRYPT_ROUNDS).
 
     Returns:
     str: The hashed password.
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
     hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed_password.decode("utf-8")
 
 
+def get_password_hash_rounds(hashed_password: str) -> int:
+    """
+    Read the work factor a bcrypt hash was created with.
+
+    Parameters:
+    - hashed_password (str): A bcrypt hash, e.g. "$2b$12$...".
+
+    Returns:
+    int: The bcrypt work factor.
+    """
+    return int(hashed_password.split("$")[2])
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float, min_rounds: int = MIN_BCRYPT_ROUNDS, max_rounds: int = 16
+) -> int:
+    """
+    Find the bcrypt work factor whose hash time is closest to a target.
+
+    Each extra round doubles the cost, so rounds are timed upwards from
+    min_rounds until a hash takes longer than the target.
+
+    Parameters:
+    - target_ms (float): Target latency of a single hash in milliseconds.
+    - min_rounds (int): Lowest work factor considered.
+    - max_rounds (int): Highest work factor considered.
+
+    Returns:
+    int: The calibrated work factor.
+    """
+    best_rounds, best_distance = min_rounds, float("inf")
+    for rounds in range(min_rounds, max_rounds + 1):
+        started_at = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds=rounds))
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+        distance = abs(elapsed_ms - target_ms)
+        if distance < best_distance:
+            best_rounds, best_distance = rounds, distance
+        if elapsed_ms > target_ms:
+            break
+    return best_rounds
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify if the provided plain password matches the hashed password.
@@ -66,37 +135,41 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def generate_jwt_token(
-    payload,
-    secret_key=get_required_env_variable("JWT_SECRET_KEY"),
-    expiration_time_hours=1,
-    algorithm="HS256",
+    payload: dict,
+    secret_key: Optional[str] = None,
+    expiration_time_hours: int = 1,
+    algorithm: str = "HS256",
 ) -> str:
     """
     Generate a JWT token with the provided payload.
 
     Parameters:
-    - payload: The data to be included in the token.
-    - secret_key (str): The secret key for signing the token.
+    - payload (dict): The data to be included in the token.
+    - secret_key (Optional[str]): The secret key for signing the token,
+      JWT_SECRET_KEY by default.
     - expiration_time_hours (int): Token expiration time in hours.
     - algorithm (str): The hashing algorithm for the token.
 
     Returns:
     str: The generated JWT token.
     """
-    expiration_time = datetime.utcnow() + timedelta(hours=expiration_time_hours)
-    payload["exp"] = expiration_time
+    issued_at = datetime.utcnow()
+    payload["iat"] = issued_at
+    payload["exp"] = issued_at + timedelta(hours=expiration_time_hours)
+    secret_key = secret_key or get_required_env_variable("JWT_SECRET_KEY")
     return encode(payload, secret_key, algorithm=algorithm)
 
 
 def decode_jwt_token(
-    token, secret_key=get_required_env_variable("JWT_SECRET_KEY"), algorithms=["HS256"]
+    token: str, secret_key: Optional[str] = None, algorithms: List[str] = ["HS256"]
 ) -> dict:
     """
     Decode a JWT token.
 
     Parameters:
     - token (str): The JWT token to be decoded.
-    - secret_key (str): The secret key for decoding the token.
+    - secret_key (Optional[str]): The secret key for decoding the token,
+      JWT_SECRET_KEY by default.
     - algorithms (list): The list of allowed algorithms for decoding.
 
     Returns:
@@ -105,16 +178,34 @@ def decode_jwt_token(
     Raises:
     HTTPException: If the token is invalid or expired.
     """
+    secret_key = secret_key or get_required_env_variable("JWT_SECRET_KEY")
     try:
         payload = decode(token, secret_key, algorithms=algorithms)
         return payload
-    except (DecodeError, ExpiredSignatureError):
+    except InvalidTokenError:
         raise HTTPException(
             detail="Invalid Token!", status_code=status.HTTP_401_UNAUTHORIZED
         )
 
 
-def is_valid_uuid(value: Annotated[str, Path()]):
+def token_version(updated_at: datetime) -> int:
+    """
+    Return the version stamp signed into stateless tokens for a user.
+
+    The stamp is the user's updated_at in microseconds since the epoch, so it
+    does not depend on the UTC offset the database driver or session returns.
+
+    Parameters:
+    - updated_at (datetime): The user's timezone-aware updated_at.
+
+    Returns:
+    int: The version stamp.
+    """
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (updated_at - epoch) // timedelta(microseconds=1)
+
+
+def is_valid_uuid(value: Annotated[str, Path()]) -> bool:
     """
     Check if the given value is a valid UUID.
 
@@ -0,0 +1,50 @@
+from typing import Any, Type
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class ValidatedJSONResponse(Response):
+    """
+    JSON response whose content is validated and encoded by pydantic in a
+    single pass.
+
+    Returning a plain dict from a route with a response_model makes FastAPI
+    validate it, convert the result back to Python objects and then encode
+    those with the JSON library. This response validates the content once
+    with a precompiled TypeAdapter and encodes it straight to bytes, which
+    produces the same JSON as the default path at a fraction of the cost for
+    large pages. Routes keep their response_model for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, adapter: TypeAdapter, content: Any, status_code: int = 200):
+        """
+        Parameters:
+        - adapter (TypeAdapter): Adapter of the route's response model.
+        - content (Any): The content returned by the service.
+        - status_code (int): The response status code (default: 200).
+        """
+        self.adapter = adapter
+        super().__init__(content=content, status_code=status_code)
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(
+            self.adapter.validate_python(content), by_alias=True
+        )
+
+
+def response_adapter(model: Type) -> TypeAdapter:
+    """
+    Build the TypeAdapter used to return a response model with
+    ValidatedJSONResponse. Create adapters once, at import time, since
+    building one compiles the model's validator and serializer.
+
+    Parameters:
+    - model (Type): The response model.
+
+    Returns:
+    TypeAdapter: The adapter of the model.
+    """
+    return TypeAdapter(model)
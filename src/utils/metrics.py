@@ -0,0 +1,169 @@
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence
+
+# Upper bounds (in seconds) of the default latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _ThreadShards:
+    """
+    Per-thread storage for metric values.
+
+    Each thread writes to its own shard, so updates never take a lock;
+    readers sum the shards of every thread that has written so far.
+    """
+
+    def __init__(self, factory: Callable[[], list]):
+        self._factory = factory
+        self._local = threading.local()
+        self._shards: List[list] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> list:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._factory()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def all(self) -> List[list]:
+        with self._lock:
+            return list(self._shards)
+
+
+class Counter:
+    """
+    Monotonically increasing counter.
+    """
+
+    def __init__(self) -> None:
+        self._shards = _ThreadShards(lambda: [0.0])
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.get()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return sum(shard[0] for shard in self._shards.all())
+
+
+class Gauge:
+    """
+    Value that can go up and down, e.g. the number of in-flight tasks.
+    """
+
+    def __init__(self) -> None:
+        self._shards = _ThreadShards(lambda: [0.0])
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.get()[0] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._shards.get()[0] -= amount
+
+    @property
+    def value(self) -> float:
+        return sum(shard[0] for shard in self._shards.all())
+
+
+class Histogram:
+    """
+    Distribution of observed values over fixed buckets.
+
+    Attributes:
+    - buckets (Sequence[float]): Sorted upper bounds of the buckets.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        size = len(self.buckets) + 1
+        # Shard layout: [per-bucket counts (last one is +Inf), sum of values]
+        self._shards = _ThreadShards(lambda: [[0] * size, 0.0])
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.get()
+        shard[0][bisect_left(self.buckets, value)] += 1
+        shard[1] += value
+
+    def snapshot(self) -> dict:
+        """
+        Return the cumulative bucket counts, the count and the sum.
+
+        Returns:
+        dict: {"buckets": [(upper_bound, cumulative_count), ...], "count", "sum"}
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for shard in self._shards.all():
+            for index, count in enumerate(shard[0]):
+                counts[index] += count
+            total += shard[1]
+
+        cumulative = []
+        running = 0
+        for upper_bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative.append((upper_bound, running))
+
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    """
+    Render labels in the Prometheus text format, e.g. {method="GET"}.
+    """
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape_label_value(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    """
+    Render a sample value in the Prometheus text format.
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+def histogram_samples(name: str, labels: Dict[str, str], snapshot: dict) -> List[str]:
+    """
+    Render a Histogram snapshot as Prometheus _bucket, _sum and _count samples.
+
+    Parameters:
+    - name (str): The metric name, without suffix.
+    - labels (Dict[str, str]): Labels shared by every sample.
+    - snapshot (dict): The result of Histogram.snapshot().
+
+    Returns:
+    List[str]: One line per sample.
+    """
+    lines = [
+        f"{name}_bucket{format_labels({**labels, 'le': format_value(upper_bound)})} "
+        f"{count}"
+        for upper_bound, count in snapshot["buckets"]
+    ]
+    lines.append(f"{name}_sum{format_labels(labels)} {format_value(snapshot['sum'])}")
+    lines.append(f"{name}_count{format_labels(labels)} {snapshot['count']}")
+    return lines
@@ -0,0 +1,112 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, literal, tuple_
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID | str) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Parameters:
+    - created_at (datetime): Creation time of the row.
+    - row_id (uuid.UUID | str): ID of the row.
+
+    Returns:
+    str: URL-safe cursor string.
+    """
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Parameters:
+    - cursor (str): The cursor sent by the client.
+
+    Returns:
+    Tuple[datetime, uuid.UUID]: Creation time and ID of the last row seen.
+
+    Raises:
+    - HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            detail="Invalid Cursor!", status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+def paginate(
+    query: Select,
+    created_at_column: Any,
+    id_column: Any,
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Order a query newest first and restrict it to one page.
+
+    With a cursor, the page starts right after the row the cursor points to
+    (keyset pagination), which an index on (created_at, id) serves without
+    scanning the skipped rows. Without one, `page` is applied as an offset.
+    One extra row is fetched so split_page can tell whether a next page exists.
+
+    Parameters:
+    - query (Select): The query to paginate.
+    - created_at_column (Any): Creation time column of the model.
+    - id_column (Any): Primary key column of the model.
+    - page (int): Page number, used when no cursor is given.
+    - page_size (int): Number of items per page.
+    - cursor (Optional[str]): Cursor returned with the previous page.
+
+    Returns:
+    Select: The paginated query.
+    """
+    query = query.order_by(created_at_column.desc(), id_column.desc()).limit(
+        page_size + 1
+    )
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        return query.where(
+            tuple_(created_at_column, id_column)
+            < tuple_(literal(created_at), literal(row_id))
+        )
+    return query.offset((page - 1) * page_size)
+
+
+def split_page(
+    rows: List[dict],
+    page_size: int,
+    created_at_key: str = "created_at",
+    id_key: str = "id",
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Trim the extra row fetched by paginate and build the next cursor.
+
+    Parameters:
+    - rows (List[dict]): Rows holding the sort key of the page.
+    - page_size (int): Number of items per page.
+    - created_at_key (str): Key of the creation time the page is sorted by.
+    - id_key (str): Key of the ID the page is sorted by.
+
+    Returns:
+    Tuple[List[dict], Optional[str]]: The page and the cursor of the next
+    page, None on the last page.
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last_row = rows[-1]
+    return rows, encode_cursor(last_row[created_at_key], last_row[id_key])
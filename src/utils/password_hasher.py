@@ -0,0 +1,219 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from fastapi import HTTPException, status
+
+from src.utils.index import (
+    BCRYPT_ROUNDS,
+    get_env_variable,
+    get_password_hash_rounds,
+    hash_password,
+    verify_password,
+)
+from src.utils.metrics import Counter, Gauge, Histogram
+
+PASSWORD_HASHER_WORKERS = int(
+    get_env_variable("PASSWORD_HASHER_WORKERS", str(os.cpu_count() or 1))
+)
+PASSWORD_HASHER_MAX_QUEUE = int(get_env_variable("PASSWORD_HASHER_MAX_QUEUE", "64"))
+# Passwords hashed per task by hash_many; small chunks keep workers available
+# to logins while a bulk job runs
+PASSWORD_HASHER_CHUNK_SIZE = int(get_env_variable("PASSWORD_HASHER_CHUNK_SIZE", "8"))
+
+
+def _hash_passwords(passwords: List[str], rounds: int) -> List[str]:
+    return [hash_password(password, rounds) for password in passwords]
+
+
+def _timed_call(func: Callable, *args: Any) -> tuple:
+    """
+    Run a function inside a worker process and report when it started.
+
+    Returns:
+    tuple: The function result and the wall-clock start time.
+    """
+    started_at = time.time()
+    return func(*args), started_at
+
+
+class PasswordHasherPool:
+    """
+    Dedicated process pool for bcrypt hashing and verification.
+
+    bcrypt is CPU-bound, so running it on FastAPI's shared threadpool lets a
+    login burst starve every other endpoint. Work is instead sent to a fixed
+    number of worker processes behind a bounded queue; once the queue is full
+    new requests are rejected immediately with 503 instead of piling up.
+
+    Attributes:
+    - workers (int): Number of worker processes.
+    - max_queue (int): Number of tasks allowed to wait for a free worker.
+    - rounds (int): bcrypt work factor used for new hashes.
+    - in_flight (Gauge): Tasks submitted and not yet finished.
+    - wait_time (Histogram): Seconds a task waited before a worker picked it up.
+    - rejected (Counter): Tasks rejected because the queue was full.
+    """
+
+    def __init__(self, workers: int, max_queue: int, rounds: int):
+        """
+        Initializes the pool. Worker processes are started on first use.
+
+        Parameters:
+        - workers (int): Number of worker processes.
+        - max_queue (int): Number of tasks allowed to wait for a free worker.
+        - rounds (int): bcrypt work factor used for new hashes.
+        """
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.rounds = rounds
+        self.in_flight = Gauge()
+        self.wait_time = Histogram()
+        self.rejected = Counter()
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def hash_password(self, password: str) -> str:
+        """
+        Hash a password on the pool.
+
+        Parameters:
+        - password (str): The password to be hashed.
+
+        Returns:
+        str: The hashed password.
+
+        Raises:
+        - HTTPException: 503 if the queue is full.
+        """
+        return await self._submit(hash_password, password, self.rounds)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash many passwords in parallel across the worker processes.
+
+        Passwords are hashed in chunks of PASSWORD_HASHER_CHUNK_SIZE, with at
+        most one chunk per worker at a time, so requests arriving meanwhile
+        wait for one chunk rather than the whole batch.
+
+        Parameters:
+        - passwords (List[str]): The passwords to be hashed.
+
+        Returns:
+        List[str]: The hashed passwords, in the same order.
+
+        Raises:
+        - HTTPException: 503 if the queue is full.
+        """
+        chunk_size = max(1, PASSWORD_HASHER_CHUNK_SIZE)
+        chunks = []
+        for start in range(0, len(passwords), chunk_size):
+            stop = start + chunk_size
+            chunks.append(passwords[start:stop])
+        concurrency = asyncio.Semaphore(self.workers)
+
+        async def hash_chunk(chunk: List[str]) -> List[str]:
+            async with concurrency:
+                return await self._submit(_hash_passwords, chunk, self.rounds)
+
+        hashed_chunks = await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks))
+        return [hashed for chunk in hashed_chunks for hashed in chunk]
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a bcrypt hash on the pool.
+
+        Parameters:
+        - plain_password (str): The plain text password.
+        - hashed_password (str): The hashed password to be compared.
+
+        Returns:
+        bool: True if the passwords match, False otherwise.
+
+        Raises:
+        - HTTPException: 503 if the queue is full.
+        """
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Check whether a stored hash was created with a lower work factor.
+
+        Hashes are only ever upgraded, so lowering BCRYPT_ROUNDS never weakens
+        existing hashes.
+
+        Parameters:
+        - hashed_password (str): The stored bcrypt hash.
+
+        Returns:
+        bool: True if the hash should be replaced with one using self.rounds.
+        """
+        return get_password_hash_rounds(hashed_password) < self.rounds
+
+    def stats(self) -> dict:
+        """
+        Return the pool counters.
+
+        Returns:
+        dict: Worker count, queue limits, current depth, rejections and wait times.
+        """
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "rounds": self.rounds,
+            "in_flight": int(self.in_flight.value),
+            "queue_depth": max(0, self._pending - self.workers),
+            "rejected": int(self.rejected.value),
+            "wait_time_seconds": self.wait_time.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes, if they were started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _submit(self, func: Callable, *args: Any) -> Any:
+        # Only the event loop thread touches _pending, so no lock is needed
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected.inc()
+            raise HTTPException(
+                detail="Server is busy, please try again shortly!",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        self.in_flight.inc()
+        submitted_at = time.time()
+        try:
+            result, started_at = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _timed_call, func, *args
+            )
+        finally:
+            self._pending -= 1
+            self.in_flight.dec()
+
+        self.wait_time.observe(max(0.0, started_at - submitted_at))
+        return result
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # "spawn" avoids forking a process that already runs threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+
+password_hasher = PasswordHasherPool(
+    workers=PASSWORD_HASHER_WORKERS,
+    max_queue=PASSWORD_HASHER_MAX_QUEUE,
+    rounds=BCRYPT_ROUNDS,
+)
@@ -0,0 +1,324 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import anyio
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import ASGIApp
+
+from src.utils.index import get_env_variable
+
+logger = logging.getLogger(__name__)
+
+# The middleware is only installed when enabled, so a disabled profiler
+# costs nothing per request.
+PROFILER_ENABLED = get_env_variable("PROFILER_ENABLED", "false").lower() == "true"
+# Requests carrying this value in the X-Profile header are profiled
+PROFILER_TOKEN = get_env_variable("PROFILER_TOKEN", "")
+# Fraction of all requests profiled without the header, 0 to disable
+PROFILER_SAMPLE_RATE = float(get_env_variable("PROFILER_SAMPLE_RATE", "0"))
+# "sample" writes collapsed stacks, "cprofile" writes pstats
+PROFILER_MODE = get_env_variable("PROFILER_MODE", "sample").lower()
+PROFILER_INTERVAL_MS = float(get_env_variable("PROFILER_INTERVAL_MS", "1"))
+PROFILER_OUTPUT_DIR = get_env_variable("PROFILER_OUTPUT_DIR", "profiles")
+
+SAMPLE_MODE = "sample"
+CPROFILE_MODE = "cprofile"
+PROFILE_HEADER = b"x-profile"
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+_UNSAFE_FILENAME_CHARACTERS = re.compile(r"[^A-Za-z0-9]+")
+
+
+class StackSampler:
+    """
+    Statistical profiler that periodically samples thread stacks.
+
+    Every interval, the stack of the thread serving the request is recorded,
+    along with the stacks of other threads currently running application
+    code (e.g. database calls in the threadpool). Counts are kept per
+    collapsed stack, the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval_seconds: float, thread_id: int):
+        """
+        Initializes a sampler that has not started yet.
+
+        Parameters:
+        - interval_seconds (float): Time between two samples.
+        - thread_id (int): The thread serving the profiled request.
+        """
+        self.interval_seconds = interval_seconds
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """
+        Return the samples as collapsed stacks, one "frame;frame count" per line.
+        """
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.interval_seconds):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(frame)
+                if thread_id != self.thread_id and not any(
+                    _is_application_frame(name) for name in stack
+                ):
+                    # Idle pool threads and unrelated background threads
+                    continue
+                thread_name = names.get(thread_id)
+                if thread_name is None:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                    thread_name = names.get(thread_id, str(thread_id))
+                self.stacks[";".join([thread_name, *reversed(stack)])] += 1
+
+    @staticmethod
+    def _stack(frame) -> List[str]:  # type: ignore[no-untyped-def]
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            filename = code.co_filename
+            if filename.startswith(PROJECT_ROOT):
+                filename = os.path.relpath(filename, PROJECT_ROOT)
+            stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return stack
+
+
+def _is_application_frame(name: str) -> bool:
+    # Frames are named "function (path:line)"; application paths are relative,
+    # while the standard library, packages and "<string>" code are not
+    location = name.rsplit(" (", 1)[-1]
+    return not location.startswith((os.sep, "<")) and "site-packages" not in location
+
+
+class ProfileSession:
+    """
+    One profiled request.
+    """
+
+    def __init__(self, profiler: "RequestProfiler", label: str):
+        self.profiler = profiler
+        self.label = label
+        self.profile_id = (
+            f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-"
+            f"{_UNSAFE_FILENAME_CHARACTERS.sub('_', label).strip('_')[:80]}-"
+            f"{secrets.token_hex(3)}"
+        )
+        self._sampler: Optional[StackSampler] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._started_at = 0.0
+        self._elapsed = 0.0
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        if self.profiler.mode == CPROFILE_MODE:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        else:
+            self._sampler = StackSampler(
+                self.profiler.interval_seconds, threading.get_ident()
+            )
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """
+        Stop collecting. Called on the thread that started the session, since
+        cProfile only stops profiling the thread that disables it.
+        """
+        self._elapsed = time.perf_counter() - self._started_at
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        elif self._sampler is not None:
+            self._sampler.stop()
+
+    def finish(self) -> Optional[str]:
+        """
+        Write the profile of a stopped session to the output directory.
+
+        Blocking; run it in the threadpool.
+
+        Returns:
+        Optional[str]: Path of the written profile, None if writing failed.
+        """
+        try:
+            os.makedirs(self.profiler.output_dir, exist_ok=True)
+            if self._cprofile is not None:
+                path = os.path.join(
+                    self.profiler.output_dir, f"{self.profile_id}.pstats"
+                )
+                self._cprofile.dump_stats(path)
+            elif self._sampler is not None:
+                self._sampler.join()
+                path = os.path.join(
+                    self.profiler.output_dir, f"{self.profile_id}.collapsed"
+                )
+                with open(path, "w") as file:
+                    file.write(self._sampler.collapsed())
+            else:
+                # The session was never started, there is nothing to write
+                return None
+        except OSError:
+            logger.exception(f"Failed to write the profile of {self.label}")
+            return None
+        finally:
+            self.profiler.release()
+        logger.info(
+            f"Profiled {self.label} ({self._elapsed * 1000:.1f} ms) into {path}"
+        )
+        return path
+
+
+class RequestProfiler:
+    """
+    Decides which requests are profiled and profiles one at a time.
+
+    Attributes:
+    - token (str): Value of the X-Profile header that requests a profile.
+    - sample_rate (float): Fraction of requests profiled without the header.
+    - mode (str): "sample" (collapsed stacks) or "cprofile" (pstats).
+    - interval_seconds (float): Sampling interval of the "sample" mode.
+    - output_dir (str): Directory the profiles are written to.
+    """
+
+    def __init__(
+        self,
+        token: str = PROFILER_TOKEN,
+        sample_rate: float = PROFILER_SAMPLE_RATE,
+        mode: str = PROFILER_MODE,
+        interval_seconds: float = PROFILER_INTERVAL_MS / 1000,
+        output_dir: str = PROFILER_OUTPUT_DIR,
+    ):
+        self.token = token
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.interval_seconds = interval_seconds
+        self.output_dir = output_dir
+        self.recent: List[str] = []
+        self._busy = threading.Lock()
+
+    def should_profile(self, headers: List[tuple]) -> bool:
+        """
+        Check whether a request asked for, or was sampled for, profiling.
+
+        Parameters:
+        - headers (List[tuple]): The raw ASGI request headers.
+        """
+        if self.token:
+            for name, value in headers:
+                if name == PROFILE_HEADER:
+                    return secrets.compare_digest(value, self.token.encode())
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def begin(self, label: str) -> Optional[ProfileSession]:
+        """
+        Start profiling a request, unless another profile is running.
+
+        Both profilers observe whole threads, so overlapping profiles would
+        mix their samples.
+        """
+        if not self._busy.acquire(blocking=False):
+            return None
+        session = ProfileSession(self, label)
+        try:
+            session.start()
+        except Exception:
+            self._busy.release()
+            raise
+        return session
+
+    def release(self) -> None:
+        self._busy.release()
+
+    def record(self, path: str) -> None:
+        self.recent = [path, *self.recent[:19]]
+
+    def settings(self) -> dict:
+        return {
+            "enabled": PROFILER_ENABLED,
+            "header_enabled": bool(self.token),
+            "sample_rate": self.sample_rate,
+            "mode": self.mode,
+            "interval_ms": self.interval_seconds * 1000,
+            "output_dir": self.output_dir,
+            "recent_profiles": self.recent,
+        }
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware running selected requests under the request profiler.
+
+    Profiled responses carry an X-Profile-Id header naming the profile file.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):  # type: ignore[no-untyped-def]
+        if scope["type"] != "http" or not self.profiler.should_profile(
+            scope["headers"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        session = self.profiler.begin(f"{scope['method']} {scope['path']}")
+        if session is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_profile_id(message) -> None:  # type: ignore[no-untyped-def]
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", session.profile_id.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session.stop()
+            # Writing the profile must not block the event loop, and must
+            # happen even if the request was cancelled, to free the profiler
+            with anyio.CancelScope(shield=True):
+                path = await run_in_threadpool(session.finish)
+            if path is not None:
+                self.profiler.record(path)
+
+
+request_profiler = RequestProfiler()
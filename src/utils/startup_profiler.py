@@ -0,0 +1,234 @@
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    # Only for annotations: nothing else is imported before the clock starts
+    from starlette.types import ASGIApp
+
+logger = logging.getLogger(__name__)
+
+# The profiler is imported before anything else, so it loads the .env file
+# itself rather than through src.utils.index, which would import the
+# application's dependencies before the clock starts.
+load_dotenv(dotenv_path="src/config/env-files/.env.local")
+STARTUP_PROFILE_ENABLED = os.environ.get("STARTUP_PROFILE", "false").lower() == "true"
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "0") or 0)
+STARTUP_PROFILE_TOP_MODULES = 25
+
+
+class StartupProfiler:
+    """
+    Measures how long a worker takes to start.
+
+    Times are relative to `start()`, which main.py calls before importing the
+    application. Per-module import times are only collected when
+    STARTUP_PROFILE is enabled, because they require hooking the import system.
+
+    Attributes:
+    - budget_seconds (float): Time-to-first-request budget, 0 to disable.
+    - module_times (Dict[str, tuple]): Module name to (total, self) import seconds.
+    """
+
+    def __init__(self, budget_seconds: float = 0.0):
+        """
+        Initializes a profiler that has not started yet.
+
+        Parameters:
+        - budget_seconds (float): Time-to-first-request budget, 0 to disable.
+        """
+        self.budget_seconds = budget_seconds
+        self.module_times: Dict[str, tuple] = {}
+        self._started_at: Optional[float] = None
+        self._ready_at: Optional[float] = None
+        self._first_request_at: Optional[float] = None
+        self._finder: Optional[_ImportTimingFinder] = None
+        self._stack = threading.local()
+
+    def start(self, track_imports: bool = STARTUP_PROFILE_ENABLED) -> None:
+        """
+        Start the clock and, optionally, per-module import timing.
+
+        Parameters:
+        - track_imports (bool): Hook the import system to time every module.
+        """
+        if self._started_at is not None:
+            return
+        self._started_at = time.perf_counter()
+        if track_imports:
+            self._finder = _ImportTimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def mark_ready(self) -> None:
+        """
+        Record that application startup finished and stop timing imports.
+        """
+        if self._started_at is None or self._ready_at is not None:
+            return
+        self._ready_at = time.perf_counter()
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def mark_first_request(self) -> None:
+        """
+        Record the first request, log the startup report and check the budget.
+        """
+        if self._started_at is None or self._first_request_at is not None:
+            return
+        self._first_request_at = time.perf_counter()
+
+        report = self.report()
+        logger.info(
+            f"Startup: ready in {report['time_to_ready_seconds']}s, "
+            f"first request after {report['time_to_first_request_seconds']}s"
+        )
+        for entry in report["slowest_imports"]:
+            logger.info(
+                f"Import {entry['module']}: {entry['total_seconds']}s "
+                f"({entry['self_seconds']}s self)"
+            )
+        if self.over_budget():
+            logger.warning(
+                f"Time to first request {report['time_to_first_request_seconds']}s "
+                f"exceeds the startup budget of {self.budget_seconds}s"
+            )
+
+    @property
+    def time_to_ready(self) -> Optional[float]:
+        return self._elapsed(self._ready_at)
+
+    @property
+    def time_to_first_request(self) -> Optional[float]:
+        return self._elapsed(self._first_request_at)
+
+    def over_budget(self) -> bool:
+        """
+        Check the time to first request against the budget.
+
+        Returns:
+        bool: True if a budget is set and the first request came later.
+        """
+        elapsed = self.time_to_first_request
+        return (
+            bool(self.budget_seconds)
+            and elapsed is not None
+            and (elapsed > self.budget_seconds)
+        )
+
+    def report(self, top: int = STARTUP_PROFILE_TOP_MODULES) -> dict:
+        """
+        Summarise the startup timings.
+
+        Parameters:
+        - top (int): Number of slowest modules to include.
+
+        Returns:
+        dict: Time to ready, time to first request, the budget and the
+        slowest imports by total (inclusive) time.
+        """
+        slowest: List[dict] = [
+            {
+                "module": name,
+                "total_seconds": round(total, 4),
+                "self_seconds": round(own, 4),
+            }
+            for name, (total, own) in sorted(
+                self.module_times.items(), key=lambda item: item[1][0], reverse=True
+            )[:top]
+        ]
+        return {
+            "time_to_ready_seconds": _round(self.time_to_ready),
+            "time_to_first_request_seconds": _round(self.time_to_first_request),
+            "budget_seconds": self.budget_seconds or None,
+            "modules_timed": len(self.module_times),
+            "slowest_imports": slowest,
+        }
+
+    def _elapsed(self, at: Optional[float]) -> Optional[float]:
+        if self._started_at is None or at is None:
+            return None
+        return at - self._started_at
+
+    def _record_import(
+        self, name: str, loader: importlib.abc.Loader, module: ModuleType
+    ) -> None:
+        # Nested imports run inside their parent's exec_module, so each frame
+        # tracks its children's time to derive the module's own time.
+        stack = getattr(self._stack, "frames", None)
+        if stack is None:
+            stack = self._stack.frames = []
+        frame = [0.0]
+        stack.append(frame)
+        started_at = time.perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - started_at
+            stack.pop()
+            if stack:
+                stack[-1][0] += total
+            self.module_times[name] = (total, total - frame[0])
+
+
+class _ImportTimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: StartupProfiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):  # type: ignore[no-untyped-def]
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader: importlib.abc.Loader, profiler: StartupProfiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):  # type: ignore[no-untyped-def]
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:  # type: ignore[no-untyped-def]
+        # Put the real loader back so nothing keeps a reference to the wrapper
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._record_import(module.__name__, self._loader, module)
+
+    def __getattr__(self, name: str):  # type: ignore[no-untyped-def]
+        return getattr(self._loader, name)
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
+
+
+class FirstRequestMiddleware:
+    """
+    ASGI middleware that reports the time to the first HTTP request.
+    """
+
+    def __init__(self, app: "ASGIApp", profiler: StartupProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):  # type: ignore[no-untyped-def]
+        if scope["type"] == "http" and self.profiler.time_to_first_request is None:
+            self.profiler.mark_first_request()
+        await self.app(scope, receive, send)
+
+
+startup_profiler = StartupProfiler(budget_seconds=STARTUP_BUDGET_SECONDS)
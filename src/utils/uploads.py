@@ -0,0 +1,223 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from typing import BinaryIO, Iterable, Optional
+
+from fastapi import UploadFile
+
+from src.utils.constants import (
+    DOCUMENT_OBJECTS_FOLDER_PATH,
+    PROFILE_PICTURES_FOLDER_PATH,
+)
+from src.utils.index import get_env_variable
+
+# Bytes copied at a time, bounding the memory an upload uses however large it is
+UPLOAD_CHUNK_SIZE = int(get_env_variable("UPLOAD_CHUNK_SIZE", "1048576"))
+TEMPORARY_UPLOAD_PREFIX = ".upload-"
+# File name extensions kept from the client's file name, e.g. ".png"
+_FILE_EXTENSION = re.compile(r"\.[a-z0-9]{1,10}")
+
+
+def _read_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Temporary files are private; stored uploads get the usual permissions
+UPLOAD_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def save_upload(file: UploadFile, file_path: str) -> None:
+    """
+    Stream an upload to disk and move it into place atomically.
+
+    The upload is copied in UPLOAD_CHUNK_SIZE chunks to a temporary file in
+    the destination directory, which is then renamed to `file_path`, so
+    readers never see a partially written file. Blocking; run it in the
+    threadpool.
+
+    Parameters:
+    - file (UploadFile): The uploaded file.
+    - file_path (str): Where to store it.
+
+    Raises:
+    - OSError: If the file cannot be written. The temporary file is removed.
+    """
+    descriptor, temporary_path = tempfile.mkstemp(
+        prefix=TEMPORARY_UPLOAD_PREFIX, dir=os.path.dirname(file_path) or "."
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as local_file:
+            file.file.seek(0)
+            shutil.copyfileobj(file.file, local_file, UPLOAD_CHUNK_SIZE)
+        os.chmod(temporary_path, UPLOAD_FILE_MODE)
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        remove_files([temporary_path])
+        raise
+
+
+def store_profile_picture(
+    file: UploadFile, root: str = PROFILE_PICTURES_FOLDER_PATH
+) -> str:
+    """
+    Save a profile picture under a generated name.
+
+    The client's file name is not used as a path: only its extension is
+    kept, so a name like "../x" or "objects/ab/cd/<hash>" cannot overwrite
+    other uploads. Blocking; run it in the threadpool.
+
+    Parameters:
+    - file (UploadFile): The uploaded picture.
+    - root (str): Directory of the profile pictures.
+
+    Returns:
+    str: Path of the stored picture.
+
+    Raises:
+    - OSError: If the file cannot be written.
+    """
+    os.makedirs(root, exist_ok=True)
+    file_path = f"{root}/{uuid.uuid4().hex}{file_extension(file.filename)}"
+    save_upload(file, file_path)
+    return file_path
+
+
+def file_extension(file_name: Optional[str]) -> str:
+    """
+    Return the lowercased extension of a client supplied file name, or an
+    empty string if it has none or it contains anything but letters and
+    digits.
+
+    Parameters:
+    - file_name (Optional[str]): The file name sent by the client.
+
+    Returns:
+    str: The extension including its dot, e.g. ".png".
+    """
+    extension = os.path.splitext(os.path.basename(file_name or ""))[1].lower()
+    return extension if _FILE_EXTENSION.fullmatch(extension) else ""
+
+
+def remove_files(file_paths: Iterable[str]) -> None:
+    """
+    Delete files, ignoring the ones that no longer exist.
+
+    Parameters:
+    - file_paths (Iterable[str]): The files to delete.
+    """
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+
+class StoredObject:
+    """
+    Content stored in the content-addressed document store.
+
+    Attributes:
+    - content_hash (str): Hex SHA-256 of the content.
+    - size_bytes (int): Size of the content.
+    - path (str): Where the content is stored.
+    - created (bool): False if identical content was already stored.
+    """
+
+    __slots__ = ("content_hash", "size_bytes", "path", "created")
+
+    def __init__(self, content_hash: str, size_bytes: int, path: str, created: bool):
+        self.content_hash = content_hash
+        self.size_bytes = size_bytes
+        self.path = path
+        self.created = created
+
+
+def object_path(content_hash: str, root: str = DOCUMENT_OBJECTS_FOLDER_PATH) -> str:
+    """
+    Return where content with the given hash is stored.
+
+    Objects are sharded by the first two byte pairs of the hash
+    (ab/cd/abcd...), keeping directories small.
+
+    Parameters:
+    - content_hash (str): Hex SHA-256 of the content.
+    - root (str): Root directory of the store.
+
+    Returns:
+    str: Path of the object.
+    """
+    return f"{root}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+def store_by_content(
+    source: BinaryIO, root: str = DOCUMENT_OBJECTS_FOLDER_PATH
+) -> StoredObject:
+    """
+    Stream content into the content-addressed store, hashing it on the way.
+
+    The content is copied in UPLOAD_CHUNK_SIZE chunks to a temporary file
+    while it is hashed, then moved to its object path atomically. When the
+    object already exists, the copy is discarded, so identical content is
+    stored once however often it is uploaded. The object's modification time
+    is then refreshed, so garbage collection, which only removes objects
+    older than its minimum age, leaves it alone until the new document
+    referencing it is saved. Blocking; run it in the threadpool.
+
+    Parameters:
+    - source (BinaryIO): The content, read from the current position.
+    - root (str): Root directory of the store.
+
+    Returns:
+    StoredObject: The hash, size and path of the stored content.
+
+    Raises:
+    - OSError: If the content cannot be written. The temporary file is removed.
+    """
+    os.makedirs(root, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(
+        prefix=TEMPORARY_UPLOAD_PREFIX, dir=root
+    )
+    try:
+        digest = hashlib.sha256()
+        size_bytes = 0
+        with os.fdopen(descriptor, "wb") as local_file:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                local_file.write(chunk)
+                size_bytes += len(chunk)
+        content_hash = digest.hexdigest()
+        path = object_path(content_hash, root)
+
+        if os.path.exists(path):
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # Collected in the meantime: store the copy instead
+                pass
+            else:
+                remove_files([temporary_path])
+                return StoredObject(content_hash, size_bytes, path, created=False)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.chmod(temporary_path, UPLOAD_FILE_MODE)
+        # A concurrent upload of the same content replaces it with equal bytes
+        os.replace(temporary_path, path)
+        return StoredObject(content_hash, size_bytes, path, created=True)
+    except BaseException:
+        remove_files([temporary_path])
+        raise
+
+
+def store_upload(
+    file: UploadFile, root: str = DOCUMENT_OBJECTS_FOLDER_PATH
+) -> StoredObject:
+    """
+    Store an upload in the content-addressed store, see store_by_content.
+    """
+    file.file.seek(0)
+    return store_by_content(file.file, root)